@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the Cora workflows (-c, -b -c, -pr, -b -c -pr) against
+generated repositories, a local chat-completions stub, a GitHub REST API stub
+and a fake `gh` on PATH. Reports wall time, subprocess spawns, bytes sent to the AI and peak
+RSS, as JSON so runs can be compared across commits.
+
+Usage: python benchmarks/e2e.py [--sizes tiny,medium,large] [--rounds 3]
+                                [--latency-ms 300] [--token-delay-ms 20] [--network-latency-ms 200]
+                                [--github api|cli]
+                                [--entry main.py|build/cora.pyz] [--output results.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from github_stub import StubGitHubServer
+from stub_server import StubChatServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASE_FILES = 200
+
+SIZES = {
+    "tiny": {"files": 1, "lines": 10},
+    "medium": {"files": 20, "lines": 60},
+    "large": {"files": 150, "lines": 400},
+}
+
+SCENARIOS = {
+    "-c": {"args": ["-c"], "answers": "y\ny\n"},
+    "-b -c": {"args": ["-b", "-c"], "answers": "y\ny\ny\n"},
+    "-pr": {"args": ["-pr"], "answers": "1\n"},
+    "-b -c -pr": {"args": ["-b", "-c", "-pr"], "answers": "y\ny\ny\n1\n"},
+}
+
+FAKE_GH = """#!/bin/sh
+echo "$*" >> "$FAKE_GH_LOG"
+case "$1 $2" in
+  "--version "*) echo "gh version 2.40.0 (bench)" ;;
+  "auth status") sleep "$FAKE_NETWORK_LATENCY"; echo "Logged in to github.com as bench" ;;
+  "repo view") sleep "$FAKE_NETWORK_LATENCY"; echo "name: example/bench" ;;
+  "pr create") sleep "$FAKE_NETWORK_LATENCY"; echo "https://github.com/example/bench/pull/1" ;;
+  *) echo "fake gh: unsupported command: $*" >&2; exit 1 ;;
+esac
+"""
+
+
+PRE_RECEIVE_HOOK = """#!/bin/sh
+sleep "${FAKE_NETWORK_LATENCY:-0}"
+"""
+
+
+def write_hook(path, content):
+    with open(path, "w") as file:
+        file.write(content)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def write_module(path, index, lines, revision=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        for line in range(lines):
+            file.write(f"def handler_{index}_{line}(value):\n    return value * {line + revision}\n")
+
+
+def module_path(repo, index):
+    return os.path.join(repo, "src", f"pkg{index % 20}", f"module{index}.py")
+
+
+def create_template(root):
+    template = os.path.join(root, "template")
+    git(root, "init", "-q", "-b", "main", template)
+    git(template, "config", "user.email", "bench@example.com")
+    git(template, "config", "user.name", "bench")
+    git(template, "remote", "add", "origin", "https://github.com/example/bench.git")
+    for index in range(BASE_FILES):
+        write_module(module_path(template, index), index, 10)
+    git(template, "add", ".")
+    git(template, "commit", "-q", "-m", "initial")
+    return template
+
+
+def apply_changes(repo, size, part=None, parts=1):
+    indexes = range(size["files"])
+    if part is not None:
+        indexes = indexes[part::parts]
+    for index in indexes:
+        if index % 2:
+            write_module(os.path.join(repo, "src", "added", f"feature{index}.py"), index, size["lines"])
+        else:
+            write_module(module_path(repo, index), index, size["lines"] // 2, revision=1)
+
+
+def prepare_run(template, run_dir, scenario, size):
+    repo = os.path.join(run_dir, "repo")
+    origin = os.path.join(run_dir, "origin.git")
+    shutil.copytree(template, repo, symlinks=True)
+    git(run_dir, "init", "-q", "--bare", origin)
+    write_hook(os.path.join(origin, "hooks", "pre-receive"), PRE_RECEIVE_HOOK)
+    git(repo, "config", "remote.origin.pushurl", origin)
+    git(repo, "push", "-q", "origin", "main")
+
+    if scenario == "-pr":
+        git(repo, "checkout", "-q", "-b", "feature")
+        for part in range(3):
+            apply_changes(repo, size, part, 3)
+            git(repo, "add", ".")
+            git(repo, "commit", "-q", "--allow-empty", "-m", f"feat: part {part + 1}")
+    else:
+        apply_changes(repo, size)
+    return repo
+
+
+def create_fake_gh(root):
+    bin_dir = os.path.join(root, "bin")
+    os.makedirs(bin_dir)
+    gh_path = os.path.join(bin_dir, "gh")
+    with open(gh_path, "w") as file:
+        file.write(FAKE_GH)
+    os.chmod(gh_path, os.stat(gh_path).st_mode | stat.S_IEXEC)
+    return bin_dir
+
+
+def run_cora(entry, args, answers, cwd, env):
+    command = [sys.executable, entry, *args]
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, cwd=cwd, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    process.stdin.write(answers.encode("utf-8"))
+    process.stdin.close()
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "exit_code": process.returncode,
+        "wall_ms": round(elapsed * 1000, 1),
+        "peak_rss_kb": usage.ru_maxrss,
+        "output": output.decode("utf-8", errors="replace"),
+    }
+
+
+def run_scenario(root, template, bin_dir, server, entry, size_name, scenario, round_number, network_latency_ms=0,
+                 github_server=None):
+    run_dir = tempfile.mkdtemp(prefix=f"run-{round_number}-", dir=root)
+    repo = prepare_run(template, run_dir, scenario, SIZES[size_name])
+    trace_path = os.path.join(run_dir, "trace.json")
+    gh_log = os.path.join(run_dir, "gh.log")
+    env = dict(
+        os.environ,
+        PATH=bin_dir + os.pathsep + os.environ.get("PATH", ""),
+        FAKE_GH_LOG=gh_log,
+        FAKE_NETWORK_LATENCY=f"{network_latency_ms / 1000:.3f}",
+        API_KEY="bench",
+        API_BASE_URL=server.base_url,
+        MODEL="bench",
+        CACHE_DIR=os.path.join(run_dir, "cache"),
+        GIT_TERMINAL_PROMPT="0",
+        GH_CONFIG_DIR=os.path.join(run_dir, "gh-config"),
+    )
+    for name in ("GH_TOKEN", "GITHUB_TOKEN", "GH_ENTERPRISE_TOKEN", "GITHUB_ENTERPRISE_TOKEN", "GITHUB_API_URL"):
+        env.pop(name, None)
+    if github_server:
+        github_server.reset()
+        env.update(GITHUB_API_URL=github_server.base_url, GH_TOKEN="bench")
+
+    server.reset()
+    result = run_cora(entry, [*SCENARIOS[scenario]["args"], "--trace", trace_path], SCENARIOS[scenario]["answers"], repo, env)
+    result.update(server.stats())
+    result.update(github_server.stats() if github_server else {"github_requests": 0})
+
+    counters = {}
+    if os.path.exists(trace_path):
+        with open(trace_path) as trace_file:
+            counters = json.load(trace_file).get("otherData", {})
+    gh_calls = 0
+    if os.path.exists(gh_log):
+        with open(gh_log) as log_file:
+            gh_calls = sum(1 for _ in log_file)
+
+    result["subprocesses"] = counters.get("subprocesses", 0)
+    result["gh_calls"] = gh_calls
+    result["diff_bytes"] = counters.get("diff_bytes", 0)
+    result["prompt_tokens"] = counters.get("prompt_tokens", 0)
+    shutil.rmtree(run_dir, ignore_errors=True)
+    return result
+
+
+def summarize(size_name, scenario, runs):
+    timings = sorted(run["wall_ms"] for run in runs)
+    failures = [run for run in runs if run["exit_code"] != 0]
+    last = runs[-1]
+    summary = {
+        "size": size_name,
+        "workflow": scenario,
+        "rounds": len(runs),
+        "failures": len(failures),
+        "wall_ms_min": timings[0],
+        "wall_ms_median": timings[len(timings) // 2],
+        "subprocesses": last["subprocesses"],
+        "gh_calls": last["gh_calls"],
+        "github_requests": last["github_requests"],
+        "ai_requests": last["requests"],
+        "bytes_sent": last["bytes_received"],
+        "bytes_received": last["bytes_sent"],
+        "diff_bytes": last["diff_bytes"],
+        "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+    }
+    if failures:
+        summary["last_failure_output"] = failures[-1]["output"][-2000:]
+    return summary
+
+
+def current_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(sizes, scenarios, rounds, latency_ms, token_delay_ms, entry, network_latency_ms=0, github="api"):
+    server = StubChatServer(latency_ms=latency_ms, token_delay_ms=token_delay_ms).start()
+    github_server = StubGitHubServer(latency_ms=network_latency_ms).start() if github == "api" else None
+    root = tempfile.mkdtemp(prefix="cora-e2e-")
+    results = []
+    try:
+        template = create_template(root)
+        bin_dir = create_fake_gh(root)
+        for size_name in sizes:
+            for scenario in scenarios:
+                runs = [
+                    run_scenario(root, template, bin_dir, server, entry, size_name, scenario, round_number, network_latency_ms,
+                                 github_server)
+                    for round_number in range(rounds)
+                ]
+                results.append(summarize(size_name, scenario, runs))
+    finally:
+        server.stop()
+        if github_server:
+            github_server.stop()
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "revision": current_revision(),
+        "python": sys.version.split()[0],
+        "entry": os.path.relpath(entry, ROOT),
+        "latency_ms": latency_ms,
+        "token_delay_ms": token_delay_ms,
+        "network_latency_ms": network_latency_ms,
+        "github": github,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end Cora workflow benchmark")
+    parser.add_argument("--sizes", default=",".join(SIZES))
+    parser.add_argument("--workflows", default=",".join(SCENARIOS), help="comma-separated: -c, -b -c, -pr, -b -c -pr")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency-ms", type=int, default=300)
+    parser.add_argument("--token-delay-ms", type=int, default=20)
+    parser.add_argument("--network-latency-ms", type=int, default=200, help="simulated latency of git push and gh auth/repo/pr calls")
+    parser.add_argument("--entry", default=os.path.join(ROOT, "main.py"))
+    parser.add_argument("--github", choices=("api", "cli"), default="api", help="create PRs through the REST API stub or the fake gh")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of a table")
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    scenarios = [scenario.strip() for scenario in args.workflows.split(",") if scenario.strip()]
+    unknown = [name for name in sizes if name not in SIZES] + [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown size or workflow: {', '.join(unknown)}")
+
+    report = run(sizes, scenarios, max(1, args.rounds), args.latency_ms, args.token_delay_ms, os.path.abspath(args.entry), args.network_latency_ms, args.github)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'size':7} {'workflow':9} {'min ms':>8} {'median ms':>10} {'spawns':>6} {'gh':>3} "
+          f"{'api':>3} {'ai':>3} {'sent KiB':>9} {'rss MiB':>8} {'fail':>4}")
+    for result in report["results"]:
+        print(f"{result['size']:7} {result['workflow']:9} {result['wall_ms_min']:>8} {result['wall_ms_median']:>10} "
+              f"{result['subprocesses']:>6} {result['gh_calls']:>3} "
+              f"{result['github_requests']:>3} {result['ai_requests']:>3} "
+              f"{result['bytes_sent'] / 1024:>9.1f} {result['peak_rss_kb'] / 1024:>8.1f} {result['failures']:>4}")
+    if args.output:
+        print(f"JSON report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
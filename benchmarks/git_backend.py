@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Counts git process spawns and wall time for the git side of each Cora
+workflow, comparing the per-call backend with the persistent one.
+
+Usage: python benchmarks/git_backend.py [--files 2000] [--json]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.git_service import GitService
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def create_repo(root, files):
+    origin = os.path.join(root, "origin.git")
+    repo = os.path.join(root, "repo")
+    git(root, "init", "-q", "--bare", origin)
+    git(root, "init", "-q", "-b", "main", repo)
+    git(repo, "config", "user.email", "bench@example.com")
+    git(repo, "config", "user.name", "bench")
+    git(repo, "remote", "add", "origin", "https://github.com/example/bench.git")
+    git(repo, "config", "remote.origin.pushurl", origin)
+    for index in range(files):
+        directory = os.path.join(repo, "src", f"pkg{index % 50}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"module{index}.py"), "w") as file:
+            file.write(f"def handler_{index}():\n    return {index}\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "initial")
+    git(repo, "push", "-q", origin, "main")
+    return repo
+
+
+def touch_changes(repo, round_number):
+    with open(os.path.join(repo, "src", "pkg0", "module0.py"), "a") as file:
+        file.write(f"# change {round_number}\n")
+
+
+def workflow_commit(git_service, round_number):
+    git_service.get_diff()
+    git_service.get_index_tree()
+    git_service.get_current_branch()
+    git_service.get_current_branch()
+    git_service.commit(f"chore: change {round_number}")
+
+
+def workflow_branch_commit_pr(git_service, round_number):
+    git_service.get_diff()
+    git_service.get_index_tree()
+    git_service.get_current_branch()
+    git_service.get_current_branch()
+    git_service.create_branch(f"bench-{round_number}")
+    git_service.get_current_branch()
+    git_service.commit(f"feat: change {round_number}")
+    current_branch = git_service.get_current_branch()
+    git_service.get_local_branches()
+    git_service.get_branch_diff("main", current_branch)
+    git_service.get_revisions("main", current_branch)
+    git_service.get_pr_url(current_branch)
+    git_service.run_command(["git", "checkout", "-q", "main"])
+
+
+WORKFLOWS = {
+    "-c": workflow_commit,
+    "-b -c -pr": workflow_branch_commit_pr,
+}
+
+
+def run(files, rounds):
+    results = []
+    root = tempfile.mkdtemp(prefix="cora-bench-")
+    try:
+        repo = create_repo(root, files)
+        round_number = 0
+        for name, workflow in WORKFLOWS.items():
+            for persistent in (False, True):
+                spawns = []
+                timings = []
+                for _ in range(rounds):
+                    round_number += 1
+                    touch_changes(repo, round_number)
+                    git_service = GitService(repo_path=repo, persistent=persistent)
+                    started = time.perf_counter()
+                    workflow(git_service, round_number)
+                    timings.append(time.perf_counter() - started)
+                    spawns.append(git_service.spawn_count)
+                    git_service.backend.close()
+                results.append({
+                    "workflow": name,
+                    "backend": "persistent" if persistent else "per-call",
+                    "spawns": max(spawns),
+                    "wall_ms_min": round(min(timings) * 1000, 1),
+                    "wall_ms_median": round(sorted(timings)[len(timings) // 2] * 1000, 1),
+                })
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitService spawn benchmark")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.files, args.rounds)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'workflow':12} {'backend':11} {'spawns':>6} {'min ms':>8} {'median ms':>10}")
+    for result in results:
+        print(f"{result['workflow']:12} {result['backend']:11} {result['spawns']:>6} "
+              f"{result['wall_ms_min']:>8} {result['wall_ms_median']:>10}")
+
+
+if __name__ == "__main__":
+    main()
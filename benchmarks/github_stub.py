@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of the GitHub REST API that Cora uses
+(repository lookup and pull request creation), with a configurable delay
+per request to simulate network latency.
+
+Usage: python benchmarks/github_stub.py [--port 8766] [--latency-ms 200]
+Then point Cora at it with GITHUB_API_URL=http://127.0.0.1:8766 GH_TOKEN=bench
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+REPO_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)(?P<rest>/pulls)?$")
+
+
+class StubGitHubServer:
+    def __init__(self, port=0, latency_ms=200):
+        self.latency = latency_ms / 1000
+        self.lock = threading.Lock()
+        self.reset()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.pull_requests = {}
+
+    def stats(self):
+        with self.lock:
+            return {"github_requests": self.requests}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def handle(self):
+                try:
+                    super().handle()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def do_GET(self):
+                self.route("GET")
+
+            def do_POST(self):
+                self.route("POST")
+
+            def route(self, method):
+                raw_body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with server.lock:
+                    server.requests += 1
+                time.sleep(server.latency)
+
+                if not self.headers.get("Authorization", "").startswith(("Bearer ", "token ")):
+                    return self.reply(401, {"message": "Requires authentication"})
+                url = urlsplit(self.path)
+                match = REPO_PATH.match(url.path)
+                if not match:
+                    return self.reply(404, {"message": "Not Found"})
+
+                owner, repo = match.group("owner"), match.group("repo")
+                if not match.group("rest") and method == "GET":
+                    return self.reply(200, {
+                        "full_name": f"{owner}/{repo}",
+                        "permissions": {"admin": False, "push": True, "pull": True},
+                    })
+                if match.group("rest") and method == "GET":
+                    head = parse_qs(url.query).get("head", [""])[0]
+                    with server.lock:
+                        pull_request = server.pull_requests.get(head)
+                    return self.reply(200, [pull_request] if pull_request else [])
+                if match.group("rest") and method == "POST":
+                    return self.create_pull_request(owner, repo, json.loads(raw_body or b"{}"))
+                return self.reply(404, {"message": "Not Found"})
+
+            def create_pull_request(self, owner, repo, body):
+                missing = [field for field in ("base", "head", "title") if not body.get(field)]
+                if missing:
+                    return self.reply(422, {"message": "Validation Failed", "errors": [
+                        {"resource": "PullRequest", "field": field, "code": "missing_field"} for field in missing
+                    ]})
+                head = f"{owner}:{body['head']}"
+                with server.lock:
+                    if head in server.pull_requests:
+                        return self.reply(422, {"message": "Validation Failed", "errors": [
+                            {"resource": "PullRequest", "code": "custom", "message": f"A pull request already exists for {head}."}
+                        ]})
+                    number = len(server.pull_requests) + 1
+                    pull_request = {
+                        "number": number,
+                        "html_url": f"https://github.com/{owner}/{repo}/pull/{number}",
+                        "base": {"ref": body["base"]},
+                        "head": {"ref": body["head"]},
+                        "title": body["title"],
+                    }
+                    server.pull_requests[head] = pull_request
+                return self.reply(201, pull_request)
+
+            def reply(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub REST API stub server for benchmarks")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    server = StubGitHubServer(args.port, args.latency_ms)
+    print(f"Stub GitHub API server on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
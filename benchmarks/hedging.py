@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tail latency of commit-message generation with and without a hedge
+request. The primary stub answers every Nth request slowly; the secondary
+stub is a bit slower than the primary's normal case but never stalls.
+
+With the adaptive delay the hedge only pays off while slow requests stay
+under 10% (the p90): with more of them the primary's p90 is the stall
+itself and the delay grows towards it.
+
+Usage: python benchmarks/hedging.py [--requests 60] [--slow-every 20] [--slow-latency-ms 4000] [--json]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubChatServer
+
+DIFF = "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py\n@@ -1 +1,2 @@\n def main():\n+    return 1\n"
+
+
+def percentile(timings, fraction):
+    return timings[min(len(timings) - 1, int(fraction * len(timings)))]
+
+
+def run_mode(primary, secondary, requests, hedge, stream, delay_ms):
+    from core.ai_service import AIService
+
+    cache_dir = tempfile.mkdtemp(prefix="cora-hedge-")
+    env = {
+        "API_KEY": "bench",
+        "API_BASE_URL": primary.base_url,
+        "MODEL": "primary",
+        "CACHE": "false",
+        "CACHE_DIR": cache_dir,
+        "HISTORY_EXAMPLES": "0",
+        "HEURISTICS": "false",
+    }
+    if hedge:
+        env.update(HEDGE_API_BASE_URL=secondary.base_url, HEDGE_MODEL="secondary")
+        if delay_ms is not None:
+            env["HEDGE_DELAY_MS"] = str(delay_ms)
+    saved = {name: os.environ.get(name) for name in [*env, "HEDGE_API_BASE_URL", "HEDGE_MODEL", "HEDGE_DELAY_MS"]}
+    os.environ.update(env)
+    for name in ("HEDGE_API_BASE_URL", "HEDGE_MODEL", "HEDGE_DELAY_MS"):
+        if name not in env:
+            os.environ.pop(name, None)
+    primary.reset()
+    secondary.reset()
+
+    timings = []
+    try:
+        ai_service = AIService()
+        ai_service.raise_errors = True
+        for _ in range(requests):
+            started = time.perf_counter()
+            result = ai_service.generate_commit_message(DIFF, stream=stream, use_cache=False)
+            if stream:
+                result = "".join(result)
+            timings.append(time.perf_counter() - started)
+        ai_service.cancel_requests()
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    timings.sort()
+    return {
+        "hedge": hedge,
+        "stream": stream,
+        "p50_ms": round(percentile(timings, 0.5) * 1000),
+        "p95_ms": round(percentile(timings, 0.95) * 1000),
+        "p99_ms": round(percentile(timings, 0.99) * 1000),
+        "max_ms": round(timings[-1] * 1000),
+        "primary_requests": primary.stats()["requests"],
+        "secondary_requests": secondary.stats()["requests"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hedged request tail latency benchmark")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--secondary-latency-ms", type=int, default=350)
+    parser.add_argument("--slow-every", type=int, default=20)
+    parser.add_argument("--slow-latency-ms", type=int, default=4000)
+    parser.add_argument("--hedge-delay-ms", type=int, help="fixed hedge delay (default: adaptive p90)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    primary = StubChatServer(
+        latency_ms=args.latency_ms, token_delay_ms=5, slow_every=args.slow_every, slow_latency_ms=args.slow_latency_ms
+    ).start()
+    secondary = StubChatServer(latency_ms=args.secondary_latency_ms, token_delay_ms=5).start()
+    try:
+        results = [
+            run_mode(primary, secondary, args.requests, hedge, stream, args.hedge_delay_ms)
+            for stream in (False, True)
+            for hedge in (False, True)
+        ]
+    finally:
+        primary.stop()
+        secondary.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':10} {'hedge':5} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'max ms':>7} {'primary':>7} {'secondary':>9}")
+    for result in results:
+        print(f"{'stream' if result['stream'] else 'complete':10} {'yes' if result['hedge'] else 'no':5} "
+              f"{result['p50_ms']:>7} {result['p95_ms']:>7} {result['p99_ms']:>7} {result['max_ms']:>7} "
+              f"{result['primary_requests']:>7} {result['secondary_requests']:>9}")
+
+
+if __name__ == "__main__":
+    main()
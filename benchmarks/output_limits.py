@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Cost of a chatty model on commit and branch suggestions, with and without
+the per-task max_tokens caps and stop sequences. The stub wraps every reply
+in markdown and appends an explanation paragraph; the local validator
+repairs the markdown either way, so the difference is the tokens the model
+generates after the answer (and, without streaming, the time spent waiting
+for them).
+
+Usage: python benchmarks/output_limits.py [--requests 10] [--token-delay-ms 20] [--json]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubChatServer
+from utils.constants import COMMIT_TYPES
+
+DIFF = "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py\n@@ -1 +1,2 @@\n def main():\n+    return 1\n"
+FORMATS = {
+    "commit": re.compile(rf"^(?:{'|'.join(COMMIT_TYPES)})(?:\([^)]*\))?!?: [^A-Z\n]+$"),
+    "branch": re.compile(rf"^(?:{'|'.join(COMMIT_TYPES)})/[a-z0-9]+(?:-[a-z0-9]+)*$"),
+}
+
+
+def wait_for_drain(server, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    previous = None
+    while time.perf_counter() < deadline:
+        current = server.stats()
+        if current == previous:
+            return current
+        previous = current
+        time.sleep(0.3)
+    return previous
+
+
+def run_mode(server, task, limits, stream, requests):
+    from core.ai_service import AIService
+
+    cache_dir = tempfile.mkdtemp(prefix="cora-limits-")
+    env = {
+        "API_KEY": "bench",
+        "API_BASE_URL": server.base_url,
+        "MODEL": "bench",
+        "CACHE": "false",
+        "CACHE_DIR": cache_dir,
+        "HISTORY_EXAMPLES": "0",
+        "HEURISTICS": "false",
+        "OUTPUT_LIMITS": "true" if limits else "false",
+    }
+    saved = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    server.reset()
+
+    timings = []
+    valid = 0
+    try:
+        ai_service = AIService()
+        ai_service.raise_errors = True
+        generate = ai_service.generate_commit_message if task == "commit" else ai_service.generate_branch_name
+        for _ in range(requests):
+            started = time.perf_counter()
+            result = generate(DIFF, stream=stream, use_cache=False)
+            if stream:
+                result = "".join(result)
+            timings.append(time.perf_counter() - started)
+            valid += bool(FORMATS[task].match(result))
+        stats = wait_for_drain(server)
+        ai_service.cancel_requests()
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    timings.sort()
+    return {
+        "task": task,
+        "stream": stream,
+        "limits": limits,
+        "median_ms": round(timings[len(timings) // 2] * 1000),
+        "valid": f"{valid}/{requests}",
+        "ai_requests": stats["requests"],
+        "completion_tokens": stats["completion_tokens"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="max_tokens/stop and local repair benchmark")
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--token-delay-ms", type=int, default=20)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    server = StubChatServer(latency_ms=args.latency_ms, token_delay_ms=args.token_delay_ms, chatty=True).start()
+    try:
+        results = [
+            run_mode(server, task, limits, stream, max(1, args.requests))
+            for task in ("commit", "branch")
+            for stream in (False, True)
+            for limits in (False, True)
+        ]
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'task':7} {'mode':9} {'limits':6} {'median ms':>9} {'valid':>7} {'requests':>8} {'tokens':>7}")
+    for result in results:
+        print(f"{result['task']:7} {'stream' if result['stream'] else 'complete':9} {'on' if result['limits'] else 'off':6} "
+              f"{result['median_ms']:>9} {result['valid']:>7} {result['ai_requests']:>8} {result['completion_tokens']:>7}")
+
+
+if __name__ == "__main__":
+    main()
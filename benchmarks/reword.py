@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Measures `cora --reword` on a synthetic branch of "wip" commits: message
+generation with one worker against the bounded pool, and the single-pass
+commit-tree rewrite against a `git rebase --exec "git commit --amend"` run
+that rewrites the same messages one step at a time.
+
+Usage: python benchmarks/reword.py [--commits 30] [--workers 4] [--latency-ms 300] [--json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubChatServer
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+
+def git(repo, *args, env=None):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True, env={**os.environ, **GIT_ENV, **(env or {})}
+    ).stdout.strip()
+
+
+def create_repo(root, commits):
+    repo = os.path.join(root, "repo")
+    git(root, "init", "-q", "-b", "main", repo)
+    with open(os.path.join(repo, "app.py"), "w") as file:
+        file.write("def main():\n    return 0\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "initial")
+    git(repo, "checkout", "-q", "-b", "feature")
+    for index in range(commits):
+        with open(os.path.join(repo, f"module{index % 5}.py"), "a") as file:
+            file.write(f"def step_{index}():\n    return {index}\n")
+        git(repo, "add", ".")
+        git(repo, "commit", "-q", "-m", "wip", env={"GIT_AUTHOR_DATE": f"@{1700000000 + index * 60} +0300"})
+    return repo
+
+
+def measure_generation(repo, workers):
+    from cli.reword import RewordRunner
+    from core.ai_service import AIService
+    from core.git_service import GitService
+
+    git_service = GitService(repo_path=repo)
+    runner = RewordRunner(AIService(), git_service, None, workers)
+    _, _, commits = runner.load_commits("main..HEAD")
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        messages = runner.generate_messages(commits)
+    elapsed = time.perf_counter() - started
+    git_service.backend.close()
+    return elapsed, runner, commits, messages
+
+
+def measure_commit_tree(repo, runner, commits, messages):
+    head = git(repo, "rev-parse", "HEAD")
+    spawns = runner.git_service.spawn_count
+    started = time.perf_counter()
+    new_head = runner.rewrite("feature", head, commits, messages)
+    elapsed = time.perf_counter() - started
+    spawns = runner.git_service.spawn_count - spawns
+    same_tree = git(repo, "rev-parse", f"{head}^{{tree}}") == git(repo, "rev-parse", f"{new_head}^{{tree}}")
+    same_authors = git(repo, "log", "--format=%an %ae %ad", "--date=raw", f"main..{head}") == \
+        git(repo, "log", "--format=%an %ae %ad", "--date=raw", f"main..{new_head}")
+    git(repo, "reset", "-q", "--soft", head)
+    return elapsed, spawns, same_tree and same_authors
+
+
+def measure_rebase(repo, commits, messages):
+    messages_path = os.path.join(os.path.dirname(repo), "messages.txt")
+    with open(messages_path, "w") as file:
+        file.write("".join(f"{messages.get(commit['sha'], commit['message'])}\n" for commit in commits))
+    step = f'git commit -q --amend -m "$(head -n 1 {messages_path})" && sed -i 1d {messages_path}'
+    head = git(repo, "rev-parse", "HEAD")
+    started = time.perf_counter()
+    git(repo, "rebase", "-q", "--exec", step, "main")
+    elapsed = time.perf_counter() - started
+    git(repo, "reset", "-q", "--hard", head)
+    return elapsed
+
+
+def run(commits, workers, latency_ms):
+    server = StubChatServer(latency_ms=latency_ms, token_delay_ms=5).start()
+    root = tempfile.mkdtemp(prefix="cora-reword-")
+    saved = {name: os.environ.get(name) for name in ("API_KEY", "API_BASE_URL", "MODEL", "CACHE", "HISTORY_EXAMPLES", "HEURISTICS")}
+    os.environ.update(API_KEY="bench", API_BASE_URL=server.base_url, MODEL="bench", CACHE="false",
+                      HISTORY_EXAMPLES="0", HEURISTICS="false")
+    try:
+        repo = create_repo(root, commits)
+        results = []
+        for pool_size in sorted({1, workers}):
+            server.reset()
+            elapsed, runner, range_commits, messages = measure_generation(repo, pool_size)
+            results.append({
+                "step": "generate",
+                "mode": f"{pool_size} worker{'s' if pool_size > 1 else ''}",
+                "wall_ms": round(elapsed * 1000),
+                "ai_requests": server.stats()["requests"],
+            })
+        elapsed, spawns, preserved = measure_commit_tree(repo, runner, range_commits, messages)
+        results.append({"step": "rewrite", "mode": "commit-tree", "wall_ms": round(elapsed * 1000),
+                        "spawns": spawns, "preserved": preserved})
+        results.append({"step": "rewrite", "mode": "rebase --exec amend",
+                        "wall_ms": round(measure_rebase(repo, range_commits, messages) * 1000)})
+    finally:
+        server.stop()
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk reword benchmark")
+    parser.add_argument("--commits", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency-ms", type=int, default=300)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.commits, max(1, args.workers), args.latency_ms)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'step':9} {'mode':20} {'wall ms':>8} {'details'}")
+    for result in results:
+        details = ", ".join(f"{key}={value}" for key, value in result.items() if key not in ("step", "mode", "wall_ms"))
+        print(f"{result['step']:9} {result['mode']:20} {result['wall_ms']:>8} {details}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Measures the git side of collecting the diff for `cora -c` on a synthetic
+large working tree: the old blanket `git add .` against the staging modes
+(all, tracked only, pathspecs, index as-is), plus the early exit when
+nothing is staged. Each mode runs on a plain index, with the untracked
+cache, and with the untracked cache plus an fsmonitor hook that reports
+the files the benchmark touched (standing in for watchman or the builtin
+daemon).
+
+Usage: python benchmarks/staging.py [--files 20000] [--rounds 5] [--json]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.git_service import GitService
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def create_repo(root, files):
+    repo = os.path.join(root, "repo")
+    git(root, "init", "-q", "-b", "main", repo)
+    git(repo, "config", "user.email", "bench@example.com")
+    git(repo, "config", "user.name", "bench")
+    for index in range(files):
+        directory = os.path.join(repo, "services", f"svc{index % 40}", f"pkg{index % 400}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"module{index}.py"), "w") as file:
+            file.write(f"def handler_{index}():\n    return {index}\n")
+    with open(os.path.join(repo, ".gitignore"), "w") as file:
+        file.write("build/\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "initial")
+    build = os.path.join(repo, "build")
+    for index in range(files // 10):
+        directory = os.path.join(build, f"out{index % 100}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"artifact{index}.o"), "w") as file:
+            file.write("x")
+    return repo
+
+
+FSMONITOR_HOOK = """#!/bin/sh
+printf 'cora-bench-%s\\0' "$(date +%s%N)"
+tr '\\n' '\\0' < "{changed_file}"
+"""
+
+
+def changed_file(repo):
+    return os.path.join(os.path.dirname(repo), "changed.txt")
+
+
+def touch_changes(repo, round_number):
+    git(repo, "reset", "-q")
+    paths = [f"services/svc{index}/pkg{index}/module{index}.py" for index in (0, 1, 2)]
+    for path in paths:
+        with open(os.path.join(repo, path), "a") as file:
+            file.write(f"# change {round_number}\n")
+    paths.append(f"services/svc0/pkg0/new{round_number}.py")
+    with open(os.path.join(repo, paths[-1]), "w") as file:
+        file.write("def added():\n    return True\n")
+    with open(changed_file(repo), "a") as file:
+        file.write("".join(f"{path}\n" for path in paths))
+
+
+def enable_untracked_cache(repo):
+    git(repo, "config", "core.untrackedCache", "true")
+    git(repo, "update-index", "--untracked-cache")
+    git(repo, "status")
+
+
+def enable_fsmonitor(repo):
+    hook = os.path.join(os.path.dirname(repo), "fsmonitor-hook")
+    with open(hook, "w") as file:
+        file.write(FSMONITOR_HOOK.format(changed_file=changed_file(repo)))
+    os.chmod(hook, 0o755)
+    open(changed_file(repo), "w").close()
+    git(repo, "config", "core.fsmonitor", hook)
+    git(repo, "config", "core.fsmonitorHookVersion", "2")
+    git(repo, "status")
+
+
+INDEX_SETUPS = {
+    "none": lambda repo: git(repo, "status"),
+    "untracked cache": enable_untracked_cache,
+    "+ fsmonitor": enable_fsmonitor,
+}
+
+
+def collect_blanket_add(git_service):
+    git_service.run_command(["git", "add", "."])
+    return git_service.get_staged_diff()
+
+
+SCENARIOS = {
+    "git add . (before)": lambda git_service: collect_blanket_add(git_service),
+    "all": lambda git_service: git_service.get_diff("all"),
+    "tracked (-u)": lambda git_service: git_service.get_diff("tracked"),
+    "paths": lambda git_service: git_service.get_diff(None, ["services/svc0", "services/svc1", "services/svc2"]),
+    "index (--staged)": lambda git_service: git_service.get_diff("index"),
+}
+
+
+def measure(repo, rounds, scenario, prepare):
+    timings = []
+    spawns = []
+    diff_bytes = 0
+    for round_number in range(rounds):
+        prepare(round_number)
+        git_service = GitService(repo_path=repo)
+        started = time.perf_counter()
+        diff = scenario(git_service)
+        timings.append(time.perf_counter() - started)
+        spawns.append(git_service.spawn_count)
+        diff_bytes = len(diff or "")
+        git_service.backend.close()
+    return {
+        "spawns": max(spawns),
+        "diff_bytes": diff_bytes,
+        "wall_ms_min": round(min(timings) * 1000, 1),
+        "wall_ms_median": round(sorted(timings)[len(timings) // 2] * 1000, 1),
+    }
+
+
+def run(files, rounds):
+    results = []
+    root = tempfile.mkdtemp(prefix="cora-staging-")
+    try:
+        repo = create_repo(root, files)
+        for setup_name, setup in INDEX_SETUPS.items():
+            setup(repo)
+            for name, scenario in SCENARIOS.items():
+                def prepare(round_number):
+                    touch_changes(repo, round_number)
+                    if name.startswith("index"):
+                        git(repo, "add", "-A", "services/svc0", "services/svc1", "services/svc2")
+
+                results.append({
+                    "mode": name,
+                    "setup": setup_name,
+                    **measure(repo, rounds, scenario, prepare),
+                })
+
+            def prepare_clean(round_number):
+                touch_changes(repo, round_number)
+
+            results.append({
+                "mode": "nothing staged (before)",
+                "setup": setup_name,
+                **measure(repo, rounds, lambda git_service: git_service.get_staged_diff(), prepare_clean),
+            })
+            results.append({
+                "mode": "nothing staged",
+                "setup": setup_name,
+                **measure(repo, rounds, lambda git_service: git_service.get_diff("index"), prepare_clean),
+            })
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Staging mode benchmark on a synthetic large tree")
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.files, max(1, args.rounds))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':24} {'index setup':15} {'spawns':>6} {'diff KiB':>9} {'min ms':>8} {'median ms':>10}")
+    for result in results:
+        print(f"{result['mode']:24} {result['setup']:15} {result['spawns']:>6} "
+              f"{result['diff_bytes'] / 1024:>9.1f} {result['wall_ms_min']:>8} {result['wall_ms_median']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an OpenAI-compatible chat-completions endpoint, used by
+the benchmarks. Replies are canned per task (branch, commit, PR), with a
+configurable delay before the first token and per generated token.
+Every Nth request can be made slow to reproduce tail latency, and replies
+can be made chatty (markdown, trailing explanation) like a model that
+ignores the format rules. `stop` and `max_tokens` are honoured.
+
+Usage: python benchmarks/stub_server.py [--port 8765] [--latency-ms 300] [--token-delay-ms 20]
+                                        [--slow-every 10 --slow-latency-ms 5000] [--chatty]
+Then point Cora at it with API_BASE_URL=http://127.0.0.1:8765/v1
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BRANCH_REPLIES = ("feat/update-bench-fixtures", "chore/refresh-bench-modules", "test/regenerate-bench-samples")
+COMMIT_REPLIES = (
+    "feat: atualiza fixtures do benchmark",
+    "chore: regenera módulos do benchmark",
+    "test: adiciona novos arquivos de exemplo",
+)
+CHATTY_EXPLANATION = (
+    "Esta mensagem segue o padrão conventional commits e resume a mudança mais significativa do diff. "
+    "O prefixo indica o tipo da alteração, e a descrição explica de forma objetiva o que foi modificado nos "
+    "módulos gerados, facilitando a leitura do histórico e a geração automática de changelogs. Caso prefira, "
+    "posso sugerir alternativas com outros escopos ou um texto mais detalhado para o corpo do commit."
+)
+PR_REPLY = (
+    "**Feature:** Atualização das fixtures do benchmark\n\n"
+    "**Descrição:** Ajusta os módulos gerados para medir o fluxo completo do Cora.\n\n"
+    "**Alterações:**\n- Módulos gerados atualizados\n- Novos arquivos de exemplo"
+)
+
+
+def candidates_reply(replies, prompt):
+    if "numbered" not in prompt and "numeradas" not in prompt:
+        return replies[0]
+    return "\n".join(f"{index}. {reply}" for index, reply in enumerate(replies, 1))
+
+
+def chatty_reply(reply):
+    lines = [f"**{line[0].upper()}{line[1:]}.**" for line in reply.split("\n")]
+    return "\n".join(lines) + "\n\n" + CHATTY_EXPLANATION
+
+
+def reply_for(prompt, chatty=False):
+    if "Git branch names" in prompt:
+        reply = candidates_reply(BRANCH_REPLIES, prompt)
+    elif "conventional commits" in prompt:
+        reply = candidates_reply(COMMIT_REPLIES, prompt)
+    else:
+        return PR_REPLY
+    return chatty_reply(reply) if chatty else reply
+
+
+def apply_limits(reply, body):
+    for stop in body.get("stop") or []:
+        reply = reply.split(stop, 1)[0]
+    max_tokens = body.get("max_tokens")
+    if max_tokens and len(reply.split(" ")) > max_tokens:
+        reply = " ".join(reply.split(" ")[:max_tokens])
+    return reply
+
+
+class StubChatServer:
+    def __init__(self, port=0, latency_ms=300, token_delay_ms=20, slow_every=0, slow_latency_ms=0, chatty=False):
+        self.latency = latency_ms / 1000
+        self.chatty = chatty
+        self.token_delay = token_delay_ms / 1000
+        self.slow_every = slow_every
+        self.slow_latency = slow_latency_ms / 1000
+        self.lock = threading.Lock()
+        self.reset()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.bytes_received = 0
+            self.bytes_sent = 0
+            self.completion_tokens = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "bytes_received": self.bytes_received,
+                "bytes_sent": self.bytes_sent,
+                "completion_tokens": self.completion_tokens,
+            }
+
+    def record(self, received, sent, completion_tokens=0):
+        with self.lock:
+            self.requests += 1 if received else 0
+            self.bytes_received += received
+            self.bytes_sent += sent
+            self.completion_tokens += completion_tokens
+            return self.requests
+
+    def latency_for(self, request_number):
+        if self.slow_every and request_number % self.slow_every == 0:
+            return self.slow_latency
+        return self.latency
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self):
+                raw_body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                body = json.loads(raw_body or b"{}")
+                prompt = "".join(message.get("content", "") for message in body.get("messages", []))
+                reply = apply_limits(reply_for(prompt, server.chatty), body)
+                usage = {
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": len(reply) // 4,
+                    "total_tokens": (len(prompt) + len(reply)) // 4,
+                }
+                request_number = server.record(len(raw_body), 0)
+                time.sleep(server.latency_for(request_number))
+                try:
+                    if body.get("stream"):
+                        sent = self.stream(body, reply, usage)
+                    else:
+                        time.sleep(server.token_delay * len(reply.split(" ")))
+                        sent = self.complete(reply, usage)
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                server.record(0, sent, usage["completion_tokens"])
+
+            def complete(self, reply, usage):
+                payload = json.dumps({
+                    "id": "bench",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": "bench",
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                    "usage": usage,
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return len(payload)
+
+            def stream(self, body, reply, usage):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                sent = 0
+                tokens = reply.split(" ")
+                for index, token in enumerate(tokens):
+                    sent += self.send_event({
+                        "id": "bench",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": "bench",
+                        "choices": [{
+                            "index": 0,
+                            "delta": {"content": token if index == len(tokens) - 1 else token + " "},
+                            "finish_reason": None,
+                        }],
+                    })
+                    time.sleep(server.token_delay)
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    sent += self.send_event({
+                        "id": "bench",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": "bench",
+                        "choices": [],
+                        "usage": usage,
+                    })
+                sent += self.send_chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                return sent
+
+            def send_event(self, event):
+                return self.send_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+
+            def send_chunk(self, data):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+                return len(data)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server for benchmarks")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=300)
+    parser.add_argument("--token-delay-ms", type=int, default=20)
+    parser.add_argument("--slow-every", type=int, default=0, help="make every Nth request slow (0 disables)")
+    parser.add_argument("--slow-latency-ms", type=int, default=5000)
+    parser.add_argument("--chatty", action="store_true", help="wrap commit/branch replies in markdown and add an explanation")
+    args = parser.parse_args()
+
+    server = StubChatServer(
+        args.port, args.latency_ms, args.token_delay_ms, args.slow_every, args.slow_latency_ms, args.chatty
+    )
+    print(f"Stub chat-completions server on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core.git_service import GitService
+from utils.constants import STAGE_MODES
+from utils.rate_limiter import TokenBucket
+
+BATCH_ACTIONS = ("commit", "branch", "pr")
+
+
+class BatchJobError(Exception):
+    pass
+
+
+class BatchRunner:
+    def __init__(self, ai_service, workers=4, requests_per_minute=None):
+        self.ai_service = ai_service
+        self.workers = max(1, workers)
+        self.ai_service.raise_errors = True
+        if requests_per_minute:
+            self.ai_service.rate_limiter = TokenBucket(requests_per_minute / 60, capacity=self.workers)
+        self.output_lock = threading.Lock()
+
+    def load_jobs(self, jobs_path):
+        jobs = []
+        with open(jobs_path, encoding="utf-8") as jobs_file:
+            for line_number, line in enumerate(jobs_file, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    job = json.loads(line)
+                except json.JSONDecodeError as e:
+                    job = {"invalid": f"line {line_number}: {e}"}
+                job.setdefault("id", str(line_number))
+                jobs.append(job)
+        return jobs
+
+    def run(self, jobs_path, output_path):
+        jobs = self.load_jobs(jobs_path)
+        total = len(jobs)
+        failed = 0
+        started = time.perf_counter()
+        print(f"📦 Processando {total} jobs com {self.workers} workers...")
+
+        with open(output_path, "w", encoding="utf-8") as output_file, \
+                ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.run_job, job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                if result["status"] != "ok":
+                    failed += 1
+                with self.output_lock:
+                    output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    output_file.flush()
+                status_icon = "✅" if result["status"] == "ok" else "❌"
+                print(f"{status_icon} [{done}/{total}] {result['repo']} {result['action']} ({result['duration_ms']} ms)")
+
+        elapsed = time.perf_counter() - started
+        print(f"🏁 {total - failed} de {total} jobs concluídos em {elapsed:.1f}s. Resultados: {output_path}")
+        return failed == 0
+
+    def run_job(self, job):
+        result = {
+            "id": job.get("id"),
+            "repo": job.get("repo"),
+            "action": job.get("action"),
+            "status": "ok",
+            "started_at": time.time(),
+        }
+        timings = {}
+        started = time.perf_counter()
+        try:
+            if "invalid" in job:
+                raise BatchJobError(f"invalid job: {job['invalid']}")
+            if job.get("action") not in BATCH_ACTIONS:
+                raise BatchJobError(f"unknown action '{job.get('action')}', expected one of {', '.join(BATCH_ACTIONS)}")
+            if job.get("stage") and job["stage"] not in STAGE_MODES:
+                raise BatchJobError(f"unknown stage '{job['stage']}', expected one of {', '.join(STAGE_MODES)}")
+            if not job.get("repo") or not os.path.isdir(job["repo"]):
+                raise BatchJobError(f"repository not found: {job.get('repo')}")
+
+            git_service = GitService(repo_path=os.path.abspath(job["repo"]), raise_errors=True)
+            handler = getattr(self, f"run_{job['action']}_job")
+            try:
+                result.update(handler(job, git_service, timings))
+            finally:
+                git_service.backend.close()
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["timings"] = timings
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000)
+        return result
+
+    def timed(self, timings, name, function, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings[f"{name}_ms"] = timings.get(f"{name}_ms", 0) + round((time.perf_counter() - started) * 1000)
+
+    def get_staged_diff(self, git_service, timings, job):
+        diff = self.timed(timings, "git", git_service.get_diff, job.get("stage"), job.get("paths"))
+        if not diff:
+            raise BatchJobError("no changes to commit")
+        return diff, self.timed(timings, "git", git_service.get_index_tree)
+
+    def get_staged_changes(self, git_service, timings):
+        if not self.ai_service.heuristics_enabled:
+            return None
+        return self.timed(timings, "git", git_service.get_staged_changes)
+
+    def run_commit_job(self, job, git_service, timings):
+        diff, index_tree = self.get_staged_diff(git_service, timings, job)
+        examples = self.timed(timings, "git", self.ai_service.find_examples, git_service, diff)
+        message = self.timed(
+            timings, "ai", self.ai_service.generate_commit_message, diff, cache_scope=index_tree, examples=examples,
+            changes=self.get_staged_changes(git_service, timings)
+        )
+        if not message:
+            raise BatchJobError("empty commit message")
+        if job.get("dry_run"):
+            return {"commit_message": message}
+
+        if not self.timed(timings, "git", git_service.commit, message):
+            raise BatchJobError("git commit failed")
+        branch = self.timed(timings, "git", git_service.get_current_branch)
+        if job.get("push") and not self.timed(timings, "git", git_service.push, branch):
+            raise BatchJobError(f"git push failed for branch '{branch}'")
+        return {"commit_message": message, "branch": branch}
+
+    def run_branch_job(self, job, git_service, timings):
+        diff, index_tree = self.get_staged_diff(git_service, timings, job)
+        examples = self.timed(timings, "git", self.ai_service.find_examples, git_service, diff)
+        branch_name = self.timed(
+            timings, "ai", self.ai_service.generate_branch_name, diff, cache_scope=index_tree, examples=examples,
+            changes=self.get_staged_changes(git_service, timings), git_service=git_service
+        )
+        if not branch_name:
+            raise BatchJobError("empty branch name")
+        if job.get("dry_run"):
+            return {"branch": branch_name}
+
+        if not self.timed(timings, "git", git_service.create_branch, branch_name):
+            raise BatchJobError(f"could not create branch '{branch_name}'")
+        return {"branch": branch_name}
+
+    def run_pr_job(self, job, git_service, timings):
+        base_branch = job.get("base")
+        if not base_branch:
+            raise BatchJobError("missing 'base' branch")
+        current_branch = job.get("head") or self.timed(timings, "git", git_service.get_current_branch)
+
+        revisions = self.timed(timings, "git", git_service.get_revisions, base_branch, current_branch)
+        if not revisions:
+            raise BatchJobError(f"could not resolve '{base_branch}' and '{current_branch}'")
+        diff = self.timed(timings, "git", git_service.get_branch_diff, base_branch, current_branch)
+        if not diff:
+            raise BatchJobError(f"no differences between '{base_branch}' and '{current_branch}'")
+        commits = self.timed(timings, "git", git_service.get_branch_commits, base_branch, current_branch)
+
+        description = self.timed(
+            timings, "ai", self.ai_service.generate_pr_description, diff,
+            cache_scope="...".join(revisions),
+            commits=commits,
+            load_commit_diff=git_service.get_commit_diff
+        )
+        return {
+            "base": base_branch,
+            "head": current_branch,
+            "title": f"PR: {current_branch} to {base_branch}",
+            "description": description,
+        }
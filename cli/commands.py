@@ -1,32 +1,90 @@
 import argparse
-from core.ai_service import AIService
-from core.git_service import GitService
-from core.github_service import GitHubService
+import os
+import signal
+import sys
+from contextlib import redirect_stdout
+from functools import partial
 from core.ui_service import UIService
-from utils.constants import OPTION_DESCRIPTIONS
+from utils.constants import DAEMON_VAR, DEFAULT_BATCH_WORKERS, FALSE_VALUES, OPTION_DESCRIPTIONS
+from utils.profiler import profiler
 
 class CoraCommands:
     def __init__(self):
-        self.ai_service = AIService()
-        self.git_service = GitService()
-        self.github_service = GitHubService()
+        self._ai_service = None
+        self._git_service = None
+        self._github_service = None
+        self.scheduler = None
+        self.push_process = None
         self.ui_service = UIService()
     
+    @property
+    def ai_service(self):
+        if self._ai_service is None:
+            from core.ai_service import AIService
+            self._ai_service = AIService()
+            self._ai_service.raise_errors = True
+        return self._ai_service
+    
+    def cancel(self):
+        if self._ai_service is not None:
+            self._ai_service.cancel_requests()
+        self.stop_push()
+    
+    @property
+    def git_service(self):
+        if self._git_service is None:
+            from core.git_service import GitService
+            self._git_service = GitService()
+        return self._git_service
+    
+    @property
+    def github_service(self):
+        if self._github_service is None:
+            from core.github_service import GitHubService
+            self._github_service = GitHubService(self.git_service)
+        return self._github_service
+    
     def parse_arguments(self):
         parser = argparse.ArgumentParser(description="Assistente de fluxo de trabalho Git com IA", add_help=False)
         parser.add_argument("--branch", "-b", action="store_true", help="Cria uma nova branch")
         parser.add_argument("--commit", "-c", action="store_true", help="Gera e executa commit")
         parser.add_argument("--pull-request", "-pr", action="store_true", help=OPTION_DESCRIPTIONS["PR"])
+        parser.add_argument("--no-stream", action="store_true", help=OPTION_DESCRIPTIONS["NO_STREAM"])
+        staging = parser.add_mutually_exclusive_group()
+        staging.add_argument("--staged", dest="stage_mode", action="store_const", const="index", help=OPTION_DESCRIPTIONS["STAGED"])
+        staging.add_argument("--update", "-u", dest="stage_mode", action="store_const", const="tracked", help=OPTION_DESCRIPTIONS["UPDATE"])
+        parser.add_argument("pathspecs", nargs="*", metavar="PATHSPEC", help=OPTION_DESCRIPTIONS["PATHSPEC"])
+        parser.add_argument("--no-cache", action="store_true", help=OPTION_DESCRIPTIONS["NO_CACHE"])
+        parser.add_argument("--no-heuristics", action="store_true", help=OPTION_DESCRIPTIONS["NO_HEURISTICS"])
+        parser.add_argument("--cache-stats", action="store_true", help=OPTION_DESCRIPTIONS["CACHE_STATS"])
+        parser.add_argument("--batch", metavar="JOBS_JSONL", help=OPTION_DESCRIPTIONS["BATCH"])
+        parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS, help=OPTION_DESCRIPTIONS["WORKERS"])
+        parser.add_argument("--rate-limit", type=float, metavar="RPM", help=OPTION_DESCRIPTIONS["RATE_LIMIT"])
+        parser.add_argument("--output", metavar="RESULTS_JSONL", help=OPTION_DESCRIPTIONS["OUTPUT"])
+        parser.add_argument("--reword", metavar="RANGE", help=OPTION_DESCRIPTIONS["REWORD"])
+        parser.add_argument("--dry-run", action="store_true", help=OPTION_DESCRIPTIONS["DRY_RUN"])
+        parser.add_argument("--suggest", choices=("commit", "branch", "pr"), help=OPTION_DESCRIPTIONS["SUGGEST"])
+        parser.add_argument("--base", metavar="BRANCH", help=OPTION_DESCRIPTIONS["BASE"])
+        parser.add_argument("--daemon", action="store_true", help=OPTION_DESCRIPTIONS["DAEMON"])
+        parser.add_argument("--serve", action="store_true", help=OPTION_DESCRIPTIONS["SERVE"])
+        parser.add_argument("--stop-daemon", action="store_true", help=OPTION_DESCRIPTIONS["STOP_DAEMON"])
+        parser.add_argument("--watch", action="store_true", help=OPTION_DESCRIPTIONS["WATCH"])
+        parser.add_argument("--install-hook", action="store_true", help=OPTION_DESCRIPTIONS["INSTALL_HOOK"])
+        parser.add_argument("--uninstall-hook", action="store_true", help=OPTION_DESCRIPTIONS["UNINSTALL_HOOK"])
+        parser.add_argument("--verbose", action="store_true", help=OPTION_DESCRIPTIONS["VERBOSE"])
+        parser.add_argument("--profile", action="store_true", help=OPTION_DESCRIPTIONS["PROFILE"])
+        parser.add_argument("--trace", metavar="TRACE_JSON", help=OPTION_DESCRIPTIONS["TRACE"])
         parser.add_argument("--version", "-v", "--v", "-version", action="store_true", help=OPTION_DESCRIPTIONS["VERSION"])
         parser.add_argument("--help", "-h", action="store_true", help=OPTION_DESCRIPTIONS["HELP"])
         return parser.parse_args()
     
-    def handle_branch_creation(self, diff):
+    def handle_branch_creation(self, diff, generation_function):
         print("🌿 Creating new branch...")
         branch_name = self.ui_service.user_interaction_loop(
             "Suggested branch name", 
-            self.ai_service.generate_branch_name, 
-            diff
+            generation_function, 
+            diff,
+            stream=self.ai_service.stream_enabled
         )
         
         if not branch_name:
@@ -47,12 +105,13 @@ class CoraCommands:
             print(f"   Continuing on branch '{original_branch}'.")
             return None, False
     
-    def handle_commit_creation(self, diff, new_branch_created=False):
+    def handle_commit_creation(self, diff, generation_function, new_branch_created=False, push_in_background=False):
         print("📝 Creating commit...")
         commit_message = self.ui_service.user_interaction_loop(
             "Suggested commit message", 
-            self.ai_service.generate_commit_message, 
-            diff
+            generation_function, 
+            diff,
+            stream=self.ai_service.stream_enabled
         )
         
         if not commit_message:
@@ -71,7 +130,10 @@ class CoraCommands:
         
         push_confirmation = self.ui_service.confirm_push(current_branch)
         
-        if push_confirmation in ('y', ''):
+        if push_confirmation in ('y', '') and push_in_background:
+            print(f"🚀 Pushing to branch '{current_branch}' in the background...")
+            self.scheduler.add("push", partial(self.push_quietly, current_branch, new_branch_created))
+        elif push_confirmation in ('y', ''):
             print(f"🚀 Pushing to branch '{current_branch}'...")
             if self.git_service.push(current_branch, set_upstream=new_branch_created):
                 print("✨ Push successful!")
@@ -84,25 +146,65 @@ class CoraCommands:
         
         return True
     
+    def push_quietly(self, branch_name, set_upstream):
+        from core.git_service import GitCommandError, GitService
+
+        git_service = GitService(self.git_service.repo_path, persistent=False, raise_errors=True)
+        try:
+            self.push_process = git_service.start_push(branch_name, set_upstream)
+        except GitCommandError as e:
+            return str(e)
+        _, stderr = self.push_process.communicate()
+        if self.push_process.returncode == 0:
+            return None
+        if self.push_process.returncode < 0:
+            return "push interrupted"
+        return stderr.strip() or f"git push exited with status {self.push_process.returncode}"
+    
+    def stop_push(self):
+        process = self.push_process
+        if process is None or process.poll() is not None:
+            return
+        # Fora do Windows o push roda em sessão própria: encerra o grupo inteiro (git-remote-http/ssh seguram os pipes)
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+        except OSError:
+            process.terminate()
+        print(f"\n⚠️ Background push stopped. To push later, run: git push origin {process.args[-1]}")
+    
+    def wait_for_push(self):
+        future = self.scheduler.pop("push") if self.scheduler else None
+        if future is None:
+            return True
+        error = future.result()
+        if error:
+            print(f"❌ Push failed: {error}")
+            if self.push_process is not None:
+                print(f"   Background pushes never prompt for credentials. To retry, run: git push origin {self.push_process.args[-1]}")
+            return False
+        print("✨ Push successful!")
+        return True
+    
     def handle_pull_request_creation(self):
+        from core.ai_service import AIRequestError
+
         print("📋 Iniciando processo de criação de Pull Request...")
+        self.ai_service.prewarm()
         
         current_branch = self.git_service.get_current_branch()
         if not current_branch:
             print("❌ Não foi possível obter a branch atual.")
             return
         
-        branches = self.git_service.get_local_branches()
-        if not branches:
-            print("❌ Nenhuma branch disponível para comparação.")
-            return
-        
-        available_branches = [b for b in branches if b != current_branch]
-        if not available_branches:
+        ranked_branches = self.git_service.rank_base_branches(current_branch)
+        if not ranked_branches:
             print("❌ Nenhuma branch base disponível para comparação.")
             return
         
-        base_branch = self.ui_service.select_base_branch(current_branch, available_branches)
+        base_branch = self.ui_service.select_base_branch(current_branch, ranked_branches)
         if not base_branch:
             return
         
@@ -112,22 +214,50 @@ class CoraCommands:
         if self.ai_service.is_configured():
             diff = self.git_service.get_branch_diff(base_branch, current_branch)
             if diff:
-                description = self.ai_service.generate_pr_description(diff)
+                revisions = self.git_service.get_revisions(base_branch, current_branch)
+                try:
+                    description = self.ai_service.generate_pr_description(
+                        diff,
+                        stream=self.ai_service.stream_enabled,
+                        cache_scope="...".join(revisions) if revisions else None,
+                        commits=self.git_service.get_branch_commits(base_branch, current_branch),
+                        load_commit_diff=self.git_service.get_commit_diff
+                    )
+                except AIRequestError as e:
+                    print(f"❌ Error with AI API: {e}")
+                    print("   Usando a descrição padrão.")
             else:
                 print("⚠️ Nenhuma diferença encontrada entre as branches.")
                 return
         
+        fallback_description = f"PR automático: {current_branch} to {base_branch}"
+        try:
+            description = self.github_service.display_pr_description(
+                base_branch, current_branch, description or fallback_description
+            )
+        except AIRequestError as e:
+            print(f"❌ Error with AI API: {e}")
+            print("   Usando a descrição padrão.")
+            description = self.github_service.display_pr_description(base_branch, current_branch, fallback_description)
         if not description:
-            description = f"PR automático: {current_branch} to {base_branch}"
+            print("🚫 Criação do PR cancelada.")
+            return
         
-        self.github_service.display_pr_description(base_branch, current_branch, description)
+        if not self.wait_for_push():
+            return
         
-        github_cli_available = self.github_service.check_cli_available()
+        if self.scheduler and self.scheduler.has("github_preflight"):
+            github_method = self.scheduler.result("github_preflight")
+        else:
+            github_method = self.github_service.check_available()
         pr_created_successfully = False
         
-        if github_cli_available:
-            print("✅ GitHub CLI autenticado. Tentando criar PR automaticamente...")
-            pr_url = self.github_service.create_pr_with_cli(base_branch, current_branch, description)
+        if github_method:
+            if github_method == "api":
+                print("✅ Token do GitHub válido. Criando PR pela API...")
+            else:
+                print("✅ GitHub CLI autenticado. Tentando criar PR automaticamente...")
+            pr_url = self.github_service.create_pr(github_method, base_branch, current_branch, description)
             if pr_url:
                 print(f"🎉 PR criado com sucesso!")
                 print(f"🔗 URL: {pr_url}")
@@ -136,15 +266,150 @@ class CoraCommands:
                 print("❌ Não foi possível criar o PR automaticamente.")
                 print("   Continuando com método manual...")
         else:
-            print("⚠️ GitHub CLI não disponível ou não autenticado.")
+            print("⚠️ Nenhum token do GitHub encontrado e GitHub CLI não disponível ou não autenticado.")
             print("   Continuando com método manual...")
         
         if not pr_created_successfully:
             self.github_service.open_pr_in_browser(current_branch)
     
+    def handle_batch(self, args):
+        if not self.ai_service.is_configured():
+            self.ui_service.show_api_key_error()
+            exit(1)
+        
+        from cli.batch import BatchRunner
+        runner = BatchRunner(self.ai_service, args.workers, args.rate_limit)
+        output_path = args.output or f"{os.path.splitext(args.batch)[0]}.results.jsonl"
+        if not runner.run(args.batch, output_path):
+            exit(1)
+    
+    def handle_reword(self, args):
+        if not self.ai_service.is_configured():
+            self.ui_service.show_api_key_error()
+            exit(1)
+        
+        from cli.reword import RewordError, RewordRunner
+        from core.git_service import GitCommandError
+        self.ai_service.prewarm()
+        runner = RewordRunner(self.ai_service, self.git_service, self.ui_service, args.workers, args.rate_limit)
+        try:
+            runner.run(args.reword, args.dry_run)
+        except (RewordError, GitCommandError) as e:
+            print(f"❌ {e}")
+            exit(1)
+    
+    def handle_suggest(self, args):
+        from utils.system_utils import SystemUtils
+
+        SystemUtils().load_env_file()
+        use_daemon = args.daemon or (os.getenv(DAEMON_VAR) or "false").lower() not in FALSE_VALUES
+        if use_daemon and self.uses_temporary_index():
+            use_daemon = False
+        output = sys.stdout
+
+        def write(chunk):
+            output.write(chunk)
+            output.flush()
+
+        if use_daemon:
+            from cli.daemon import DaemonClient, DaemonRequestError, DaemonUnavailableError
+            try:
+                DaemonClient().suggest(
+                    args.suggest, os.getcwd(), args.base, not args.no_cache, not args.no_heuristics, on_chunk=write
+                )
+                write("\n")
+                return
+            except DaemonRequestError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                exit(1)
+            except DaemonUnavailableError as e:
+                print(f"⚠️ Daemon indisponível ({e}). Gerando localmente...", file=sys.stderr)
+
+        from cli.suggest import SuggestionError, SuggestionRunner
+        from core.ai_service import AIRequestError
+        from core.git_service import GitCommandError
+
+        self.git_service.raise_errors = True
+        with redirect_stdout(sys.stderr):
+            try:
+                if not self.ai_service.is_configured():
+                    self.ui_service.show_api_key_error()
+                    exit(1)
+                runner = SuggestionRunner(self.ai_service)
+                chunks = runner.run(args.suggest, self.git_service, args.base, not args.no_cache, not args.no_heuristics)
+                for chunk in chunks:
+                    write(chunk)
+                write("\n")
+            except (SuggestionError, AIRequestError, GitCommandError) as e:
+                print(f"❌ {e}")
+                exit(1)
+    
+    def uses_temporary_index(self):
+        index_file = os.getenv("GIT_INDEX_FILE")
+        if not index_file:
+            return False
+        git_dir = self.git_service.get_git_dir()
+        return not git_dir or os.path.abspath(index_file) != os.path.join(os.path.abspath(git_dir), "index")
+    
+    def handle_watch(self, args):
+        if not self.ai_service.is_configured():
+            self.ui_service.show_api_key_error()
+            exit(1)
+        
+        from cli.watcher import IndexWatcher
+        if args.no_heuristics:
+            self.ai_service.heuristics_enabled = False
+        self.git_service.raise_errors = True
+        self.ai_service.prewarm()
+        if not IndexWatcher(self.ai_service, self.git_service).run():
+            exit(1)
+    
+    def handle_hook(self, install):
+        from cli.hooks import HookInstaller
+        
+        installer = HookInstaller(self.git_service)
+        if not (installer.install() if install else installer.uninstall()):
+            exit(1)
+    
+    def handle_serve(self):
+        from cli.daemon import CoraDaemon
+
+        if not CoraDaemon().serve():
+            exit(1)
+    
+    def handle_stop_daemon(self):
+        from cli.daemon import DaemonClient
+
+        if DaemonClient().stop():
+            print("🔴 Daemon encerrado.")
+        else:
+            print("ℹ️ Nenhum daemon em execução.")
+    
     def execute(self):
         args = self.parse_arguments()
         
+        if not (args.profile or args.trace):
+            self.run(args)
+            return
+        
+        profiler.enable()
+        try:
+            with profiler.span("cora", "workflow"):
+                self.run(args)
+        finally:
+            self.report_profile(args)
+    
+    def report_profile(self, args):
+        if args.profile:
+            self.ui_service.show_profile(profiler.summary(), profiler.counters)
+        if args.trace:
+            try:
+                profiler.export_chrome_trace(args.trace)
+                print(f"🧭 Trace salvo em {args.trace}")
+            except OSError as e:
+                print(f"⚠️ Não foi possível salvar o trace: {e}")
+    
+    def run(self, args):
         if args.help:
             self.ui_service.show_help()
             return
@@ -153,32 +418,119 @@ class CoraCommands:
             self.ui_service.show_version()
             return
         
-        if not any([args.branch, args.commit, args.pull_request]):
+        if args.cache_stats:
+            self.ui_service.show_cache_stats(self.ai_service.cache_service.get_stats())
+            return
+        
+        if args.serve:
+            self.handle_serve()
+            return
+        
+        if args.stop_daemon:
+            self.handle_stop_daemon()
+            return
+        
+        if args.suggest:
+            self.handle_suggest(args)
+            return
+        
+        if args.install_hook or args.uninstall_hook:
+            self.handle_hook(args.install_hook)
+            return
+        
+        if args.watch:
+            self.handle_watch(args)
+            return
+        
+        if not any([args.branch, args.commit, args.pull_request, args.batch, args.reword]):
             self.ui_service.show_welcome()
             return
         
+        if args.no_stream:
+            self.ai_service.stream_enabled = False
+        
+        if args.no_cache:
+            self.ai_service.cache_enabled = False
+        
+        if args.no_heuristics:
+            self.ai_service.heuristics_enabled = False
+        
+        if args.verbose:
+            self.ai_service.verbose = True
+        
+        if args.batch:
+            self.handle_batch(args)
+            return
+        
+        if args.reword:
+            self.handle_reword(args)
+            return
+        
+        from cli.workflow import PrefetchedGeneration, WorkflowScheduler
+        self.scheduler = WorkflowScheduler()
+        if args.pull_request:
+            self.scheduler.add("github_preflight", self.github_service.check_available)
+        
+        diff = generate_branch = generate_commit = None
         if args.branch or args.commit:
             if not self.ai_service.is_configured():
                 self.ui_service.show_api_key_error()
                 exit(1)
             
-            diff = self.git_service.get_diff()
-            if not diff:
-                self.ui_service.show_no_changes()
-                exit(0)
+            self.ai_service.prewarm()
+            with profiler.span("collect_diff", "workflow"):
+                diff = self.git_service.get_diff(args.stage_mode, args.pathspecs)
+                if not diff:
+                    self.ui_service.show_no_changes()
+                    exit(0)
+                index_tree = self.git_service.get_index_tree()
+                changes = self.git_service.get_staged_changes() if self.ai_service.heuristics_enabled else None
+            examples = self.ai_service.find_examples(self.git_service, diff)
+            stream = self.ai_service.stream_enabled
+            if args.branch:
+                generate_branch = PrefetchedGeneration(
+                    self.scheduler,
+                    "branch_suggestion",
+                    partial(
+                        self.ai_service.generate_branch_name, cache_scope=index_tree, examples=examples, changes=changes,
+                        git_service=self.git_service
+                    ),
+                    diff,
+                    stream
+                )
+            if args.commit:
+                generate_commit = PrefetchedGeneration(
+                    self.scheduler,
+                    "commit_suggestion",
+                    partial(self.ai_service.generate_commit_message, cache_scope=index_tree, examples=examples, changes=changes),
+                    diff,
+                    stream
+                )
         
-        original_branch_name = self.git_service.get_current_branch()
-        branch_name = None
+        # Com Ctrl-C não esperamos o push: cancel() o encerra
+        try:
+            self.run_workflow(args, diff, generate_branch, generate_commit)
+        except KeyboardInterrupt:
+            raise
+        except BaseException:
+            self.wait_for_push()
+            raise
+        self.wait_for_push()
+    
+    def run_workflow(self, args, diff, generate_branch, generate_commit):
         new_branch_created = False
         
         if args.branch:
-            branch_name, new_branch_created = self.handle_branch_creation(diff)
+            with profiler.span("branch", "workflow"):
+                branch_name, new_branch_created = self.handle_branch_creation(diff, generate_branch)
             if branch_name is None and not new_branch_created:
                 return
         
         if args.commit:
-            if not self.handle_commit_creation(diff, new_branch_created):
-                return
+            with profiler.span("commit", "workflow"):
+                if not self.handle_commit_creation(diff, generate_commit, new_branch_created, args.pull_request):
+                    return
         
         if args.pull_request:
-            self.handle_pull_request_creation() 
\ No newline at end of file
+            with profiler.span("pull_request", "workflow"):
+                self.handle_pull_request_creation()
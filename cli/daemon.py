@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+import utils.constants as constants
+from utils.constants import *
+from utils.system_utils import SystemUtils
+
+
+class DaemonUnavailableError(Exception):
+    pass
+
+
+class DaemonRequestError(Exception):
+    pass
+
+
+def get_socket_path():
+    socket_path = os.getenv(DAEMON_SOCKET_VAR)
+    if socket_path:
+        return socket_path
+    cache_dir = os.getenv(CACHE_DIR_VAR) or SystemUtils().get_cache_dir()
+    return os.path.join(cache_dir, DAEMON_SOCKET_NAME)
+
+
+def config_fingerprint():
+    names = sorted(value for name, value in vars(constants).items() if name.endswith("_VAR"))
+    payload = json.dumps([VERSION, [(name, os.getenv(name)) for name in names]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DaemonClient:
+    def __init__(self, socket_path=None):
+        self.socket_path = socket_path or get_socket_path()
+
+    def connect(self):
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailableError("unix sockets are not supported on this platform")
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(self.socket_path)
+        except OSError:
+            connection.close()
+            raise
+        return connection
+
+    def connect_or_spawn(self):
+        try:
+            return self.connect()
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass
+        except OSError as e:
+            raise DaemonUnavailableError(str(e)) from e
+
+        self.spawn()
+        deadline = time.monotonic() + DAEMON_SPAWN_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            try:
+                return self.connect()
+            except OSError:
+                continue
+        raise DaemonUnavailableError(f"daemon did not start within {DAEMON_SPAWN_TIMEOUT:.0f}s")
+
+    def spawn(self):
+        socket_dir = os.path.dirname(self.socket_path)
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        with open(os.path.join(socket_dir, DAEMON_LOG_NAME), "ab") as log_file:
+            subprocess.Popen(
+                [*SystemUtils().get_launch_command(), "--serve"],
+                stdin=subprocess.DEVNULL,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                cwd=os.path.expanduser("~"),
+                start_new_session=True,
+            )
+
+    def request(self, payload, on_chunk=None, spawn=True):
+        payload = dict(payload, fingerprint=config_fingerprint())
+        for _ in range(2):
+            connection = self.connect_or_spawn() if spawn else self.connect()
+            with connection, connection.makefile("rwb") as stream:
+                stream.write(json.dumps(payload).encode("utf-8") + b"\n")
+                stream.flush()
+                for line in stream:
+                    event = json.loads(line)
+                    if event["event"] == "chunk":
+                        if on_chunk:
+                            on_chunk(event["text"])
+                    elif event["event"] == "done":
+                        return event.get("text", "")
+                    elif event["event"] == "error":
+                        raise DaemonRequestError(event["message"])
+                    elif event["event"] == "restart":
+                        break
+                else:
+                    raise DaemonUnavailableError("daemon closed the connection")
+            self.wait_for_shutdown()
+        raise DaemonUnavailableError("daemon configuration keeps changing")
+
+    def wait_for_shutdown(self):
+        deadline = time.monotonic() + DAEMON_SPAWN_TIMEOUT
+        while os.path.exists(self.socket_path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def suggest(self, task, cwd, base=None, use_cache=True, heuristics=True, on_chunk=None):
+        return self.request(
+            {"task": task, "cwd": cwd, "base": base, "use_cache": use_cache, "heuristics": heuristics}, on_chunk
+        )
+
+    def stop(self):
+        try:
+            return self.request({"task": "shutdown"}, spawn=False) is not None
+        except (OSError, DaemonUnavailableError):
+            return False
+
+
+class CoraDaemon:
+    def __init__(self, socket_path=None, idle_timeout=None):
+        from cli.suggest import SuggestionRunner
+        from core.ai_service import AIService
+
+        self.socket_path = socket_path or get_socket_path()
+        self.ai_service = AIService()
+        self.ai_service.raise_errors = True
+        self.fingerprint = config_fingerprint()
+        self.idle_timeout = float(idle_timeout or os.getenv(DAEMON_IDLE_TIMEOUT_VAR) or DEFAULT_DAEMON_IDLE_TIMEOUT)
+        self.runner = SuggestionRunner(self.ai_service)
+        self.git_services = {}
+        self.lock = threading.Lock()
+        self.active_requests = 0
+        self.last_activity = time.monotonic()
+        self.server = None
+
+    def is_running(self):
+        try:
+            DaemonClient(self.socket_path).connect().close()
+            return True
+        except OSError:
+            return False
+
+    def serve(self):
+        import socketserver
+
+        if self.is_running():
+            print(f"ℹ️ Daemon já está em execução em {self.socket_path}")
+            return False
+        os.makedirs(os.path.dirname(self.socket_path), mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                daemon.handle_connection(self.rfile, self.wfile)
+
+        self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self.server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+        self.ai_service.prewarm()
+        threading.Thread(target=self.watch_idle, daemon=True).start()
+        print(f"🟢 Daemon do {COMMAND_NAME} ouvindo em {self.socket_path} (pid {os.getpid()})", flush=True)
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            for git_service in self.git_services.values():
+                git_service.backend.close()
+            print("🔴 Daemon encerrado", flush=True)
+        return True
+
+    def shutdown(self):
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def watch_idle(self):
+        while True:
+            time.sleep(min(5.0, self.idle_timeout))
+            with self.lock:
+                idle = time.monotonic() - self.last_activity
+                if self.active_requests == 0 and idle >= self.idle_timeout:
+                    print(f"💤 Sem uso há {idle:.0f}s, encerrando", flush=True)
+                    self.shutdown()
+                    return
+
+    def get_git_service(self, cwd):
+        from core.git_service import GitService
+
+        with self.lock:
+            git_service = self.git_services.get(cwd)
+            if git_service is None:
+                git_service = GitService(repo_path=cwd, raise_errors=True)
+                self.git_services[cwd] = git_service
+        git_service.refresh()
+        return git_service
+
+    def handle_connection(self, reader, writer):
+        def send(event):
+            writer.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+            writer.flush()
+
+        with self.lock:
+            self.active_requests += 1
+        try:
+            line = reader.readline()
+            if line:
+                self.handle_request(json.loads(line), send)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.lock:
+                self.active_requests -= 1
+                self.last_activity = time.monotonic()
+
+    def handle_request(self, request, send):
+        from cli.suggest import SuggestionError
+        from core.ai_service import AIRequestError
+        from core.git_service import GitCommandError
+
+        task = request.get("task")
+        if task == "shutdown":
+            send({"event": "done", "text": ""})
+            self.shutdown()
+            return
+        if request.get("fingerprint") != self.fingerprint:
+            send({"event": "restart"})
+            self.shutdown()
+            return
+        if task == "ping":
+            send({"event": "done", "text": str(os.getpid())})
+            return
+
+        chunks = None
+        try:
+            git_service = self.get_git_service(request.get("cwd") or os.getcwd())
+            chunks = self.runner.run(
+                task, git_service, request.get("base"), request.get("use_cache", True), request.get("heuristics", True)
+            )
+            parts = []
+            for chunk in chunks:
+                parts.append(chunk)
+                send({"event": "chunk", "text": chunk})
+            send({"event": "done", "text": "".join(parts)})
+        except (SuggestionError, AIRequestError, GitCommandError) as e:
+            send({"event": "error", "message": str(e)})
+        except Exception as e:
+            send({"event": "error", "message": f"{type(e).__name__}: {e}"})
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
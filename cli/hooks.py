@@ -0,0 +1,70 @@
+import os
+import shlex
+from utils.constants import *
+from utils.system_utils import SystemUtils
+
+HOOK_TEMPLATE = """#!/bin/sh
+{marker}
+# Gerado por `{command} --install-hook`. Para remover: `{command} --uninstall-hook`.
+case "$2" in
+  message|merge|squash|commit) exit 0 ;;
+esac
+suggestion=$({launch_command} --suggest commit 2>/dev/null) || exit 0
+[ -n "$suggestion" ] || exit 0
+{{ printf '%s\\n' "$suggestion"; cat "$1"; }} > "$1.{command}" && mv "$1.{command}" "$1"
+exit 0
+"""
+
+
+class HookInstaller:
+    def __init__(self, git_service):
+        self.git_service = git_service
+
+    def get_hook_path(self):
+        hooks_dir = self.git_service.get_hooks_dir()
+        return os.path.join(hooks_dir, HOOK_NAME) if hooks_dir else None
+
+    def is_own_hook(self, path):
+        try:
+            with open(path, encoding="utf-8") as file:
+                return HOOK_MARKER in file.read()
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def render(self):
+        return HOOK_TEMPLATE.format(
+            marker=HOOK_MARKER,
+            command=COMMAND_NAME,
+            launch_command=" ".join(shlex.quote(part) for part in SystemUtils().get_launch_command()),
+        )
+
+    def install(self):
+        path = self.get_hook_path()
+        if not path:
+            print("❌ Não é um repositório git.")
+            return False
+        if os.path.exists(path) and not self.is_own_hook(path):
+            print(f"⚠️ Já existe um hook {HOOK_NAME} em {path}, que não foi criado pelo {COMMAND_NAME}.")
+            print("   Remova-o ou integre a chamada manualmente:")
+            print(f"   {COMMAND_NAME} --suggest commit")
+            return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.chmod(path, 0o755)
+        print(f"✅ Hook instalado em {path}")
+        print(f"   Rode `{COMMAND_NAME} --watch` para ter a mensagem pronta antes do git commit.")
+        return True
+
+    def uninstall(self):
+        path = self.get_hook_path()
+        if not path or not os.path.exists(path):
+            print(f"ℹ️ Nenhum hook {HOOK_NAME} instalado.")
+            return False
+        if not self.is_own_hook(path):
+            print(f"⚠️ O hook {path} não foi criado pelo {COMMAND_NAME} e não será removido.")
+            return False
+        os.remove(path)
+        print(f"🗑️ Hook removido de {path}")
+        return True
@@ -0,0 +1,118 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.profiler import profiler
+from utils.rate_limiter import TokenBucket
+
+
+class RewordError(Exception):
+    pass
+
+
+class RewordRunner:
+    def __init__(self, ai_service, git_service, ui_service, workers=4, requests_per_minute=None):
+        self.ai_service = ai_service
+        self.git_service = git_service
+        self.ui_service = ui_service
+        self.workers = max(1, workers)
+        self.ai_service.raise_errors = True
+        self.git_service.raise_errors = True
+        if requests_per_minute:
+            self.ai_service.rate_limiter = TokenBucket(requests_per_minute / 60, capacity=self.workers)
+
+    def run(self, revision_range, dry_run=False):
+        branch, head, commits = self.load_commits(revision_range)
+        messages = self.generate_messages(commits)
+
+        if dry_run:
+            self.ui_service.show_reword_plan(commits, messages)
+            print("ℹ️ --dry-run: nenhum commit foi reescrito.")
+            return True
+
+        messages = self.ui_service.review_reword(commits, messages)
+        if messages is None:
+            print("🚫 Reescrita cancelada.")
+            return True
+        if not messages:
+            print("ℹ️ Nenhuma mensagem alterada. Nada a reescrever.")
+            return True
+
+        new_head = self.rewrite(branch, head, commits, messages)
+        print(f"✅ {len(messages)} commits reescritos em '{branch}' ({head[:8]} → {new_head[:8]}).")
+        print(f"   Para desfazer: git reset --soft {head[:8]}")
+        print(f"   Se a branch já foi enviada, use: git push --force-with-lease origin {branch}")
+        return True
+
+    def load_commits(self, revision_range):
+        if "..." in revision_range:
+            raise RewordError(f"symmetric ranges are not supported: '{revision_range}'")
+        if ".." not in revision_range:
+            revision_range = f"{revision_range}..HEAD"
+        base, tip = revision_range.split("..", 1)
+        base, tip = base or "HEAD", tip or "HEAD"
+
+        branch = self.git_service.get_current_branch()
+        if not branch or branch == "HEAD":
+            raise RewordError("HEAD is detached, check out the branch to reword first")
+        revisions = self.git_service.get_revisions(f"{base}^{{commit}}", f"{tip}^{{commit}}", "HEAD")
+        if not revisions:
+            raise RewordError(f"could not resolve '{revision_range}'")
+        if revisions[1] != revisions[2]:
+            raise RewordError(f"the range must end at the current branch '{branch}' (use {base}..HEAD)")
+
+        commits = self.git_service.get_range_commits(f"{revisions[0]}..{revisions[2]}")
+        if not commits:
+            raise RewordError(f"no commits in '{revision_range}'")
+        return branch, revisions[2], commits
+
+    def generate_messages(self, commits):
+        pending = [commit for commit in commits if len(commit["parents"]) < 2]
+        messages = {}
+        skipped = len(commits) - len(pending)
+        print(f"🤖 Gerando mensagens para {len(pending)} commits com até {self.workers} requisições simultâneas..."
+              + (f" ({skipped} merges mantidos)" if skipped else ""))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.generate_message, commit): commit for commit in pending}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    commit = futures[future]
+                    message = future.result()
+                    if message:
+                        messages[commit["sha"]] = message
+                    print(f"   ✅ {commit['sha'][:8]} ({done}/{len(pending)})")
+            except Exception as e:
+                for pending_future in futures:
+                    pending_future.cancel()
+                raise RewordError(f"{type(e).__name__}: {e}") from e
+        print(f"🏁 Mensagens geradas em {time.perf_counter() - started:.1f}s.")
+        return messages
+
+    def generate_message(self, commit):
+        with profiler.span("reword_commit", "workflow", sha=commit["sha"][:8]):
+            diff = self.git_service.get_commit_diff(commit["sha"])
+            if not diff:
+                return None
+            changes = self.git_service.get_commit_changes(commit["sha"]) if self.ai_service.heuristics_enabled else None
+            message = self.ai_service.generate_commit_message(diff, cache_scope=commit["sha"], changes=changes)
+        message = (message or "").strip()
+        return message if message and message != commit["message"].split("\n", 1)[0] else None
+
+    def build_message(self, commit, subject):
+        parts = commit["message"].split("\n\n", 1)
+        return f"{subject}\n\n{parts[1]}" if len(parts) > 1 and parts[1].strip() else subject
+
+    def rewrite(self, branch, head, commits, messages):
+        rewritten = {}
+        with profiler.span("reword_rewrite", "git", commits=len(commits)):
+            for commit in commits:
+                parents = [rewritten.get(parent, parent) for parent in commit["parents"]]
+                subject = messages.get(commit["sha"])
+                if subject is None and parents == commit["parents"]:
+                    continue
+                message = self.build_message(commit, subject) if subject else commit["message"]
+                rewritten[commit["sha"]] = self.git_service.commit_tree(commit, parents, message)
+            new_head = rewritten.get(commits[-1]["sha"], head)
+            self.git_service.update_ref(f"refs/heads/{branch}", new_head, head, f"cora: reword {len(messages)} commits")
+            self.git_service.update_ref("ORIG_HEAD", head)
+        return new_head
@@ -0,0 +1,63 @@
+from functools import partial
+
+SUGGEST_TASKS = ("commit", "branch", "pr")
+
+
+class SuggestionError(Exception):
+    pass
+
+
+class SuggestionRunner:
+    def __init__(self, ai_service):
+        self.ai_service = ai_service
+
+    def run(self, task, git_service, base=None, use_cache=True, heuristics=True, cancelled=None):
+        if task not in SUGGEST_TASKS:
+            raise SuggestionError(f"unknown task '{task}', expected one of {', '.join(SUGGEST_TASKS)}")
+        if not git_service.get_work_tree():
+            raise SuggestionError("not a git repository")
+        if task == "pr":
+            suggestion = self.suggest_pr(git_service, base, use_cache)
+        else:
+            suggestion = self.suggest_from_index(task, git_service, use_cache, heuristics, cancelled)
+        return iter([suggestion]) if isinstance(suggestion, str) else suggestion
+
+    def suggest_from_index(self, task, git_service, use_cache, heuristics, cancelled=None):
+        diff = git_service.get_staged_diff()
+        if not diff:
+            raise SuggestionError("no staged changes")
+        index_tree = git_service.get_index_tree()
+        use_heuristics = heuristics and self.ai_service.heuristics_enabled
+        changes = git_service.get_staged_changes() if use_heuristics else None
+        examples = self.ai_service.find_examples(git_service, diff)
+        if task == "commit":
+            generate = self.ai_service.generate_commit_message
+        else:
+            generate = partial(self.ai_service.generate_branch_name, git_service=git_service)
+        return generate(
+            diff, stream=True, use_cache=use_cache, cache_scope=index_tree, examples=examples, changes=changes,
+            cancelled=cancelled
+        )
+
+    def suggest_pr(self, git_service, base, use_cache):
+        current_branch = git_service.get_current_branch()
+        if not base:
+            ranked_branches = git_service.rank_base_branches(current_branch)
+            base = ranked_branches[0]["name"] if ranked_branches and ranked_branches[0].get("ahead") else None
+            if not base:
+                raise SuggestionError("could not pick a base branch, pass one with --base")
+
+        revisions = git_service.get_revisions(base, current_branch)
+        if not revisions:
+            raise SuggestionError(f"could not resolve '{base}' and '{current_branch}'")
+        diff = git_service.get_branch_diff(base, current_branch)
+        if not diff:
+            raise SuggestionError(f"no differences between '{base}' and '{current_branch}'")
+        return self.ai_service.generate_pr_description(
+            diff,
+            stream=True,
+            use_cache=use_cache,
+            cache_scope="...".join(revisions),
+            commits=git_service.get_branch_commits(base, current_branch),
+            load_commit_diff=git_service.get_commit_diff
+        )
@@ -0,0 +1,165 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from utils.cancel_event import CancelEvent
+from utils.constants import *
+
+INOTIFY_EVENT = struct.Struct("iIII")
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+INDEX_FILE_NAME = "index"
+
+
+class InotifySource:
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        changed = False
+        try:
+            while True:
+                data = os.read(self.fd, 64 * 1024)
+                offset = 0
+                while offset < len(data):
+                    _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                    name = data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b"\0")
+                    changed = changed or name == INDEX_FILE_NAME.encode()
+                    offset += INOTIFY_EVENT.size + length
+        except BlockingIOError:
+            pass
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingSource:
+    def __init__(self, index_path, interval=WATCH_POLL_INTERVAL):
+        self.index_path = index_path
+        self.interval = interval
+        self.signature = self.stat()
+
+    def stat(self):
+        try:
+            stat = os.stat(self.index_path)
+            return stat.st_ino, stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
+
+    def wait(self, timeout):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        signature = self.stat()
+        changed = signature != self.signature
+        self.signature = signature
+        return changed
+
+    def close(self):
+        pass
+
+
+class IndexWatcher:
+    def __init__(self, ai_service, git_service, debounce=None):
+        from cli.suggest import SuggestionRunner
+
+        self.ai_service = ai_service
+        self.git_service = git_service
+        self.debounce = float(debounce or os.getenv(WATCH_DEBOUNCE_VAR) or DEFAULT_WATCH_DEBOUNCE)
+        self.runner = SuggestionRunner(ai_service)
+        self.job = None
+
+    def create_source(self, git_dir):
+        if sys.platform.startswith("linux"):
+            try:
+                return InotifySource(git_dir), "inotify"
+            except (OSError, AttributeError):
+                pass
+        return PollingSource(os.path.join(git_dir, INDEX_FILE_NAME)), "polling"
+
+    def run(self):
+        git_dir = self.git_service.get_git_dir()
+        if not git_dir:
+            print("❌ Não é um repositório git.")
+            return False
+
+        source, mode = self.create_source(git_dir)
+        print(f"👀 Observando {os.path.join(git_dir, INDEX_FILE_NAME)} ({mode}, debounce {self.debounce:g}s). Ctrl+C para sair.")
+        last_tree = None
+        changed_at = time.monotonic() - self.debounce
+        try:
+            while True:
+                timeout = None
+                if changed_at is not None:
+                    timeout = max(0.0, changed_at + self.debounce - time.monotonic())
+                if source.wait(timeout):
+                    changed_at = time.monotonic()
+                    continue
+                if changed_at is None or time.monotonic() - changed_at < self.debounce:
+                    continue
+                changed_at = None
+                tree = self.git_service.get_index_tree()
+                if tree and tree != last_tree:
+                    last_tree = tree
+                    self.start(tree)
+        finally:
+            self.cancel(announce=False)
+            source.close()
+
+    def start(self, tree):
+        self.cancel()
+        cancelled = CancelEvent()
+        thread = threading.Thread(target=self.generate, args=(tree, cancelled), daemon=True)
+        self.job = (thread, cancelled)
+        thread.start()
+
+    def cancel(self, announce=True):
+        if self.job is None:
+            return
+        thread, cancelled = self.job
+        if thread.is_alive():
+            cancelled.set()
+            if announce:
+                print("✋ Índice mudou, geração anterior cancelada.")
+        self.job = None
+
+    def generate(self, tree, cancelled):
+        from cli.suggest import SuggestionError
+        from core.ai_service import AIRequestError
+        from core.git_service import GitCommandError
+
+        chunks = None
+        started = time.perf_counter()
+        try:
+            self.git_service.refresh()
+            chunks = self.runner.run("commit", self.git_service, cancelled=cancelled)
+            parts = []
+            for chunk in chunks:
+                if cancelled.is_set():
+                    return
+                parts.append(chunk)
+            if not cancelled.is_set():
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                print(f"✅ {tree[:7]}: {''.join(parts)} ({elapsed_ms:.0f} ms)")
+        except SuggestionError:
+            pass
+        except (AIRequestError, GitCommandError) as e:
+            if not cancelled.is_set():
+                print(f"⚠️ {tree[:7]}: {e}")
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
@@ -0,0 +1,95 @@
+import queue
+import threading
+from concurrent.futures import Future
+from utils.profiler import profiler
+
+STREAM_END = object()
+
+
+class WorkflowScheduler:
+    def __init__(self):
+        self.tasks = {}
+
+    def add(self, name, function, depends_on=()):
+        dependencies = [self.tasks[dependency] for dependency in depends_on]
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                results = [dependency.result() for dependency in dependencies]
+                with profiler.span(name, "scheduler"):
+                    result = function(*results)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        self.tasks[name] = future
+        threading.Thread(target=run, name=f"cora-{name}", daemon=True).start()
+        return future
+
+    def has(self, name):
+        return name in self.tasks
+
+    def result(self, name):
+        return self.tasks[name].result()
+
+    def pop(self, name):
+        return self.tasks.pop(name, None)
+
+
+class StreamBuffer:
+    def __init__(self):
+        self.chunks = queue.Queue()
+
+    def fill(self, produce):
+        try:
+            chunks = produce()
+            if isinstance(chunks, str):
+                self.chunks.put(chunks)
+            else:
+                for chunk in chunks:
+                    self.chunks.put(chunk)
+        except BaseException as e:
+            self.chunks.put(e)
+        finally:
+            self.chunks.put(STREAM_END)
+
+    def fail_with(self, future):
+        if future.exception() is not None:
+            self.chunks.put(future.exception())
+            self.chunks.put(STREAM_END)
+
+    def __iter__(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is STREAM_END:
+                return
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield chunk
+
+
+class PrefetchedGeneration:
+    def __init__(self, scheduler, name, generation_function, diff, stream, depends_on=()):
+        self.generation_function = generation_function
+        self.stream = stream
+        self.buffer = StreamBuffer() if stream else None
+        self.future = scheduler.add(name, lambda *_: self.prefetch(diff), depends_on)
+        if self.buffer is not None:
+            self.future.add_done_callback(self.buffer.fail_with)
+
+    def prefetch(self, diff):
+        if self.buffer is None:
+            return self.generation_function(diff)
+        self.buffer.fill(lambda: self.generation_function(diff, stream=True))
+
+    def __call__(self, diff, history=None, stream=False, **kwargs):
+        future, self.future = self.future, None
+        if future is None or history or stream != self.stream:
+            return self.generation_function(diff, history=history, stream=stream, **kwargs)
+        if self.buffer is not None:
+            return iter(self.buffer)
+        return future.result()
@@ -0,0 +1,141 @@
+import importlib.util
+import os
+import random
+import socket
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from utils.constants import *
+
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+
+
+def abort_stream(stream):
+    # Fechar a resposta não acorda a thread bloqueada na leitura; shutdown no socket sim.
+    # Em HTTP/2 o socket é compartilhado com outras requisições, então só a resposta é fechada
+    response = getattr(stream, "response", None)
+    network_stream = response.extensions.get("network_stream") if response is not None else None
+    if network_stream is None or response.http_version == "HTTP/2":
+        stream.close()
+        return
+    try:
+        network_stream.get_extra_info("socket").shutdown(socket.SHUT_RDWR)
+    except (AttributeError, OSError):
+        stream.close()
+
+
+class AIConnection:
+    def __init__(self, api_key, base_url=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = float(os.getenv(AI_TIMEOUT_VAR) or DEFAULT_AI_TIMEOUT)
+        self.connect_timeout = float(os.getenv(AI_CONNECT_TIMEOUT_VAR) or DEFAULT_AI_CONNECT_TIMEOUT)
+        self.max_retries = max(0, int(os.getenv(AI_MAX_RETRIES_VAR) or DEFAULT_AI_MAX_RETRIES))
+        self.retry_backoff = float(os.getenv(AI_RETRY_BACKOFF_VAR) or DEFAULT_AI_RETRY_BACKOFF)
+        self.http2_enabled = (os.getenv(AI_HTTP2_VAR) or "true").lower() not in FALSE_VALUES
+        self.http_client = None
+        self._client = None
+        self._lock = threading.Lock()
+        self._prewarm_thread = None
+        self.closed = False
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._build_client()
+        return self._client
+
+    def _build_client(self):
+        import httpx
+        from openai import OpenAI
+
+        timeout = httpx.Timeout(self.timeout, connect=self.connect_timeout)
+        self.http_client = httpx.Client(
+            http2=self.http2_enabled and importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=DEFAULT_AI_MAX_CONNECTIONS,
+                max_keepalive_connections=DEFAULT_AI_MAX_CONNECTIONS,
+                keepalive_expiry=DEFAULT_AI_KEEPALIVE_EXPIRY,
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+        )
+
+        client_kwargs = {
+            "api_key": self.api_key,
+            "http_client": self.http_client,
+            "max_retries": 0,
+            "timeout": timeout,
+        }
+        if self.base_url:
+            client_kwargs["base_url"] = self.base_url
+        return OpenAI(**client_kwargs)
+
+    def prewarm(self):
+        with self._lock:
+            if self._prewarm_thread is not None:
+                return
+            self._prewarm_thread = threading.Thread(target=self._prewarm, daemon=True)
+        self._prewarm_thread.start()
+
+    def _prewarm(self):
+        try:
+            client = self.client
+            self.http_client.head(str(client.base_url))
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            http_client, self.http_client, self._client = self.http_client, None, None
+        if http_client is not None:
+            http_client.close()
+
+    def create_completion(self, **kwargs):
+        attempt = 0
+        while True:
+            if self.closed:
+                raise ConnectionError("AI connection closed")
+            try:
+                return self.client.chat.completions.create(**kwargs)
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+                if delay is None or attempt >= self.max_retries or self.closed:
+                    raise
+                attempt += 1
+                reason = getattr(e, "status_code", None) or type(e).__name__
+                print(f"⏳ Falha temporária na IA ({reason}). Nova tentativa {attempt}/{self.max_retries} em {delay:.1f}s...")
+                time.sleep(delay)
+
+    def retry_delay(self, error, attempt):
+        import openai
+
+        if isinstance(error, openai.APIStatusError):
+            if error.status_code not in RETRYABLE_STATUS_CODES and error.status_code < 500:
+                return None
+        elif not isinstance(error, openai.APIConnectionError):
+            return None
+
+        retry_after = self.parse_retry_after(getattr(error, "response", None))
+        if retry_after is not None:
+            return min(retry_after, MAX_AI_RETRY_AFTER)
+        return random.uniform(0, min(MAX_AI_RETRY_BACKOFF, self.retry_backoff * 2 ** attempt))
+
+    def parse_retry_after(self, response):
+        if response is None:
+            return None
+        headers = response.headers
+        try:
+            if headers.get("retry-after-ms"):
+                return max(0.0, float(headers["retry-after-ms"]) / 1000)
+            retry_after = headers.get("retry-after")
+            if not retry_after:
+                return None
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
@@ -1,40 +1,412 @@
+import hashlib
+import json
 import os
-from openai import OpenAI
-from dotenv import load_dotenv
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from core.ai_connection import AIConnection, abort_stream
+from core.cache_service import CacheService
+from core.candidate_pool import CandidatePool
+from core.diff_compactor import DiffCompactor
+from core.hedging import HedgedRequest, LatencyStats
+from core.heuristic_generator import HeuristicGenerator
+from core.history_index import HistoryIndex
+from core.model_router import ModelRouter
+from core.suggestion_validator import SuggestionValidator
 from utils.constants import *
+from utils.profiler import profiler
+from utils.system_utils import SystemUtils
+from utils.token_utils import TokenUtils
 
-load_dotenv()
+PR_DESCRIPTION_PROMPT = """
+Analise as alterações de código a seguir e gere um relatório detalhado seguindo EXATAMENTE este formato:
+
+**Feature:** [Título resumido da funcionalidade ou alteração principal]
+
+**Descrição:**
+[Breve explicação do que foi implementado ou alterado]
+
+**Resumo:**
+[Resumo técnico das principais mudanças implementadas]
+
+**Descrição do problema:**
+[Contextualize o problema ou necessidade antes da alteração]
+
+**Solução implementada:**
+[Liste as principais mudanças técnicas:]
+- ➕ [Para adições/criações]
+- 🔧 [Para lógica de negócio/funções]
+- 📦 [Para componentes/módulos]
+- 🧪 [Para testes]
+- 🛣️ [Para rotas/APIs]
+- 📝 [Para configurações/documentação]
+- 🎨 [Para melhorias de UI/UX]
+- 🚀 [Para otimizações]
+
+**Impacto Esperado:**
+[Explique os benefícios, melhorias ou resultados esperados após a implementação]
+
+Seja técnico, detalhado e mantenha EXATAMENTE esta estrutura em formato markdown.
+
+{changes}
+"""
+
+PR_CHUNK_SUMMARY_PROMPT = (
+    "Você está ajudando a descrever um pull request grande, dividido em partes.\n"
+    "Resuma de forma técnica e objetiva as alterações de código da parte {part} de {total} abaixo.\n"
+    "Liste em tópicos curtos o que foi adicionado, alterado ou removido, citando arquivos, funções e componentes relevantes.\n"
+    "Não invente informações. Apenas os tópicos, sem introdução ou conclusão.\n\n"
+    "Alterações de código:\n{diff}"
+)
+
+PR_COMMIT_SUMMARY_PROMPT = (
+    "Você está ajudando a descrever um pull request a partir dos seus commits.\n"
+    "Resuma de forma técnica e objetiva as alterações do commit {sha} (\"{subject}\") abaixo.\n"
+    "Liste em tópicos curtos o que foi adicionado, alterado ou removido, citando arquivos, funções e componentes relevantes.\n"
+    "Não invente informações. Apenas os tópicos, sem introdução ou conclusão.\n\n"
+    "Alterações de código:\n{diff}"
+)
+
+class AIRequestError(Exception):
+    pass
+
+class PromptTooLargeError(AIRequestError):
+    pass
 
 class AIService:
     def __init__(self):
+        SystemUtils().load_env_file()
         self.api_key = os.getenv(API_KEY_VAR)
         self.api_base_url = os.getenv(API_BASE_URL_VAR)
         self.model = os.getenv(MODEL_VAR)
-        
-        client_kwargs = {"api_key": self.api_key}
-        if self.api_base_url:
-            client_kwargs["base_url"] = self.api_base_url
-        
-        self.client = OpenAI(**client_kwargs)
+        self.model_router = ModelRouter(self.model, os.getenv(MODEL_ROUTES_VAR))
+        if self.model_router.error:
+            print(f"⚠️ {MODEL_ROUTES_VAR} inválido ({self.model_router.error}). Usando {MODEL_VAR} para todas as tarefas.")
+        self.verbose = False
+        self.history_examples = int(os.getenv(HISTORY_EXAMPLES_VAR) or DEFAULT_HISTORY_EXAMPLES)
+        self.heuristics_enabled = (os.getenv(HEURISTICS_VAR) or "true").lower() not in FALSE_VALUES
+        self.heuristic_generator = HeuristicGenerator()
+        self.candidate_count = min(
+            MAX_SUGGESTION_CANDIDATES, max(1, int(os.getenv(SUGGESTION_CANDIDATES_VAR) or DEFAULT_SUGGESTION_CANDIDATES))
+        )
+        self.candidate_pool = CandidatePool(self.candidate_count)
+        self.suggestion_validator = SuggestionValidator()
+        self.output_limits = (os.getenv(OUTPUT_LIMITS_VAR) or "true").lower() not in FALSE_VALUES
+        self.connection = AIConnection(self.api_key, self.api_base_url)
+        self.cancel_event = threading.Event()
+        self.hedge_model = os.getenv(HEDGE_MODEL_VAR)
+        self.hedge_base_url = os.getenv(HEDGE_API_BASE_URL_VAR) or self.api_base_url
+        self.hedge_connection = None
+        if self.hedge_model or self.hedge_base_url != self.api_base_url:
+            hedge_api_key = os.getenv(HEDGE_API_KEY_VAR)
+            if self.hedge_base_url == self.api_base_url and not hedge_api_key:
+                self.hedge_connection = self.connection
+            else:
+                self.hedge_connection = AIConnection(hedge_api_key or self.api_key, self.hedge_base_url)
+        hedge_delay_ms = os.getenv(HEDGE_DELAY_MS_VAR)
+        self.hedge_delay = float(hedge_delay_ms) / 1000 if hedge_delay_ms else None
+        self.raise_errors = False
+        self.rate_limiter = None
+        self.stream_enabled = (os.getenv(STREAM_VAR) or "true").lower() not in FALSE_VALUES
+        self.cache_enabled = (os.getenv(CACHE_VAR) or "true").lower() not in FALSE_VALUES
+        self.cache_service = CacheService(
+            os.getenv(CACHE_DIR_VAR),
+            int(os.getenv(CACHE_MAX_BYTES_VAR) or DEFAULT_CACHE_MAX_BYTES),
+            float(os.getenv(CACHE_MAX_AGE_DAYS_VAR) or DEFAULT_CACHE_MAX_AGE_DAYS)
+        )
+        self.diff_compactor = DiffCompactor(
+            int(os.getenv(DIFF_TOKEN_BUDGET_VAR) or DEFAULT_DIFF_TOKEN_BUDGET)
+        )
+        self.token_utils = TokenUtils()
+        self.pr_mode = (os.getenv(PR_MODE_VAR) or DEFAULT_PR_MODE).lower()
+        self.pr_chunk_tokens = int(os.getenv(PR_CHUNK_TOKENS_VAR) or DEFAULT_PR_CHUNK_TOKENS)
+        self.pr_max_workers = max(1, int(os.getenv(PR_MAX_WORKERS_VAR) or DEFAULT_PR_MAX_WORKERS))
+        self.latency_stats = LatencyStats(os.path.join(self.cache_service.cache_dir, LATENCY_STATS_FILE_NAME))
     
+    @property
+    def client(self):
+        return self.connection.client
+
+    def prewarm(self):
+        if self.is_configured():
+            self.connection.prewarm()
+            if self.hedge_connection is not None:
+                self.hedge_connection.prewarm()
+
+    def cancel_requests(self):
+        self.cancel_event.set()
+        self.connection.close()
+        if self.hedge_connection is not None:
+            self.hedge_connection.close()
+
     def is_configured(self):
         return bool(self.api_key)
+
+    def find_examples(self, git_service, diff):
+        if self.history_examples <= 0:
+            return []
+        with profiler.span("history_examples", "workflow"):
+            examples = HistoryIndex(git_service, self.cache_service.cache_dir).similar_commits(diff, self.history_examples)
+        if self.verbose:
+            print(f"📚 {len(examples)} commits anteriores usados como exemplo")
+        return examples
     
-    def get_suggestion(self, prompt, model=None, temperature=DEFAULT_TEMPERATURE):
+    def build_cache_key(self, task, diff, temperature, history=None, cache_scope=None, use_cache=True):
+        if not (use_cache and self.cache_enabled):
+            return None
+        payload = {
+            "task": task,
+            "scope": cache_scope or hashlib.sha256(diff.encode("utf-8")).hexdigest(),
+            "model": self.model,
+            "routes": self.model_router.signature,
+            "base_url": self.api_base_url,
+            "prompt_version": PROMPT_VERSION,
+            "candidates": self.candidate_count,
+            "temperature": round(temperature, 2),
+            "history": list(history or []),
+        }
+        if self.hedge_connection is not None:
+            payload["hedge"] = [self.hedge_base_url, self.hedge_model]
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get_cached_suggestion(self, cache_key, stream=False):
+        cached = self.cache_service.get(cache_key) if cache_key else None
+        if cached is None:
+            return None
+        return iter([cached]) if stream else cached
+
+    def get_suggestion(self, prompt, model=None, temperature=DEFAULT_TEMPERATURE, stream=False, cache_key=None, task=None, cancelled=None):
+        cached = self.get_cached_suggestion(cache_key, stream)
+        if cached is not None:
+            profiler.count("cache_hits")
+            return cached
+        return self.request_suggestion(prompt, model, temperature, stream, cache_key, task, cancelled)
+
+    def heuristic_suggestion(self, task, changes, diff, history=None, stream=False, git_service=None):
+        if not (self.heuristics_enabled and changes) or history:
+            return None
+        suggestion = self.heuristic_generator.classify(changes, diff)
+        self.cache_service.increment("heuristic_checks")
+        if suggestion is None:
+            return None
+        value = suggestion[0] if task == "commit" else suggestion[1]
+        if task == "branch":
+            # Nomes fixos (chore/update-dependencies) se repetem; o sufixo evita colidir com uma branch existente
+            value = self.suggestion_validator.repair_branch(value, git_service=git_service)
+            if value is None:
+                return None
+        self.cache_service.increment("heuristic_hits")
+        profiler.count("heuristic_hits")
+        if self.verbose:
+            print(f"⚡ {task}: sugestão gerada localmente, sem chamada à IA")
+        return iter([value]) if stream else value
+
+    def select_model(self, task, prompt):
+        prompt_tokens = self.token_utils.estimate(prompt)
+        model, max_prompt_tokens = self.model_router.route(task, prompt_tokens)
         if model is None:
-            model = self.model
+            self.handle_request_error(PromptTooLargeError(
+                f"prompt for '{task}' has ~{prompt_tokens} tokens, more than the largest tier in "
+                f"{MODEL_ROUTES_VAR} ({max_prompt_tokens} tokens). Reduce the diff or add a larger tier."
+            ))
+        if self.verbose:
+            tier = f"tier ≤ {max_prompt_tokens} tokens" if max_prompt_tokens else "sem limite"
+            print(f"🧭 {task}: ~{prompt_tokens} tokens → {model} ({tier})")
+        return model
+
+    def handle_request_error(self, error):
+        if self.raise_errors:
+            raise error
+        print(f"❌ Error with AI API: {error}")
+        exit(1)
+
+    def get_request_options(self, task):
+        if not self.output_limits or task not in MAX_OUTPUT_TOKENS:
+            return {}
+        max_tokens = MAX_OUTPUT_TOKENS[task]
+        if task in ("commit", "branch"):
+            max_tokens *= self.candidate_count
+        options = {"max_tokens": max_tokens}
+        if task in OUTPUT_STOP_SEQUENCES:
+            options["stop"] = list(OUTPUT_STOP_SEQUENCES[task])
+        return options
+
+    def complete(self, prompt, model, temperature, task=None):
+        if self.hedge_connection is not None:
+            with profiler.span("chat.completions", "ai", model=model, prompt_chars=len(prompt), hedged=True):
+                try:
+                    text = "".join(self.hedged_deltas(prompt, model, temperature, task))
+                except Exception as e:
+                    raise AIRequestError(str(e)) from e
+            return text.strip().replace("`", "")
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
         try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-            )
+            with profiler.span("chat.completions", "ai", model=model, prompt_chars=len(prompt)) as span:
+                response = self.connection.create_completion(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                    **self.get_request_options(task),
+                )
+                self.record_usage(span, getattr(response, "usage", None))
             return response.choices[0].message.content.strip().replace("`", "")
         except Exception as e:
-            print(f"❌ Error with AI API: {e}")
-            exit(1)
+            raise AIRequestError(str(e)) from e
+
+    def record_usage(self, span, usage):
+        profiler.count("ai_requests")
+        if usage is None:
+            return
+        for field in ("prompt_tokens", "completion_tokens"):
+            tokens = getattr(usage, field, None) or 0
+            span[field] = tokens
+            profiler.count(field, tokens)
+
+    def request_suggestion(self, prompt, model=None, temperature=DEFAULT_TEMPERATURE, stream=False, cache_key=None, task=None, cancelled=None):
+        if model is None:
+            model = self.select_model(task, prompt)
+        if stream:
+            chunks = self.stream_suggestion(prompt, model, temperature, task, cancelled)
+            return self.cache_stream(chunks, cache_key) if cache_key else chunks
+        try:
+            suggestion = self.complete(prompt, model, temperature, task)
+        except AIRequestError as e:
+            self.handle_request_error(e)
+        if cache_key:
+            self.cache_service.set(cache_key, suggestion)
+        return suggestion
+
+    def cache_stream(self, chunks, cache_key):
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+        finally:
+            chunks.close()
+        self.cache_service.set(cache_key, "".join(parts))
+
+    def stream_suggestion(self, prompt, model, temperature, task=None, cancelled=None):
+        with profiler.span("chat.completions.stream", "ai", model=model, prompt_chars=len(prompt)) as span:
+            yield from self._stream_suggestion(prompt, model, temperature, span, task, cancelled)
+
+    def _stream_suggestion(self, prompt, model, temperature, span, task=None, cancelled=None):
+        request_started = time.perf_counter()
+        if self.hedge_connection is not None:
+            span["hedged"] = True
+            deltas = self.hedged_deltas(prompt, model, temperature, task, cancelled)
+        else:
+            deltas = self.stream_deltas(self.connection, prompt, model, temperature, span, task, cancelled)
+
+        started = False
+        pending_whitespace = ""
+        try:
+            for text in deltas:
+                text = text.replace("`", "")
+                if not started:
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                    started = True
+                    span["ttft_ms"] = round((time.perf_counter() - request_started) * 1000)
+                content = text.rstrip()
+                if content:
+                    yield pending_whitespace + content
+                    pending_whitespace = text[len(content):]
+                else:
+                    pending_whitespace += text
+        except Exception as e:
+            if cancelled is not None and cancelled.is_set():
+                raise AIRequestError("request cancelled") from e
+            if started:
+                print()
+            self.handle_request_error(AIRequestError(str(e)))
+        finally:
+            deltas.close()
+
+    def stream_deltas(self, connection, prompt, model, temperature, span, task=None, cancelled=None):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        if cancelled is not None and cancelled.is_set():
+            raise AIRequestError("request cancelled")
+        request_kwargs = self.get_request_options(task)
+        if profiler.enabled:
+            request_kwargs["stream_options"] = {"include_usage": True}
+        response = connection.create_completion(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            stream=True,
+            **request_kwargs,
+        )
+        abort = partial(abort_stream, response)
+        if cancelled is not None:
+            cancelled.on_set(abort)
+        usage = None
+        try:
+            for chunk in response:
+                usage = getattr(chunk, "usage", None) or usage
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            if cancelled is not None and cancelled.is_set():
+                raise AIRequestError("request cancelled") from e
+            raise
+        finally:
+            if cancelled is not None:
+                cancelled.discard(abort)
+            response.close()
+            self.record_usage(span, usage)
+        if cancelled is not None and cancelled.is_set():
+            raise AIRequestError("request cancelled")
+
+    def endpoint_key(self, base_url, model):
+        return f"{base_url or 'default'}#{model}"
+
+    def get_hedge_delay(self, endpoint):
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        observed = self.latency_stats.percentile(endpoint, HEDGE_PERCENTILE)
+        if observed is None:
+            return DEFAULT_HEDGE_DELAY
+        return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, observed))
+
+    def attempt_deltas(self, connection, prompt, model, temperature, task=None, cancelled=None):
+        with profiler.span("chat.completions.attempt", "ai", model=model) as span:
+            yield from self.stream_deltas(connection, prompt, model, temperature, span, task, cancelled)
+
+    def hedged_deltas(self, prompt, model, temperature, task=None, cancelled=None):
+        hedge_model = self.hedge_model or model
+        attempts = [
+            {
+                "endpoint": self.endpoint_key(self.api_base_url, model),
+                "label": model if hedge_model != model else self.api_base_url or model,
+                "open": partial(self.attempt_deltas, self.connection, prompt, model, temperature, task),
+            },
+            {
+                "endpoint": self.endpoint_key(self.hedge_base_url, hedge_model),
+                "label": hedge_model if hedge_model != model else self.hedge_base_url or hedge_model,
+                "open": partial(self.attempt_deltas, self.hedge_connection, prompt, hedge_model, temperature, task),
+            },
+        ]
+        delay = self.get_hedge_delay(attempts[0]["endpoint"])
+        return HedgedRequest(attempts, delay, self.latency_stats, self.cancel_event, self.verbose).stream(cancelled)
     
-    def generate_commit_message(self, diff, temperature=DEFAULT_TEMPERATURE, history=None):
+    def generate_commit_message(self, diff, temperature=DEFAULT_TEMPERATURE, history=None, stream=False, use_cache=True, cache_scope=None, examples=None, changes=None, cancelled=None):
+        suggestion = self.heuristic_suggestion("commit", changes, diff, history, stream)
+        if suggestion is not None:
+            return suggestion
+        if self.candidate_count > 1:
+            quantity = (
+                f"Gere {self.candidate_count} mensagens de commit alternativas e diferentes entre si, uma por linha, numeradas (1., 2., ...).\n"
+                "Cada mensagem deve ter uma única linha, sem formatação especial.\n"
+            )
+            reminder = f"Responda apenas com a lista numerada de {self.candidate_count} mensagens."
+        else:
+            quantity = "Gere APENAS UMA mensagem de commit, sem quebras de linha ou formatação especial.\n"
+            reminder = "Responda apenas com a mensagem de commit."
         prompt = (
             "Você é um assistente que gera mensagens de commit no formato conventional commits.\n"
             "Com base no diff do git abaixo, identifique a MUDANÇA MAIS SIGNIFICATIVA e gere uma mensagem de commit curta e clara em português sobre ela.\n"
@@ -42,19 +414,35 @@ class AIService:
             "Use prefixos como feat, fix, chore, refactor, test, docs, style, perf, ci, build, revert etc.\n"
             "OBRIGATÓRIO: Sempre use dois pontos após o prefixo (ex: feat:, fix:, chore:).\n"
             "Apenas a mensagem, sem explicações extras ou observações.\n"
-            "Gere APENAS UMA mensagem de commit, sem quebras de linha ou formatação especial.\n"
+            f"{quantity}"
             "TUDO DEVE ESTAR EM MINÚSCULO.\n"
-            "Nada além de uma mensagem de commit."
+            "Nada além de mensagens de commit."
+            f"\n\nDiff:\n{self.diff_compactor.compact(diff)}"
         )
+        if examples:
+            prompt += "\n\nCommits anteriores deste repositório com alterações parecidas (use como referência de escopos e vocabulário):\n- "
+            prompt += "\n- ".join(examples)
+        history_prompt = ""
         if history:
-            history_prompt = "\n\nCrucialmente, forneça uma sugestão diferente e única das que já rejeitei:\n- "
+            history_prompt = "\n\nCrucialmente, forneça sugestões diferentes e únicas das que já rejeitei:\n- "
             history_prompt += "\n- ".join(history)
-            prompt += history_prompt
+        history_prompt += f"\n\n{reminder}"
 
-        prompt += f"\n\nDiff:\n{diff}"
-        return self.get_suggestion(prompt, temperature=temperature)
+        cache_key = self.build_cache_key("commit", diff, temperature, history, cache_scope, use_cache)
+        return self.get_candidates(
+            "commit", prompt, history_prompt, temperature, history, stream, cache_key, self.suggestion_validator.repair_commit, cancelled
+        )
     
-    def generate_branch_name(self, diff, temperature=DEFAULT_BRANCH_TEMPERATURE, history=None):
+    def generate_branch_name(self, diff, temperature=DEFAULT_BRANCH_TEMPERATURE, history=None, stream=False, use_cache=True, cache_scope=None, examples=None, changes=None, git_service=None, cancelled=None):
+        suggestion = self.heuristic_suggestion("branch", changes, diff, history, stream, git_service)
+        if suggestion is not None:
+            return suggestion
+        if self.candidate_count > 1:
+            quantity = f"Generate {self.candidate_count} different alternative branch names, one per line, numbered (1., 2., ...).\n"
+            reminder = f"Reply only with the numbered list of {self.candidate_count} branch names."
+        else:
+            quantity = "Generate ONLY the branch name.\n"
+            reminder = "Reply only with the branch name."
         prompt = (
             "You are an assistant that generates Git branch names.\n"
             "Based on the git diff below, identify the MOST SIGNIFICANT change and generate a short, descriptive branch name in English for it, "
@@ -62,51 +450,161 @@ class AIService:
             "The name should reflect the main purpose of the changes.\n"
             "Use prefixes like feat/, fix/, chore/, refactor/, test/, docs/, style/, perf/, ci/, build/, revert/.\n"
             "Examples: feat/add-user-login, fix/resolve-payment-bug, chore/update-dependencies.\n"
-            "Generate ONLY the branch name, with no extra explanations or remarks."
+            f"{quantity}"
+            "No extra explanations or remarks."
+            f"\n\nDiff:\n{self.diff_compactor.compact(diff)}"
         )
+        if examples:
+            prompt += "\n\nPrevious commits in this repository with similar changes (use them as a reference for scopes and vocabulary):\n- "
+            prompt += "\n- ".join(examples)
+        history_prompt = ""
         if history:
-            history_prompt = "\n\nCrucially, provide a different and unique suggestion from the ones I have already rejected:\n- "
+            history_prompt = "\n\nCrucially, provide different and unique suggestions from the ones I have already rejected:\n- "
             history_prompt += "\n- ".join(history)
-            prompt += history_prompt
+        history_prompt += f"\n\n{reminder}"
 
-        prompt += f"\n\nDiff:\n{diff}"
-        return self.get_suggestion(prompt, temperature=temperature)
+        cache_key = self.build_cache_key("branch", diff, temperature, history, cache_scope, use_cache)
+        repair = partial(self.suggestion_validator.repair_branch, git_service=git_service)
+        return self.get_candidates("branch", prompt, history_prompt, temperature, history, stream, cache_key, repair, cancelled)
     
-    def generate_pr_description(self, diff):
+    def get_candidates(self, task, prompt, history_prompt, temperature, history, stream, cache_key, repair=None, cancelled=None):
+        pool_key = hashlib.sha256(f"{task}\n{prompt}".encode("utf-8")).hexdigest()
+        if history:
+            candidate = self.candidate_pool.next(pool_key, history, self.connection.timeout)
+            if candidate is not None:
+                profiler.count("pooled_candidates")
+                if self.verbose:
+                    print(f"♻️ {task}: sugestão alternativa da mesma requisição, sem nova chamada à IA")
+                return iter([candidate]) if stream else candidate
+
+        entry = self.candidate_pool.begin(pool_key, repair, history)
+        suggestion = self.get_suggestion(
+            prompt + history_prompt, temperature=temperature, stream=stream, cache_key=cache_key, task=task, cancelled=cancelled
+        )
+        request_again = partial(self.repair_request, task, prompt + history_prompt, temperature, stream, cache_key, cancelled)
+        if stream:
+            return self.candidate_pool.stream_first(entry, suggestion, request_again if repair else None)
+        candidates = self.candidate_pool.fill(entry, suggestion)
+        for _ in range(MAX_REPAIR_REQUESTS if repair else 0):
+            if candidates:
+                break
+            suggestion = request_again()
+            candidates = self.candidate_pool.fill(entry, suggestion)
+        return candidates[0] if candidates else self.candidate_pool.first_line(suggestion)
+
+    def repair_request(self, task, prompt, temperature, stream, cache_key, cancelled=None):
+        profiler.count("repair_requests")
+        if self.verbose:
+            print(f"🔁 {task}: resposta fora do formato e sem correção possível, nova requisição à IA")
+        return self.request_suggestion(
+            prompt, temperature=temperature, stream=stream, cache_key=cache_key, task=task, cancelled=cancelled
+        )
+    
+    def generate_pr_description(self, diff, stream=False, use_cache=True, cache_scope=None, commits=None, load_commit_diff=None):
         print("🤖 Gerando descrição do PR...")
-        
-        prompt = f"""
-Analise as alterações de código a seguir e gere um relatório detalhado seguindo EXATAMENTE este formato:
+        cache_key = self.build_cache_key("pr", diff, DEFAULT_TEMPERATURE, cache_scope=cache_scope, use_cache=use_cache)
+        cached = self.get_cached_suggestion(cache_key, stream)
+        if cached is not None:
+            return cached
 
-**Feature:** [Título resumido da funcionalidade ou alteração principal]
+        oversized = self.token_utils.estimate(diff) > self.diff_compactor.token_budget
+        can_use_commits = bool(commits and load_commit_diff)
+        if self.pr_mode == "commits" and can_use_commits or self.pr_mode == "auto" and oversized and can_use_commits:
+            summaries = self.summarize_commits(commits, load_commit_diff, use_cache)
+            changes = f"Resumos dos commits da branch, em ordem cronológica:\n{summaries}"
+        elif self.pr_mode in ("auto", "commits", "files") and oversized:
+            summaries = self.summarize_diff_chunks(diff, use_cache)
+            changes = f"Resumos das alterações, agrupados por arquivos:\n{summaries}"
+        else:
+            changes = f"Alterações de código:\n{self.diff_compactor.compact(diff)}"
 
-**Descrição:**
-[Breve explicação do que foi implementado ou alterado]
+        prompt = PR_DESCRIPTION_PROMPT.format(changes=changes)
+        return self.request_suggestion(prompt, temperature=DEFAULT_TEMPERATURE, stream=stream, cache_key=cache_key, task="pr")
 
-**Resumo:**
-[Resumo técnico das principais mudanças implementadas]
+    def split_diff_chunks(self, diff):
+        chunk_compactor = DiffCompactor(self.pr_chunk_tokens)
+        chunks = []
+        current_chunk = []
+        current_tokens = 0
+        for diff_file in self.diff_compactor.parse(diff):
+            file_text = chunk_compactor.compact(diff_file.text())
+            file_tokens = self.token_utils.estimate(file_text)
+            if current_chunk and current_tokens + file_tokens > self.pr_chunk_tokens:
+                chunks.append("\n".join(current_chunk))
+                current_chunk = []
+                current_tokens = 0
+            current_chunk.append(file_text)
+            current_tokens += file_tokens
+        if current_chunk:
+            chunks.append("\n".join(current_chunk))
+        return chunks
 
-**Descrição do problema:**
-[Contextualize o problema ou necessidade antes da alteração]
+    def summarize_diff_chunks(self, diff, use_cache=True):
+        chunks = self.split_diff_chunks(diff)
+        total = len(chunks)
+        print(f"🧩 Diff grande: resumindo {total} partes com até {self.pr_max_workers} requisições simultâneas...")
 
-**Solução implementada:**
-[Liste as principais mudanças técnicas:]
-- ➕ [Para adições/criações]
-- 🔧 [Para lógica de negócio/funções]
-- 📦 [Para componentes/módulos]
-- 🧪 [Para testes]
-- 🛣️ [Para rotas/APIs]
-- 📝 [Para configurações/documentação]
-- 🎨 [Para melhorias de UI/UX]
-- 🚀 [Para otimizações]
+        def summarize(index):
+            chunk = chunks[index]
+            cache_key = self.build_cache_key("pr-chunk", chunk, DEFAULT_TEMPERATURE, use_cache=use_cache)
+            cached = self.get_cached_suggestion(cache_key)
+            if cached is not None:
+                return cached
+            prompt = PR_CHUNK_SUMMARY_PROMPT.format(part=index + 1, total=total, diff=chunk)
+            return self.summarize(prompt, cache_key)
 
-**Impacto Esperado:**
-[Explique os benefícios, melhorias ou resultados esperados após a implementação]
+        summaries = self.run_summaries(
+            [(f"Parte {index + 1}", partial(summarize, index)) for index in range(total)]
+        )
+        return "\n\n".join(f"Parte {index}:\n{summary}" for index, summary in enumerate(summaries, 1))
 
-Seja técnico, detalhado e mantenha EXATAMENTE esta estrutura em formato markdown.
+    def summarize_commits(self, commits, load_commit_diff, use_cache=True):
+        commit_compactor = DiffCompactor(self.pr_chunk_tokens)
+        summaries = [None] * len(commits)
+        jobs = []
 
-Alterações de código:
-{diff}
-"""
-        
-        return self.get_suggestion(prompt, temperature=0.3) 
\ No newline at end of file
+        def summarize(sha, subject, cache_key):
+            commit_diff = commit_compactor.compact(load_commit_diff(sha))
+            prompt = PR_COMMIT_SUMMARY_PROMPT.format(sha=sha[:8], subject=subject, diff=commit_diff)
+            return self.summarize(prompt, cache_key)
+
+        for index, (sha, subject) in enumerate(commits):
+            cache_key = self.build_cache_key("commit-summary", "", DEFAULT_TEMPERATURE, cache_scope=sha, use_cache=use_cache)
+            summaries[index] = self.get_cached_suggestion(cache_key)
+            if summaries[index] is None:
+                jobs.append((index, f"Commit {sha[:8]}", partial(summarize, sha, subject, cache_key)))
+
+        reused = len(commits) - len(jobs)
+        print(f"🧩 Resumindo {len(jobs)} de {len(commits)} commits ({reused} reaproveitados do cache)...")
+        for index, summary in zip([job[0] for job in jobs], self.run_summaries([job[1:] for job in jobs])):
+            summaries[index] = summary
+
+        return "\n\n".join(
+            f"Commit {sha[:8]} ({subject}):\n{summary}"
+            for (sha, subject), summary in zip(commits, summaries)
+        )
+
+    def summarize(self, prompt, cache_key=None):
+        summary = self.complete(prompt, self.select_model("pr-summary", prompt), DEFAULT_TEMPERATURE, "pr-summary")
+        if cache_key:
+            self.cache_service.set(cache_key, summary)
+        return summary
+
+    def run_summaries(self, jobs):
+        results = [None] * len(jobs)
+        if not jobs:
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.pr_max_workers) as executor:
+            futures = {executor.submit(job): index for index, (_, job) in enumerate(jobs)}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    index = futures[future]
+                    results[index] = future.result()
+                    print(f"   ✅ {jobs[index][0]} resumido ({done}/{len(jobs)})")
+            except AIRequestError as e:
+                for pending in futures:
+                    pending.cancel()
+                self.handle_request_error(e)
+
+        return results
@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import threading
+import time
+from utils.constants import *
+from utils.system_utils import SystemUtils
+
+class CacheService:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_MAX_BYTES, max_age_days=DEFAULT_CACHE_MAX_AGE_DAYS):
+        self.cache_dir = cache_dir or SystemUtils().get_cache_dir()
+        self.path = os.path.join(self.cache_dir, CACHE_FILE_NAME)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        self.lock = threading.Lock()
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS suggestions (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS suggestions_accessed ON suggestions (accessed);
+                CREATE TABLE IF NOT EXISTS stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+            """)
+        return self._connection
+
+    def get(self, key):
+        try:
+            with self.lock, self.connection as connection:
+                row = connection.execute(
+                    "SELECT value, created FROM suggestions WHERE key = ?", (key,)
+                ).fetchone()
+                now = time.time()
+                if row and now - row[1] <= self.max_age_seconds:
+                    connection.execute("UPDATE suggestions SET accessed = ? WHERE key = ?", (now, key))
+                    self._increment(connection, "hits")
+                    return row[0]
+                self._increment(connection, "misses")
+                return None
+        except sqlite3.Error:
+            return None
+
+    def set(self, key, value):
+        if not value:
+            return
+        try:
+            with self.lock, self.connection as connection:
+                now = time.time()
+                connection.execute(
+                    "INSERT OR REPLACE INTO suggestions (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value.encode("utf-8")), now, now)
+                )
+                self._evict(connection, now)
+        except sqlite3.Error:
+            pass
+
+    def increment(self, name, amount=1):
+        try:
+            with self.lock, self.connection as connection:
+                self._increment(connection, name, amount)
+        except sqlite3.Error:
+            pass
+
+    def get_stats(self):
+        try:
+            with self.lock, self.connection as connection:
+                entries, size = connection.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM suggestions"
+                ).fetchone()
+                counters = dict(connection.execute("SELECT name, value FROM stats").fetchall())
+        except sqlite3.Error:
+            return None
+        counters.update({"entries": entries, "size": size, "path": self.path})
+        return counters
+
+    def _increment(self, connection, name, amount=1):
+        connection.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def _evict(self, connection, now):
+        connection.execute("DELETE FROM suggestions WHERE created < ?", (now - self.max_age_seconds,))
+        total_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM suggestions").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        for key, size in connection.execute("SELECT key, size FROM suggestions ORDER BY accessed").fetchall():
+            connection.execute("DELETE FROM suggestions WHERE key = ?", (key,))
+            total_size -= size
+            if total_size <= self.max_bytes:
+                break
@@ -0,0 +1,155 @@
+import re
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from utils.constants import MAX_CANDIDATE_POOL_ENTRIES
+from utils.profiler import profiler
+
+NUMBERING_PATTERN = re.compile(r"^\s*(?:\d{1,2}[.)]\s*|\d{1,2}\s+-\s+|[-*•]\s+)")
+PENDING_NUMBERING_PATTERN = re.compile(r"^\s*(?:\d{1,2}[.)]?|\d{1,2}\s+-?|[-*•])?\s*$")
+SIMILARITY_THRESHOLD = 0.9
+
+
+def normalize(text):
+    return re.sub(r"[\W_]+", " ", text.lower()).strip()
+
+
+def is_similar(first, second):
+    first, second = normalize(first), normalize(second)
+    return first == second or SequenceMatcher(None, first, second).ratio() >= SIMILARITY_THRESHOLD
+
+
+def is_rejected(candidate, history):
+    return any(is_similar(candidate, previous) for previous in history)
+
+
+def strip_numbering(line):
+    return NUMBERING_PATTERN.sub("", line, count=1).strip()
+
+
+def keep(candidate, partial=False):
+    return candidate
+
+
+class CandidatePool:
+    def __init__(self, limit, max_entries=MAX_CANDIDATE_POOL_ENTRIES):
+        self.limit = limit
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def parse(self, text, repair=keep):
+        candidates = []
+        for line in text.split("\n"):
+            raw = strip_numbering(line)
+            candidate = repair(raw) if raw else None
+            if candidate and candidate != raw:
+                profiler.count("repaired_suggestions")
+            if candidate and not any(is_similar(candidate, existing) for existing in candidates):
+                candidates.append(candidate)
+            if len(candidates) >= self.limit:
+                break
+        return candidates
+
+    def first_line(self, text):
+        return next((strip_numbering(line) for line in text.split("\n") if strip_numbering(line)), text.strip())
+
+    def begin(self, key, repair=None, history=None):
+        entry = {"ready": threading.Event(), "candidates": [], "repair": repair or keep, "history": list(history or [])}
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+    def fill(self, entry, text):
+        candidates = self.parse(text, entry["repair"])
+        fresh = [candidate for candidate in candidates if not is_rejected(candidate, entry["history"])]
+        with self.lock:
+            entry["candidates"] = fresh
+        entry["ready"].set()
+        return fresh or candidates
+
+    def next(self, key, history, timeout=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is None or not entry["ready"].wait(timeout):
+            return None
+        with self.lock:
+            while entry["candidates"]:
+                candidate = entry["candidates"].pop(0)
+                if not is_rejected(candidate, history):
+                    return candidate
+            if self.entries.get(key) is entry:
+                del self.entries[key]
+        return None
+
+    def stream_first(self, entry, chunks, retry=None):
+        repair = entry["repair"]
+        history = entry["history"]
+        text = ""
+        emitted = ""
+        rejected = None
+        handed_off = False
+        try:
+            while True:
+                start = 0
+                for chunk in chunks:
+                    text += chunk
+                    while True:
+                        line, newline, _ = text[start:].partition("\n")
+                        # Ao regenerar, cada linha só aparece completa, para que uma sugestão já rejeitada seja pulada
+                        if not newline and (history or PENDING_NUMBERING_PATTERN.match(line)):
+                            break
+                        raw = strip_numbering(line)
+                        candidate = repair(raw, partial=not newline) if raw else ""
+                        if newline and candidate and not emitted and is_rejected(candidate, history):
+                            rejected, candidate = rejected or candidate, ""
+                        if newline and not candidate and not emitted:
+                            start += len(line) + 1
+                            continue
+                        if len(candidate) > len(emitted) and candidate.startswith(emitted):
+                            yield candidate[len(emitted):]
+                            emitted = candidate
+                        if newline:
+                            handed_off = True
+                            threading.Thread(target=self.drain, args=(entry, chunks, text), daemon=True).start()
+                            return
+                        break
+
+                raw = strip_numbering(text[start:])
+                candidate = repair(raw) if raw else None
+                if candidate and not emitted and is_rejected(candidate, history):
+                    rejected, candidate = rejected or candidate, None
+                if candidate or emitted or rejected or retry is None:
+                    candidate = candidate or emitted or rejected or self.first_line(text)
+                    if len(candidate) > len(emitted) and candidate.startswith(emitted):
+                        yield candidate[len(emitted):]
+                    return
+                self.close(chunks)
+                chunks, retry, text = retry(), None, ""
+        finally:
+            if not handed_off:
+                self.close(chunks)
+                self.fill(entry, text)
+
+    def drain(self, entry, chunks, text):
+        complete = False
+        try:
+            for chunk in chunks:
+                text += chunk
+            complete = True
+        except BaseException:
+            pass
+        finally:
+            self.close(chunks)
+            # Resposta interrompida (erro ou cancelamento): a última linha pode estar cortada
+            self.fill(entry, text if complete else text.rpartition("\n")[0])
+
+    def close(self, chunks):
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
@@ -0,0 +1,212 @@
+import re
+from core.diff_reader import DIFF_OMITTED_MARKER
+from utils.constants import *
+from utils.token_utils import TokenUtils
+
+DIFF_HEADER_PATTERN = re.compile(r'^diff --git "?a/(.+?)"? "?b/(.+?)"?$')
+HUNK_CONTEXT_PATTERN = re.compile(r"\b(def|class|function|func|fn|interface|struct|impl|export)\b")
+OMITTED_NOTE_TOKENS = 12
+
+
+class DiffHunk:
+    def __init__(self, file_index, order, lines):
+        self.file_index = file_index
+        self.order = order
+        self.lines = lines
+        self.text = "\n".join(lines)
+        self.added = sum(1 for line in lines[1:] if line.startswith("+"))
+        self.removed = sum(1 for line in lines[1:] if line.startswith("-"))
+
+    def score(self):
+        changed = [line[1:].strip() for line in self.lines[1:] if line[:1] in ("+", "-")]
+        score = sum(1 for line in changed if line)
+        if HUNK_CONTEXT_PATTERN.search(self.lines[0]):
+            score += 5
+        return score
+
+
+class DiffFile:
+    def __init__(self, index, header_lines):
+        self.index = index
+        self.header_lines = header_lines
+        self.hunks = []
+        self.old_path = None
+        self.path = None
+        self.status = "modified"
+        self.similarity = None
+        self.binary = False
+        self.mode_change = False
+        self.content_omitted = False
+
+        match = DIFF_HEADER_PATTERN.match(header_lines[0])
+        if match:
+            self.old_path, self.path = match.group(1), match.group(2)
+
+        for line in header_lines[1:]:
+            if line.startswith("new file mode"):
+                self.status = "added"
+            elif line.startswith("deleted file mode"):
+                self.status = "deleted"
+            elif line.startswith("rename from "):
+                self.status = "renamed"
+                self.old_path = line[len("rename from "):]
+            elif line.startswith("rename to "):
+                self.path = line[len("rename to "):]
+            elif line.startswith("similarity index "):
+                self.similarity = line[len("similarity index "):]
+            elif line.startswith("old mode ") or line.startswith("new mode "):
+                self.mode_change = True
+            elif line.startswith("Binary files ") or line.startswith("GIT binary patch"):
+                self.binary = True
+            elif line == DIFF_OMITTED_MARKER:
+                self.content_omitted = True
+
+    @property
+    def added(self):
+        return sum(hunk.added for hunk in self.hunks)
+
+    @property
+    def removed(self):
+        return sum(hunk.removed for hunk in self.hunks)
+
+    def text(self):
+        return "\n".join(self.header_lines + [hunk.text for hunk in self.hunks])
+
+    def display_path(self):
+        if self.status == "renamed" and self.old_path != self.path:
+            return f"{self.old_path} => {self.path}"
+        return self.path or self.header_lines[0]
+
+    def stat_line(self):
+        if self.binary:
+            return f" {self.display_path()} | Bin"
+        return f" {self.display_path()} | +{self.added} -{self.removed}"
+
+    def is_generated(self):
+        path = self.path or ""
+        name = path.rsplit("/", 1)[-1]
+        if name in GENERATED_FILE_NAMES or path.endswith(GENERATED_FILE_SUFFIXES):
+            return True
+        if any(path.startswith(part) or f"/{part}" in path for part in GENERATED_PATH_PARTS):
+            return True
+        return any(len(line) > MINIFIED_LINE_LENGTH for hunk in self.hunks for line in hunk.lines)
+
+    def is_whitespace_only(self):
+        if not self.hunks:
+            return False
+        removed = "".join("".join(line[1:].split()) for hunk in self.hunks for line in hunk.lines[1:] if line.startswith("-"))
+        added = "".join("".join(line[1:].split()) for hunk in self.hunks for line in hunk.lines[1:] if line.startswith("+"))
+        return removed == added
+
+    def stub(self):
+        if self.binary:
+            return f"binary file changed: {self.display_path()}"
+        if self.status == "deleted":
+            return f"deleted file: {self.path} (-{self.removed} lines)"
+        if self.status == "renamed" and not self.hunks:
+            return f"renamed: {self.old_path} -> {self.path} ({self.similarity or '100%'} similar)"
+        if self.mode_change and not self.hunks:
+            return f"file mode changed: {self.path}"
+        if self.content_omitted and not self.hunks:
+            return f"changed, content not read (diff size limit): {self.path}"
+        if self.is_generated():
+            return f"generated file changed: {self.path} (+{self.added} -{self.removed})"
+        if self.is_whitespace_only():
+            return f"whitespace-only changes: {self.path}"
+        return None
+
+
+class DiffCompactor:
+    def __init__(self, token_budget=DEFAULT_DIFF_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self.token_utils = TokenUtils()
+        self._last = (None, None)
+
+    def parse(self, diff):
+        blocks = []
+        for line in diff.split("\n"):
+            if line.startswith("diff --git "):
+                blocks.append([line])
+            elif blocks:
+                blocks[-1].append(line)
+        return [self._parse_block(index, block) for index, block in enumerate(blocks)]
+
+    def _parse_block(self, index, block):
+        hunk_starts = [i for i, line in enumerate(block) if line.startswith("@@")]
+        header_end = hunk_starts[0] if hunk_starts else len(block)
+        diff_file = DiffFile(index, block[:header_end])
+        bounds = hunk_starts + [len(block)]
+        for order, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            diff_file.hunks.append(DiffHunk(index, order, block[start:end]))
+        return diff_file
+
+    def compact(self, diff):
+        if not diff:
+            return diff
+        last_input, last_output = self._last
+        if diff == last_input:
+            return last_output
+
+        if self.token_utils.estimate(diff) <= self.token_budget:
+            compacted = diff
+        else:
+            compacted = self._compact_files(self.parse(diff)) or diff
+
+        self._last = (diff, compacted)
+        return compacted
+
+    def _compact_files(self, files):
+        if not files:
+            return None
+
+        stat_lines = [diff_file.stat_line() for diff_file in files]
+        stubs = []
+        candidates = []
+        for diff_file in files:
+            stub = diff_file.stub()
+            if stub:
+                stubs.append(stub)
+            else:
+                candidates.extend(diff_file.hunks)
+
+        sections = ["Changed files:", *stat_lines]
+        if stubs:
+            sections += ["", "Summarized changes:", *stubs]
+        summary = "\n".join(sections)
+
+        remaining = self.token_budget - self.token_utils.estimate(summary) - len(files) * OMITTED_NOTE_TOKENS
+        if remaining <= 0:
+            return self._truncate(summary)
+
+        selected = set()
+        included_files = set()
+        for hunk in sorted(candidates, key=lambda h: (-h.score(), h.file_index, h.order)):
+            cost = self.token_utils.estimate(hunk.text) + 1
+            if hunk.file_index not in included_files:
+                cost += self.token_utils.estimate("\n".join(files[hunk.file_index].header_lines)) + 1
+            if cost > remaining:
+                continue
+            selected.add((hunk.file_index, hunk.order))
+            included_files.add(hunk.file_index)
+            remaining -= cost
+
+        body = []
+        for diff_file in files:
+            kept = [hunk for hunk in diff_file.hunks if (diff_file.index, hunk.order) in selected]
+            if not kept:
+                continue
+            body.extend(diff_file.header_lines)
+            body.extend(hunk.text for hunk in kept)
+            omitted = len(diff_file.hunks) - len(kept)
+            if omitted:
+                body.append(f"... {omitted} less significant hunk(s) omitted in {diff_file.path}")
+
+        if body:
+            summary += "\n\nMost significant hunks:\n" + "\n".join(body)
+        return self._truncate(summary)
+
+    def _truncate(self, text):
+        max_chars = self.token_budget * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        return text[:max_chars].rsplit("\n", 1)[0] + "\n... (truncated to fit the token budget)"
@@ -0,0 +1,52 @@
+from utils.constants import *
+
+DIFF_OMITTED_MARKER = "... diff content omitted: read limit reached"
+
+
+class DiffReader:
+    def __init__(self, max_bytes=DEFAULT_DIFF_MAX_BYTES, max_file_bytes=DEFAULT_DIFF_MAX_FILE_BYTES):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.bytes_read = 0
+        self.bytes_kept = 0
+        self.stopped_early = False
+
+    def read(self, stream):
+        lines = []
+        file_bytes = 0
+        in_hunks = False
+        omitted = False
+
+        for raw_line in stream:
+            if raw_line.startswith(b"diff --git "):
+                if self.max_bytes and self.bytes_read >= self.max_bytes * DIFF_SCAN_FACTOR:
+                    self.stopped_early = True
+                    break
+                if omitted:
+                    lines.append(DIFF_OMITTED_MARKER)
+                file_bytes = 0
+                in_hunks = False
+                omitted = False
+            elif raw_line.startswith(b"@@"):
+                in_hunks = True
+
+            self.bytes_read += len(raw_line)
+            if in_hunks and self.over_budget(file_bytes):
+                omitted = True
+                continue
+
+            line = raw_line.decode("utf-8", errors="replace")
+            lines.append(line[:-1] if line.endswith("\n") else line)
+            file_bytes += len(raw_line)
+            self.bytes_kept += len(raw_line)
+
+        if omitted:
+            lines.append(DIFF_OMITTED_MARKER)
+        if self.stopped_early:
+            lines.append(f"... diff truncated after {self.bytes_read // 1024} KiB; remaining files were not read")
+        return "\n".join(lines).strip()
+
+    def over_budget(self, file_bytes):
+        if self.max_bytes and self.bytes_kept >= self.max_bytes:
+            return True
+        return bool(self.max_file_bytes) and file_bytes >= self.max_file_bytes
@@ -0,0 +1,171 @@
+import atexit
+import os
+import subprocess
+import threading
+from utils.profiler import profiler
+
+
+class GitBackend:
+    def __init__(self, git_service):
+        self.git_service = git_service
+        self._git_dirs = None
+        self._work_tree = None
+        self._config = None
+        self._batch_process = None
+        self._batch_lock = threading.Lock()
+
+    @property
+    def work_dir(self):
+        return os.path.abspath(self.git_service.repo_path or os.getcwd())
+
+    def git_dirs(self):
+        if self._git_dirs is None:
+            self._git_dirs = self._find_git_dirs() or (None, None)
+        return self._git_dirs
+
+    def _find_git_dirs(self):
+        if os.getenv("GIT_DIR") or os.getenv("GIT_COMMON_DIR"):
+            return None
+
+        directory = self.work_dir
+        while True:
+            dot_git = os.path.join(directory, ".git")
+            if os.path.isdir(dot_git):
+                git_dir = dot_git
+                self._work_tree = directory
+                break
+            if os.path.isfile(dot_git):
+                content = self._read_file(dot_git) or ""
+                if not content.startswith("gitdir:"):
+                    return None
+                git_dir = os.path.normpath(os.path.join(directory, content[len("gitdir:"):].strip()))
+                self._work_tree = directory
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+
+        common_dir = git_dir
+        commondir = self._read_file(os.path.join(git_dir, "commondir"))
+        if commondir:
+            common_dir = os.path.normpath(os.path.join(git_dir, commondir.strip()))
+
+        if os.path.exists(os.path.join(common_dir, "reftable")):
+            return None
+        return git_dir, common_dir
+
+    def work_tree(self):
+        if self.git_dirs()[0] is None:
+            return None
+        return self._work_tree
+
+    def _read_file(self, path):
+        try:
+            with open(path, encoding="utf-8") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def read_head(self):
+        git_dir, _ = self.git_dirs()
+        if not git_dir:
+            return None
+        head = (self._read_file(os.path.join(git_dir, "HEAD")) or "").strip()
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+        if head:
+            return "HEAD"
+        return None
+
+    def list_refs(self, prefix):
+        git_dir, common_dir = self.git_dirs()
+        if not common_dir:
+            return None
+
+        refs = {}
+        packed_refs = self._read_file(os.path.join(common_dir, "packed-refs")) or ""
+        for line in packed_refs.splitlines():
+            if not line or line[0] in "#^":
+                continue
+            sha, _, name = line.partition(" ")
+            if name.startswith(prefix):
+                refs[name] = sha
+
+        refs_dir = os.path.join(common_dir, *prefix.rstrip("/").split("/"))
+        for root, _, files in os.walk(refs_dir):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                name = os.path.relpath(path, common_dir).replace(os.sep, "/")
+                sha = (self._read_file(path) or "").strip()
+                if sha and not sha.startswith("ref:"):
+                    refs[name] = sha
+
+        return {name[len(prefix):]: sha for name, sha in refs.items()}
+
+    def refresh(self):
+        self._config = None
+
+    def get_config(self, key):
+        if self._config is None:
+            output = self.git_service.run_command(["git", "config", "--list", "-z"], check=False)
+            self._config = {}
+            for entry in output.split("\0"):
+                name, _, value = entry.partition("\n")
+                if name:
+                    self._config[name.lower()] = value
+        return self._config.get(key.lower())
+
+    def read_object(self, rev):
+        with self._batch_lock:
+            process = self._get_batch_process()
+            if process is None:
+                return None
+            try:
+                process.stdin.write(rev.encode("utf-8") + b"\n")
+                process.stdin.flush()
+                header = process.stdout.readline().decode("utf-8").split()
+                if len(header) != 3:
+                    return None
+                sha, object_type, size = header
+                data = process.stdout.read(int(size))
+                process.stdout.read(1)
+                return sha, object_type, data
+            except (OSError, ValueError):
+                self._close_batch_process()
+                return None
+
+    def resolve(self, rev):
+        result = self.read_object(rev)
+        return result[0] if result else None
+
+    def _get_batch_process(self):
+        if self._batch_process is None:
+            try:
+                self._batch_process = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    cwd=self.git_service.repo_path,
+                )
+            except OSError:
+                return None
+            self.git_service.spawn_count += 1
+            profiler.count("subprocesses")
+            atexit.register(self._close_batch_process)
+        return self._batch_process
+
+    def _close_batch_process(self):
+        process, self._batch_process = self._batch_process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+    def close(self):
+        with self._batch_lock:
+            self._close_batch_process()
@@ -1,68 +1,483 @@
+import os
+import re
 import subprocess
+import sys
+from core.diff_reader import DiffReader
+from core.git_backend import GitBackend
+from utils.constants import *
+from utils.profiler import profiler
+
+REMOTE_URL_PATTERN = re.compile(
+    r"^(?:(?:https?|ssh|git)://(?:[^@/]+@)?(?P<host>[^/:]+)(?::\d+)?/"
+    r"|(?:[^@/]+@)?(?P<scp_host>[^/:]+):)"
+    r"(?P<owner>[^/]+)/(?P<repo>[^/]+?)/?$"
+)
+
+
+class GitCommandError(Exception):
+    pass
 
 
 class GitService:
-    def __init__(self):
-        pass
+    def __init__(self, repo_path=None, persistent=True, raise_errors=False):
+        self.repo_path = repo_path
+        self.persistent = persistent
+        self.raise_errors = raise_errors
+        self.spawn_count = 0
+        self.backend = GitBackend(self)
+        self._current_branch = None
+        self._diff_excludes = None
 
-    def run_command(self, command, check=True):
+    def run_command(self, command, check=True, env=None):
+        self.spawn_count += 1
+        profiler.count("subprocesses")
         try:
-            result = subprocess.run(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=check,
-                encoding="utf-8",
-            )
+            with profiler.span(" ".join(command[:2]), command[0], argv=command[:4]) as span:
+                result = subprocess.run(
+                    command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    check=check,
+                    encoding="utf-8",
+                    cwd=self.repo_path,
+                    env={**os.environ, **env} if env else None,
+                )
+                span["stdout_bytes"] = len(result.stdout)
             return result.stdout.strip()
         except subprocess.CalledProcessError as e:
-            print(f"❌ Error executing: {' '.join(command)}")
-            print(f"  {e.stderr.strip()}")
-            exit(1)
-        except FileNotFoundError:
-            print(
-                f"❌ git command not found. Please ensure Git is installed and in your PATH."
-            )
-            exit(1)
+            self.handle_command_error(command, e.stderr, e)
+        except FileNotFoundError as e:
+            self.handle_missing_command(command, e)
+
+    def stream_command(self, command, reader):
+        self.spawn_count += 1
+        profiler.count("subprocesses")
+        with profiler.span(" ".join(command[:2]), command[0], argv=command[:4]) as span:
+            try:
+                process = subprocess.Popen(
+                    command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    cwd=self.repo_path,
+                )
+            except FileNotFoundError as e:
+                self.handle_missing_command(command, e)
+            try:
+                output = reader.read(process.stdout)
+            finally:
+                if reader.stopped_early:
+                    process.kill()
+                process.stdout.close()
+                stderr = process.stderr.read().decode("utf-8", errors="replace")
+                process.stderr.close()
+                returncode = process.wait()
+            span["stdout_bytes"] = reader.bytes_read
+            span["kept_bytes"] = reader.bytes_kept
+
+        if returncode and not reader.stopped_early:
+            self.handle_command_error(command, stderr, subprocess.CalledProcessError(returncode, command, stderr=stderr))
+        return output
+
+    def handle_command_error(self, command, stderr, error):
+        if self.raise_errors:
+            raise GitCommandError(f"{' '.join(command)}: {stderr.strip()}") from error
+        print(f"❌ Error executing: {' '.join(command)}")
+        print(f"  {stderr.strip()}")
+        exit(1)
 
-    def get_diff(self):
-        self.run_command(["git", "add", "."])
-        diff = self.run_command(["git", "diff", "--cached"])
+    def handle_missing_command(self, command, error):
+        if self.raise_errors:
+            raise GitCommandError(f"{command[0]} command not found") from error
+        print(
+            f"❌ git command not found. Please ensure Git is installed and in your PATH."
+        )
+        exit(1)
+
+    def refresh(self):
+        self._current_branch = None
+        self._diff_excludes = None
+        self.backend.refresh()
+
+    def get_work_tree(self):
+        if self.persistent:
+            work_tree = self.backend.work_tree()
+            if work_tree:
+                return work_tree
+        try:
+            return self.run_command(["git", "rev-parse", "--show-toplevel"], check=False) or None
+        except:
+            return None
+
+    def get_git_dir(self):
+        if self.persistent:
+            git_dir = self.backend.git_dirs()[0]
+            if git_dir:
+                return git_dir
+        try:
+            return self.run_command(["git", "rev-parse", "--absolute-git-dir"], check=False) or None
+        except:
+            return None
+
+    def get_hooks_dir(self):
+        try:
+            hooks_dir = self.run_command(["git", "rev-parse", "--git-path", "hooks"], check=False)
+        except:
+            return None
+        if not hooks_dir:
+            return None
+        return os.path.join(os.path.abspath(self.repo_path or os.getcwd()), hooks_dir)
+
+    def get_diff_excludes(self):
+        if self._diff_excludes is None:
+            patterns = list(DEFAULT_IGNORE_PATTERNS)
+            work_tree = self.get_work_tree()
+            ignore_path = os.path.join(work_tree, CORAIGNORE_FILE_NAME) if work_tree else None
+            if ignore_path and os.path.isfile(ignore_path):
+                with open(ignore_path, encoding="utf-8") as ignore_file:
+                    for line in ignore_file:
+                        pattern = line.strip()
+                        if not pattern or pattern.startswith("#"):
+                            continue
+                        if pattern.startswith("!"):
+                            patterns = [p for p in patterns if p != pattern[1:]]
+                        elif pattern not in patterns:
+                            patterns.append(pattern)
+            self._diff_excludes = [self.to_exclude_pathspec(pattern) for pattern in patterns]
+        return self._diff_excludes
+
+    def to_exclude_pathspec(self, pattern):
+        if pattern.endswith("/"):
+            pattern += "**"
+        if pattern.startswith("/"):
+            pattern = pattern[1:]
+        elif "/" not in pattern.rstrip("*").rstrip("/"):
+            pattern = "**/" + pattern
+        return f":(top,exclude,glob){pattern}"
+
+    def read_diff(self, *args):
+        max_bytes = int(os.getenv(DIFF_MAX_BYTES_VAR) or DEFAULT_DIFF_MAX_BYTES)
+        reader = DiffReader(max_bytes, min(max_bytes, DEFAULT_DIFF_MAX_FILE_BYTES) if max_bytes else DEFAULT_DIFF_MAX_FILE_BYTES)
+        diff = self.stream_command(["git", *args, "--", *self.get_diff_excludes()], reader)
+        if not diff:
+            diff = self.describe_excluded_changes(*args)
+        profiler.count("diff_bytes", reader.bytes_read)
         return diff
 
+    def describe_excluded_changes(self, *args):
+        output = self.run_command(["git", *args, "--numstat"], check=False)
+        if not output:
+            return ""
+        lines = ["Changed files (content excluded by .coraignore or the default ignore rules):"]
+        for line in output.split("\n"):
+            added, removed, path = line.split("\t", 2)
+            lines.append(f" {path} | +{added} -{removed}" if added != "-" else f" {path} | Bin")
+        return "\n".join(lines)
+
+    def get_diff(self, mode=None, pathspecs=None):
+        mode = (mode or os.getenv(STAGE_MODE_VAR) or DEFAULT_STAGE_MODE).lower()
+        self.stage_changes(mode if mode in STAGE_MODES else DEFAULT_STAGE_MODE, pathspecs)
+        if not self.has_staged_changes():
+            return ""
+        return self.get_staged_diff()
+
+    def stage_changes(self, mode, pathspecs=None):
+        if mode == "index" and not pathspecs:
+            return
+        env, details = self.get_status_accelerators()
+        with profiler.span("stage_changes", "git", mode="paths" if pathspecs else mode, **details):
+            if pathspecs:
+                self.run_command(["git", "add", "-A", "--", *pathspecs], env=env)
+            elif mode == "tracked":
+                self.run_command(["git", "add", "-u"], env=env)
+            elif mode == "all":
+                self.run_command(["git", "add", "."], env=env)
+
+    def get_status_accelerators(self):
+        # Só o git add percorre a árvore de trabalho; o diff --cached compara índice e HEAD.
+        # Configuração explícita do usuário (inclusive false) sempre vence
+        untracked_cache = (self.get_config("core.untrackedCache") or "").lower()
+        fsmonitor = (self.get_config("core.fsmonitor") or "").lower()
+        options = {}
+        if not untracked_cache:
+            options["core.untrackedCache"] = untracked_cache = "true"
+        if not fsmonitor and self.supports_builtin_fsmonitor():
+            options["core.fsmonitor"] = fsmonitor = "true"
+        env = {"GIT_CONFIG_COUNT": str(len(options))} if options else None
+        for index, (key, value) in enumerate(options.items()):
+            env[f"GIT_CONFIG_KEY_{index}"] = key
+            env[f"GIT_CONFIG_VALUE_{index}"] = value
+        details = {
+            "fsmonitor": bool(fsmonitor) and fsmonitor not in FALSE_VALUES,
+            "untracked_cache": untracked_cache not in FALSE_VALUES,
+        }
+        return env, details
+
+    def supports_builtin_fsmonitor(self):
+        if sys.platform not in BUILTIN_FSMONITOR_PLATFORMS:
+            return False
+        git_dir = self.get_git_dir()
+        try:
+            if not git_dir or os.path.getsize(os.path.join(git_dir, "index")) < LARGE_INDEX_BYTES:
+                return False
+            version = self.run_command(["git", "version"], check=False).split()[2]
+            return tuple(int(part) for part in version.split(".")[:2]) >= BUILTIN_FSMONITOR_MIN_GIT_VERSION
+        except:
+            return False
+
+    def has_staged_changes(self):
+        self.spawn_count += 1
+        profiler.count("subprocesses")
+        with profiler.span("git diff", "git", argv=["git", "diff", "--cached", "--quiet"]):
+            try:
+                result = subprocess.run(
+                    ["git", "diff", "--cached", "--quiet"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=self.repo_path,
+                )
+            except FileNotFoundError as e:
+                self.handle_missing_command(["git"], e)
+        return result.returncode != 0
+
+    def get_config(self, key):
+        if self.persistent:
+            return self.backend.get_config(key)
+        try:
+            return self.run_command(["git", "config", "--get", key], check=False) or None
+        except:
+            return None
+
+    def get_staged_diff(self):
+        return self.read_diff("diff", "--cached", "-M")
+
+    def get_staged_changes(self):
+        try:
+            output = self.run_command(["git", "diff", "--cached", "-M", "--raw", "--numstat", "-z"], check=False)
+        except:
+            return None
+        return self.parse_changes(output)
+
+    def get_commit_changes(self, sha):
+        try:
+            output = self.run_command(
+                ["git", "diff-tree", "-r", "-M", "--root", "--no-commit-id", "--raw", "--numstat", "-z", sha], check=False
+            )
+        except:
+            return None
+        return self.parse_changes(output)
+
+    def parse_changes(self, output):
+        changes = {}
+        tokens = output.split("\0")
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if token.startswith(":"):
+                status = token.split()[4]
+                if status[0] in "RC":
+                    old_path, path = tokens[index + 1], tokens[index + 2]
+                    index += 3
+                else:
+                    old_path = path = tokens[index + 1]
+                    index += 2
+                changes[path] = {"status": status[0], "score": status[1:], "path": path, "old_path": old_path,
+                                 "added": 0, "removed": 0, "binary": False}
+            elif "\t" in token:
+                added, removed, path = token.split("\t", 2)
+                if not path:
+                    path = tokens[index + 2]
+                    index += 3
+                else:
+                    index += 1
+                if path in changes:
+                    changes[path]["binary"] = added == "-"
+                    changes[path]["added"] = 0 if added == "-" else int(added)
+                    changes[path]["removed"] = 0 if removed == "-" else int(removed)
+            else:
+                index += 1
+        return list(changes.values())
+
+    def get_index_tree(self):
+        try:
+            return self.run_command(["git", "write-tree"], check=False) or None
+        except:
+            return None
+
+    def get_revisions(self, *refs):
+        if self.persistent:
+            revisions = [self.backend.resolve(ref) for ref in refs]
+            return revisions if all(revisions) else None
+        try:
+            output = self.run_command(["git", "rev-parse", *refs], check=False)
+            revisions = output.split("\n")
+            return revisions if len(revisions) == len(refs) else None
+        except:
+            return None
+
     def get_current_branch(self):
+        if self.persistent:
+            if self._current_branch is None:
+                self._current_branch = self.backend.read_head()
+            if self._current_branch:
+                return self._current_branch
         try:
             return self.run_command(["git", "rev-parse", "--abbrev-ref", "HEAD"])
         except:
             return None
 
     def get_local_branches(self):
+        if self.persistent:
+            refs = self.backend.list_refs("refs/heads/")
+            if refs is not None:
+                return sorted(refs)
         try:
-            branches_output = self.run_command(["git", "branch", "--list"])
-            branches = []
-            for line in branches_output.split("\n"):
-                branch = line.strip().replace("*", "").strip()
-                if branch and ("/" not in branch):
-                    branches.append(branch)
-            return branches
+            output = self.run_command(["git", "for-each-ref", "--format=%(refname:short)", "refs/heads/"])
+            return [branch for branch in output.split("\n") if branch]
         except:
             return []
 
+    def rank_base_branches(self, current_branch):
+        try:
+            output = self.run_command([
+                "git", "for-each-ref", "--sort=-committerdate",
+                "--format=%(refname:short)%00%(objectname)%00%(committerdate:unix)", "refs/heads/",
+            ], check=False)
+        except:
+            return []
+
+        branches = []
+        for line in output.split("\n"):
+            fields = line.split("\0")
+            if len(fields) == 3 and fields[0] != current_branch:
+                branches.append({"name": fields[0], "sha": fields[1], "date": int(fields[2] or 0)})
+        preferred = [branch for branch in branches if branch["name"] in PREFERRED_BASE_BRANCHES]
+        others = [branch for branch in branches if branch["name"] not in PREFERRED_BASE_BRANCHES]
+        candidates = preferred + others[:max(0, MAX_BASE_CANDIDATES - len(preferred))]
+
+        revisions = self.get_revisions(current_branch)
+        if not candidates or not revisions:
+            return candidates
+
+        with profiler.span("rank_base_branches", "git", candidates=len(candidates)):
+            counts = self.count_ahead_behind(revisions[0], [branch["sha"] for branch in candidates])
+        for branch, (ahead, behind) in zip(candidates, counts):
+            branch["ahead"], branch["behind"] = ahead, behind
+
+        def rank(branch):
+            ahead = branch["ahead"]
+            return (
+                not ahead,
+                ahead if ahead is not None else float("inf"),
+                branch["name"] not in PREFERRED_BASE_BRANCHES,
+                branch["behind"] or 0,
+                -branch["date"],
+            )
+
+        return sorted(candidates, key=rank)
+
+    def count_ahead_behind(self, head, shas):
+        # Uma única travessia do grafo para todas as branches: cada commit carrega uma máscara com as
+        # pontas que o alcançam (bit 0 = HEAD). Commits alcançáveis pelo merge-base de todas não contam
+        tips = [head, *shas]
+        try:
+            if len(shas) == 1:
+                behind, ahead = self.run_command(
+                    ["git", "rev-list", "--left-right", "--count", f"{shas[0]}...{head}"], check=False
+                ).split()
+                return [(int(ahead), int(behind))]
+            bases = self.run_command(["git", "merge-base", "--all", "--octopus", *tips], check=False).split()
+            output = self.run_command(["git", "rev-list", "--topo-order", "--parents", *tips, "--not", *bases], check=False)
+        except:
+            return [(None, None)] * len(shas)
+
+        masks = {}
+        for bit, sha in enumerate(tips):
+            masks[sha] = masks.get(sha, 0) | 1 << bit
+        totals = {}
+        for line in output.split("\n"):
+            if not line:
+                continue
+            commit, *parents = line.split()
+            mask = masks.pop(commit, 0)
+            totals[mask] = totals.get(mask, 0) + 1
+            for parent in parents:
+                masks[parent] = masks.get(parent, 0) | mask
+
+        counts = []
+        for bit in range(1, len(tips)):
+            ahead = sum(total for mask, total in totals.items() if mask & 1 and not mask >> bit & 1)
+            behind = sum(total for mask, total in totals.items() if mask >> bit & 1 and not mask & 1)
+            counts.append((ahead, behind))
+        return counts
+
     def get_branch_diff(self, base_branch, current_branch):
         try:
-            diff = self.run_command(["git", "diff", f"{base_branch}..{current_branch}"])
-            return diff
+            return self.read_diff("diff", "-M", f"{base_branch}...{current_branch}")
         except:
             return None
 
+    def get_branch_commits(self, base_branch, current_branch):
+        try:
+            output = self.run_command(
+                ["git", "log", "--reverse", "--no-merges", "--format=%H%x00%s", f"{base_branch}..{current_branch}"],
+                check=False,
+            )
+            return [tuple(line.split("\0", 1)) for line in output.split("\n") if "\0" in line]
+        except:
+            return []
+
+    def get_commit_diff(self, sha):
+        try:
+            return self.read_diff("show", "--format=", "-M", sha)
+        except:
+            return ""
+
+    def get_range_commits(self, revision_range):
+        output = self.run_command([
+            "git", "log", "--reverse", "--topo-order", "--date=raw",
+            "--format=%H%x00%P%x00%T%x00%an%x00%ae%x00%ad%x00%cn%x00%ce%x00%cd%x00%B%x1e", revision_range,
+        ])
+        commits = []
+        for record in output.split("\x1e"):
+            fields = record.lstrip("\n").split("\0")
+            if len(fields) != 10:
+                continue
+            commits.append({
+                "sha": fields[0],
+                "parents": fields[1].split(),
+                "tree": fields[2],
+                "author": fields[3:6],
+                "committer": fields[6:9],
+                "message": fields[9].strip("\n"),
+            })
+        return commits
+
+    def commit_tree(self, commit, parents, message):
+        env = {}
+        for role, (name, email, date) in (("AUTHOR", commit["author"]), ("COMMITTER", commit["committer"])):
+            env[f"GIT_{role}_NAME"] = name
+            env[f"GIT_{role}_EMAIL"] = email
+            env[f"GIT_{role}_DATE"] = f"@{date}"
+        command = ["git", "commit-tree", commit["tree"]]
+        for parent in parents:
+            command += ["-p", parent]
+        return self.run_command(command + ["-m", message], env=env)
+
+    def update_ref(self, ref, new_value, old_value=None, reason=None):
+        command = ["git", "update-ref"]
+        if reason:
+            command += ["-m", reason]
+        command += [ref, new_value]
+        if old_value:
+            command.append(old_value)
+        self.run_command(command)
+
     def create_branch(self, branch_name):
         try:
             self.run_command(["git", "checkout", "-b", branch_name], check=False)
-            current_branch_check = self.run_command(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"]
-            )
-            return current_branch_check == branch_name
+            self._current_branch = None
+            return self.get_current_branch() == branch_name
         except:
             return False
 
@@ -73,41 +488,61 @@ class GitService:
         except:
             return False
 
+    def get_push_command(self, branch_name, set_upstream=False):
+        if set_upstream:
+            return ["git", "push", "--set-upstream", "origin", branch_name]
+        return ["git", "push", "origin", branch_name]
+
     def push(self, branch_name, set_upstream=False):
         try:
-            if set_upstream:
-                self.run_command(
-                    ["git", "push", "--set-upstream", "origin", branch_name]
-                )
-            else:
-                self.run_command(["git", "push", "origin", branch_name])
+            self.run_command(self.get_push_command(branch_name, set_upstream))
             return True
         except:
             return False
 
+    def start_push(self, branch_name, set_upstream=False):
+        command = self.get_push_command(branch_name, set_upstream)
+        self.spawn_count += 1
+        profiler.count("subprocesses")
+        try:
+            # Sem terminal (stdin fechado e, fora do Windows, nova sessão): pedidos de senha/passphrase
+            # falham na hora em vez de disputar o stdin com os menus
+            return subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                cwd=self.repo_path,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+                start_new_session=hasattr(os, "killpg"),
+            )
+        except FileNotFoundError as e:
+            self.handle_missing_command(command, e)
+
     def get_remote_url(self):
+        if self.persistent:
+            return self.backend.get_config("remote.origin.url")
         try:
             return self.run_command(["git", "config", "--get", "remote.origin.url"])
         except:
             return None
 
-    def get_pr_url(self, branch_name):
-        try:
-            remote_url = self.get_remote_url()
-            if not remote_url:
-                return None
-
-            if remote_url.startswith("https://"):
-                repo_path = remote_url.replace("https://github.com/", "").replace(
-                    ".git", ""
-                )
-            elif remote_url.startswith("git@"):
-                repo_path = remote_url.replace("git@github.com:", "").replace(
-                    ".git", ""
-                )
-            else:
-                return None
+    def get_github_repo(self):
+        remote_url = self.get_remote_url()
+        if not remote_url:
+            return None
+        match = REMOTE_URL_PATTERN.match(remote_url.strip())
+        if not match:
+            return None
+        host = match.group("host") or match.group("scp_host")
+        owner, repo = match.group("owner"), match.group("repo")
+        return host.lower(), owner, repo[:-len(".git")] if repo.endswith(".git") else repo
 
-            return f"https://github.com/{repo_path}/pull/new/{branch_name}"
-        except Exception:
+    def get_pr_url(self, branch_name):
+        github_repo = self.get_github_repo()
+        if not github_repo:
             return None
+        host, owner, repo = github_repo
+        return f"https://{host}/{owner}/{repo}/pull/new/{branch_name}"
@@ -0,0 +1,125 @@
+import os
+import sys
+from utils.constants import *
+from utils.profiler import profiler
+
+
+class GitHubAPIError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def get_api_url(host):
+    api_url = os.getenv(GITHUB_API_URL_VAR)
+    if api_url:
+        return api_url.rstrip("/")
+    if host == DEFAULT_GITHUB_HOST:
+        return DEFAULT_GITHUB_API_URL
+    return f"https://{host}/api/v3"
+
+
+def get_gh_hosts_file():
+    config_dir = os.getenv(GH_CONFIG_DIR_VAR)
+    if not config_dir:
+        if sys.platform == "win32" and os.getenv("APPDATA"):
+            config_dir = os.path.join(os.getenv("APPDATA"), "GitHub CLI")
+        else:
+            config_dir = os.path.join(os.getenv("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "gh")
+    return os.path.join(config_dir, "hosts.yml")
+
+
+def read_gh_token(host, hosts_file=None):
+    try:
+        with open(hosts_file or get_gh_hosts_file(), encoding="utf-8") as file:
+            lines = file.read().split("\n")
+    except OSError:
+        return None
+
+    current_host = None
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace():
+            current_host = line.split(":", 1)[0].strip().strip("\"'").lower()
+        elif current_host == host and line.strip().startswith("oauth_token:"):
+            token = line.split(":", 1)[1].strip().strip("\"'")
+            return token or None
+    return None
+
+
+def find_token(host):
+    names = GITHUB_TOKEN_VARS if host == DEFAULT_GITHUB_HOST else GITHUB_ENTERPRISE_TOKEN_VARS
+    for name in names:
+        if os.getenv(name):
+            return os.getenv(name)
+    return read_gh_token(host)
+
+
+class GitHubClient:
+    def __init__(self, host, token, api_url=None):
+        self.host = host
+        self.token = token
+        self.api_url = api_url or get_api_url(host)
+        self._http_client = None
+
+    @property
+    def http_client(self):
+        if self._http_client is None:
+            import httpx
+
+            self._http_client = httpx.Client(
+                base_url=self.api_url,
+                headers={
+                    "Accept": "application/vnd.github+json",
+                    "Authorization": f"Bearer {self.token}",
+                    "User-Agent": f"{COMMAND_NAME}/{VERSION}",
+                    "X-GitHub-Api-Version": GITHUB_API_VERSION,
+                },
+                timeout=DEFAULT_GITHUB_TIMEOUT,
+                follow_redirects=True,
+            )
+        return self._http_client
+
+    def request(self, method, path, **kwargs):
+        import httpx
+
+        with profiler.span(f"{method} {path}", "github"):
+            try:
+                response = self.http_client.request(method, path, **kwargs)
+            except httpx.HTTPError as e:
+                raise GitHubAPIError(f"{method} {path}: {e}") from e
+        if response.status_code >= 400:
+            raise GitHubAPIError(self.error_message(response), response.status_code)
+        return response.json() if response.content else None
+
+    def error_message(self, response):
+        try:
+            payload = response.json()
+        except ValueError:
+            return f"HTTP {response.status_code}"
+        message = payload.get("message") or f"HTTP {response.status_code}"
+        details = [error.get("message") for error in payload.get("errors") or [] if isinstance(error, dict)]
+        details = [detail for detail in details if detail]
+        return f"{message}: {'; '.join(details)}" if details else message
+
+    def get_repository(self, owner, repo):
+        return self.request("GET", f"/repos/{owner}/{repo}")
+
+    def create_pull_request(self, owner, repo, base, head, title, body):
+        return self.request(
+            "POST",
+            f"/repos/{owner}/{repo}/pulls",
+            json={"base": base, "head": head, "title": title, "body": body},
+        )
+
+    def find_open_pull_request(self, owner, repo, head):
+        pulls = self.request(
+            "GET", f"/repos/{owner}/{repo}/pulls", params={"head": f"{owner}:{head}", "state": "open"}
+        )
+        return pulls[0] if pulls else None
+
+    def close(self):
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
@@ -1,22 +1,139 @@
+import hashlib
+import json
 import subprocess
 import tempfile
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from core.git_service import GitService
+from core.github_client import GitHubAPIError, GitHubClient, find_token
+from core.ui_service import UIService
+from utils.constants import *
+from utils.profiler import profiler
 from utils.system_utils import SystemUtils
 
 class GitHubService:
-    def __init__(self):
-        self.git_service = GitService()
+    def __init__(self, git_service=None):
+        self.git_service = git_service or GitService()
         self.system_utils = SystemUtils()
+        self.ui_service = UIService()
+        self._api = None
     
-    def check_cli_available(self):
+    def get_api(self):
+        if self._api is None:
+            self._api = False
+            github_repo = self.git_service.get_github_repo()
+            if github_repo:
+                host, owner, repo = github_repo
+                token = find_token(host)
+                if token:
+                    self._api = (GitHubClient(host, token), owner, repo)
+        return self._api or None
+    
+    def check_available(self):
+        if self.check_api_available():
+            return "api"
+        if self.check_cli_available():
+            return "cli"
+        return None
+    
+    def get_capabilities_path(self):
+        cache_dir = os.getenv(CACHE_DIR_VAR) or self.system_utils.get_cache_dir()
+        return os.path.join(cache_dir, GITHUB_CAPABILITY_FILE_NAME)
+    
+    def get_capability_key(self, client, owner, repo):
+        token_hash = hashlib.sha256(client.token.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{client.api_url}\0{owner}/{repo}\0{token_hash}".encode("utf-8")).hexdigest()
+    
+    def read_capabilities(self):
         try:
-            self.git_service.run_command(["gh", "--version"])
-            self.git_service.run_command(["gh", "auth", "status"])
-            self.git_service.run_command(["gh", "repo", "view"])
-            return True
-        except:
+            with open(self.get_capabilities_path(), encoding="utf-8") as file:
+                capabilities = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {key: checked for key, checked in capabilities.items() if now - checked < GITHUB_CAPABILITY_TTL}
+    
+    def write_capability(self, key, available):
+        capabilities = self.read_capabilities()
+        if available:
+            capabilities[key] = time.time()
+        else:
+            capabilities.pop(key, None)
+        path = self.get_capabilities_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(capabilities, file)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+    
+    def check_api_available(self):
+        api = self.get_api()
+        if not api:
             return False
+        client, owner, repo = api
+        key = self.get_capability_key(client, owner, repo)
+        if key in self.read_capabilities():
+            profiler.count("github_capability_cache_hits")
+            return True
+        with profiler.span("check_api_available", "github"):
+            try:
+                client.get_repository(owner, repo)
+            except GitHubAPIError:
+                return False
+        self.write_capability(key, True)
+        return True
+    
+    def check_cli_available(self):
+        checker = GitService(self.git_service.repo_path, persistent=False, raise_errors=True)
+        
+        def succeeds(command):
+            try:
+                checker.run_command(command)
+                return True
+            except:
+                return False
+        
+        commands = [["gh", "--version"], ["gh", "auth", "status"], ["gh", "repo", "view"]]
+        with profiler.span("check_cli_available", "github"):
+            with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+                return all(executor.map(succeeds, commands))
+    
+    def create_pr(self, method, base_branch, current_branch, description):
+        if method == "api":
+            return self.create_pr_with_api(base_branch, current_branch, description)
+        return self.create_pr_with_cli(base_branch, current_branch, description)
+    
+    def create_pr_with_api(self, base_branch, current_branch, description):
+        client, owner, repo = self.get_api()
+        title = f"PR: {current_branch} to {base_branch}"
+        try:
+            with profiler.span("create_pr_with_api", "github"):
+                pull_request = client.create_pull_request(owner, repo, base_branch, current_branch, title, description)
+            return pull_request.get("html_url")
+        except GitHubAPIError as e:
+            if e.status_code == 422 and "already exists" in str(e):
+                existing = self.find_existing_pr(client, owner, repo, current_branch)
+                if existing:
+                    print("ℹ️ Já existe um PR aberto para esta branch.")
+                    return existing
+            if e.status_code in (401, 403, 404):
+                self.write_capability(self.get_capability_key(client, owner, repo), False)
+                print("⚠️ O token do GitHub não tem permissão para criar PRs neste repositório.")
+                print("   Continuando com método alternativo...")
+            else:
+                print(f"❌ Erro ao criar PR: {e}")
+            return None
+    
+    def find_existing_pr(self, client, owner, repo, branch_name):
+        try:
+            pull_request = client.find_open_pull_request(owner, repo, branch_name)
+        except GitHubAPIError:
+            return None
+        return pull_request.get("html_url") if pull_request else None
     
     def create_pr_with_cli(self, base_branch, current_branch, description):
         try:
@@ -26,12 +143,13 @@ class GitHubService:
                 temp_file.write(description)
                 temp_file_path = temp_file.name
             
-            pr_url = self.git_service.run_command([
-                "gh", "pr", "create", 
-                "--base", base_branch,
-                "--title", title,
-                "--body-file", temp_file_path
-            ])
+            with profiler.span("create_pr_with_cli", "github"):
+                pr_url = self.git_service.run_command([
+                    "gh", "pr", "create", 
+                    "--base", base_branch,
+                    "--title", title,
+                    "--body-file", temp_file_path
+                ])
             
             os.unlink(temp_file_path)
             
@@ -80,6 +198,12 @@ class GitHubService:
             print("="*70)
             print("DESCRIÇÃO:")
             print()
-            print(description)
+            if isinstance(description, str):
+                print(description)
+            else:
+                description, aborted = self.ui_service.render_stream(description)
+                if aborted:
+                    return None
             print()
-            print("="*70 + "\n\n") 
\ No newline at end of file
+            print("="*70 + "\n\n")
+        return description
@@ -0,0 +1,170 @@
+import json
+import os
+import queue
+import threading
+import time
+from utils.cancel_event import CancelEvent
+from utils.constants import *
+from utils.profiler import profiler
+
+
+class HedgeError(Exception):
+    pass
+
+
+class LatencyStats:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._samples = None
+
+    def load(self):
+        if self._samples is None:
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    self._samples = json.load(file)
+            except (OSError, ValueError):
+                self._samples = {}
+        return self._samples
+
+    def record(self, latencies):
+        with self.lock:
+            for endpoint, seconds in latencies:
+                samples = self.load().setdefault(endpoint, [])
+                samples.append(round(seconds, 3))
+                del samples[:-MAX_LATENCY_SAMPLES]
+            self.save()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self._samples, file)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    def percentile(self, endpoint, fraction):
+        with self.lock:
+            samples = sorted(self.load().get(endpoint) or [])
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+class HedgedRequest:
+    def __init__(self, attempts, delay, stats=None, cancel_event=None, verbose=False):
+        self.attempts = attempts
+        self.delay = delay
+        self.stats = stats
+        self.cancel_event = cancel_event or threading.Event()
+        self.verbose = verbose
+        self.events = queue.Queue()
+        self.cancelled = [CancelEvent() for _ in attempts]
+        self.started_at = []
+        self.failed = {}
+
+    def start(self, index):
+        self.started_at.append(time.perf_counter())
+        threading.Thread(target=self.run_attempt, args=(index,), name=f"cora-hedge-{index}", daemon=True).start()
+
+    def run_attempt(self, index):
+        chunks = None
+        try:
+            chunks = self.attempts[index]["open"](self.cancelled[index])
+            for chunk in chunks:
+                if self.cancelled[index].is_set() or self.cancel_event.is_set():
+                    self.events.put((index, "error", HedgeError("request cancelled")))
+                    return
+                self.events.put((index, "chunk", chunk))
+            self.events.put((index, "end", None))
+        except BaseException as e:
+            self.events.put((index, "error", e))
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+    def cancel(self, keep=None):
+        for index, cancelled in enumerate(self.cancelled):
+            if index != keep:
+                cancelled.set()
+
+    def abort(self):
+        self.cancel()
+        self.events.put((None, "cancel", None))
+
+    def wait_for_winner(self):
+        while True:
+            if self.cancel_event.is_set():
+                raise HedgeError("request cancelled")
+            timeout = None
+            if len(self.started_at) < len(self.attempts):
+                timeout = max(0.0, self.started_at[-1] + self.delay - time.perf_counter())
+            try:
+                index, kind, value = self.events.get(timeout=timeout)
+            except queue.Empty:
+                self.hedge(len(self.started_at), f"Sem resposta em {round(self.delay * 1000)} ms")
+                continue
+            if kind == "cancel":
+                raise HedgeError("request cancelled")
+            if index in self.failed:
+                continue
+            if kind == "chunk" and value.strip():
+                return index, value
+            if kind == "chunk":
+                continue
+            self.failed[index] = value if kind == "error" else HedgeError(f"empty response from {self.attempts[index]['label']}")
+            if len(self.started_at) < len(self.attempts):
+                self.hedge(len(self.started_at), f"{self.attempts[index]['label']} falhou")
+            elif len(self.failed) == len(self.attempts):
+                raise self.failed[0]
+
+    def hedge(self, index, reason):
+        profiler.count("hedged_requests")
+        if self.verbose:
+            print(f"🏁 {reason}; enviando também para {self.attempts[index]['label']}")
+        self.start(index)
+
+    def record_latency(self, winner):
+        # Perdedor ainda sem resposta entra com o tempo até o cancelamento (limite inferior do real), senão o p90
+        # só veria respostas rápidas e o hedge dispararia cada vez mais cedo. Quem esperou menos que o atraso fica de fora
+        if self.stats is None:
+            return
+        now = time.perf_counter()
+        latencies = [(self.attempts[winner]["endpoint"], now - self.started_at[winner])]
+        for index, started_at in enumerate(self.started_at):
+            if index != winner and index not in self.failed and now - started_at >= self.delay:
+                latencies.append((self.attempts[index]["endpoint"], now - started_at))
+        self.stats.record(latencies)
+
+    def stream(self, cancelled=None):
+        if cancelled is not None:
+            cancelled.on_set(self.abort)
+        self.start(0)
+        try:
+            winner, first_chunk = self.wait_for_winner()
+            self.cancel(keep=winner)
+            self.record_latency(winner)
+            if winner:
+                profiler.count("hedge_wins")
+            if self.verbose and len(self.started_at) > 1:
+                print(f"🏁 {self.attempts[winner]['label']} respondeu primeiro")
+            yield first_chunk
+            while True:
+                index, kind, value = self.events.get()
+                if kind == "cancel":
+                    raise HedgeError("request cancelled")
+                if index != winner:
+                    continue
+                if kind == "chunk":
+                    yield value
+                elif kind == "end":
+                    return
+                else:
+                    raise value
+        finally:
+            if cancelled is not None:
+                cancelled.discard(self.abort)
+            self.cancel()
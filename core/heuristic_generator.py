@@ -0,0 +1,155 @@
+import posixpath
+import re
+from core.diff_compactor import DIFF_HEADER_PATTERN
+from utils.constants import *
+
+REQUIREMENTS_PATTERN = re.compile(r"(^|/)(requirements[^/]*|constraints[^/]*|requirements/[^/]+)\.txt$")
+DEPENDENCY_LINE_PATTERNS = (
+    re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*(?:===|==|>=|~=|<=|!=|>|<)\s*([^\s;,#]+)'),
+    re.compile(r'^"(@?[A-Za-z0-9][A-Za-z0-9._/@-]*)"\s*:\s*"[\^~>=<v ]*([0-9][^"]*)",?$'),
+    re.compile(r'^"([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*(?:==|>=|~=|<=|>|<)\s*([^",;]+)",?$'),
+    re.compile(r'^([A-Za-z0-9][A-Za-z0-9_-]*)\s*=\s*(?:\{[^}]*version\s*=\s*)?"[\^~>=<]*([0-9][^"]*)"'),
+    re.compile(r'^(?:require\s+)?([a-z0-9.-]+\.[a-z]+/[^\s]+)\s+(v[0-9][^\s]*)'),
+    re.compile(r'''^gem\s+['"]([^'"]+)['"]\s*,\s*['"][~>=< ]*([0-9][^'"]*)['"]'''),
+)
+STRUCTURAL_LINES = ("{", "}", "},", "[", "]", "],", "(", ")", "")
+IGNORED_DEPENDENCY_KEYS = ("version", "name", "python", "node", "npm")
+
+
+def slugify(text, max_length=40):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:max_length].strip("-")
+
+
+def file_stem(path):
+    name = posixpath.basename(path)
+    return name.split(".", 1)[0] if not name.startswith(".") else name
+
+
+def common_dir(paths):
+    directories = {posixpath.dirname(path) for path in paths}
+    if len(directories) == 1:
+        return directories.pop()
+    common = posixpath.commonpath(list(directories)) if all(directories) else ""
+    return common
+
+
+class HeuristicGenerator:
+    def classify(self, changes, diff=""):
+        if not changes:
+            return None
+        if all(self.is_dependency_file(change["path"]) for change in changes):
+            return self.dependency_suggestion(changes, diff)
+        if all(self.is_doc_file(change["path"]) for change in changes):
+            return self.docs_suggestion(changes)
+        if all(change["status"] == "D" for change in changes):
+            return self.deletion_suggestion(changes)
+        if all(self.is_pure_rename(change) for change in changes):
+            return self.rename_suggestion(changes)
+        return None
+
+    def is_dependency_file(self, path):
+        name = posixpath.basename(path)
+        return name in DEPENDENCY_MANIFESTS or name in GENERATED_FILE_NAMES or bool(REQUIREMENTS_PATTERN.search(path))
+
+    def is_lockfile(self, path):
+        return posixpath.basename(path) in GENERATED_FILE_NAMES
+
+    def is_doc_file(self, path):
+        name = posixpath.basename(path)
+        if self.is_dependency_file(path):
+            return False
+        if name.endswith(DOC_FILE_SUFFIXES) or file_stem(name).upper() in DOC_FILE_NAMES:
+            return True
+        in_docs = path.startswith(("docs/", "doc/")) or "/docs/" in path or "/doc/" in path
+        return in_docs and name.lower().endswith(DOC_ASSET_SUFFIXES)
+
+    def is_pure_rename(self, change):
+        return change["status"] == "R" and change["score"] == "100" and not (change["added"] or change["removed"])
+
+    def changed_lines_by_path(self, diff):
+        sections = {}
+        current = None
+        for line in diff.split("\n"):
+            if line.startswith("diff --git "):
+                match = DIFF_HEADER_PATTERN.match(line)
+                current = sections.setdefault(match.group(2), []) if match else None
+            elif current is not None and line[:1] in ("+", "-") and not line.startswith(("+++", "---")):
+                current.append(line)
+        return sections
+
+    def dependency_changes(self, changes, diff):
+        sections = self.changed_lines_by_path(diff)
+        versions = {}
+        for change in changes:
+            if self.is_lockfile(change["path"]):
+                continue
+            lines = sections.get(change["path"])
+            if lines is None:
+                return None
+            for line in lines:
+                content = line[1:].strip()
+                if content in STRUCTURAL_LINES or content.startswith(("#", "//")):
+                    continue
+                match = next((m for m in (p.match(content) for p in DEPENDENCY_LINE_PATTERNS) if m), None)
+                if not match:
+                    return None
+                name, version = match.group(1), match.group(2).strip()
+                if name.lower() in IGNORED_DEPENDENCY_KEYS:
+                    return None
+                versions.setdefault(name, {})[line[0]] = version
+        return {name: sides for name, sides in versions.items() if sides.get("+") != sides.get("-")}
+
+    def dependency_suggestion(self, changes, diff):
+        changed = self.dependency_changes(changes, diff)
+        if changed is None:
+            return None
+        if len(changed) == 1:
+            name, sides = next(iter(changed.items()))
+            if "+" in sides and "-" in sides:
+                return f"chore(deps): atualiza {name} para {sides['+']}".lower(), f"chore/update-{slugify(name)}"
+            if "+" in sides:
+                return f"chore(deps): adiciona {name} {sides['+']}".lower(), f"chore/add-{slugify(name)}"
+            return f"chore(deps): remove {name}".lower(), f"chore/remove-{slugify(name)}"
+        if not changed and len(changes) == 1:
+            name = posixpath.basename(changes[0]["path"])
+            return f"chore(deps): atualiza {name}".lower(), f"chore/update-{slugify(file_stem(name))}"
+        return "chore(deps): atualiza dependências", "chore/update-dependencies"
+
+    def docs_suggestion(self, changes):
+        if len(changes) == 1:
+            change = changes[0]
+            stem = file_stem(change["path"])
+            if change["status"] == "A":
+                return f"docs: adiciona {stem}".lower(), f"docs/add-{slugify(stem)}"
+            if change["status"] == "D":
+                return f"docs: remove {stem}".lower(), f"docs/remove-{slugify(stem)}"
+            return f"docs: atualiza {stem}".lower(), f"docs/update-{slugify(stem)}"
+        directory = common_dir([change["path"] for change in changes])
+        if posixpath.basename(directory) in ("docs", "doc"):
+            directory = posixpath.dirname(directory)
+        if directory:
+            return f"docs: atualiza documentação de {directory}".lower(), f"docs/update-{slugify(directory)}"
+        return "docs: atualiza documentação", "docs/update-documentation"
+
+    def deletion_suggestion(self, changes):
+        paths = [change["path"] for change in changes]
+        if len(paths) == 1:
+            return f"chore: remove {paths[0]}".lower(), f"chore/remove-{slugify(file_stem(paths[0]))}"
+        directory = common_dir(paths)
+        if directory:
+            return f"chore: remove {len(paths)} arquivos de {directory}".lower(), f"chore/remove-{slugify(directory)}-files"
+        return f"chore: remove {len(paths)} arquivos", "chore/remove-files"
+
+    def rename_suggestion(self, changes):
+        if len(changes) == 1:
+            old_path, path = changes[0]["old_path"], changes[0]["path"]
+            if posixpath.dirname(old_path) == posixpath.dirname(path):
+                message = f"refactor: renomeia {posixpath.basename(old_path)} para {posixpath.basename(path)}"
+                return message.lower(), f"refactor/rename-{slugify(file_stem(path))}"
+            destination = posixpath.dirname(path) or "a raiz do projeto"
+            message = f"refactor: move {posixpath.basename(path)} para {destination}"
+            return message.lower(), f"refactor/move-{slugify(file_stem(path))}"
+        directory = common_dir([change["path"] for change in changes])
+        if directory and all(posixpath.dirname(change["old_path"]) != directory for change in changes):
+            return f"refactor: move {len(changes)} arquivos para {directory}".lower(), f"refactor/move-files-to-{slugify(directory)}"
+        return f"refactor: renomeia {len(changes)} arquivos", "refactor/rename-files"
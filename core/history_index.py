@@ -0,0 +1,147 @@
+import os
+import re
+import sqlite3
+import threading
+from core.diff_compactor import DIFF_HEADER_PATTERN
+from utils.constants import *
+
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]{2,}")
+CAMEL_CASE_PATTERN = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+MAX_DIFF_SCAN_CHARS = 200_000
+
+
+def words_in(text):
+    words = set()
+    for word in WORD_PATTERN.findall(text):
+        words.update(part.lower() for part in CAMEL_CASE_PATTERN.split(word) if len(part) > 2)
+    return words
+
+
+def parent_dirs(paths):
+    return {path.rsplit("/", 1)[0] for path in paths if "/" in path}
+
+
+class HistoryIndex:
+    def __init__(self, git_service, cache_dir):
+        self.git_service = git_service
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, HISTORY_FILE_NAME)
+        self.lock = threading.Lock()
+        self._connection = None
+        self._repo_key = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS commits (
+                    repo TEXT NOT NULL,
+                    sha TEXT NOT NULL,
+                    committed INTEGER NOT NULL,
+                    subject TEXT NOT NULL,
+                    paths TEXT NOT NULL,
+                    PRIMARY KEY (repo, sha)
+                );
+                CREATE TABLE IF NOT EXISTS tips (
+                    repo TEXT NOT NULL,
+                    sha TEXT NOT NULL,
+                    indexed INTEGER NOT NULL,
+                    PRIMARY KEY (repo, sha)
+                );
+            """)
+        return self._connection
+
+    @property
+    def repo_key(self):
+        if self._repo_key is None:
+            _, common_dir = self.git_service.backend.git_dirs()
+            self._repo_key = os.path.abspath(common_dir) if common_dir else self.git_service.get_work_tree() or ""
+        return self._repo_key
+
+    def update(self):
+        head = self.git_service.backend.resolve("HEAD")
+        if not head:
+            return 0
+        with self.lock, self.connection as connection:
+            tips = [row[0] for row in connection.execute(
+                "SELECT sha FROM tips WHERE repo = ? ORDER BY indexed DESC", (self.repo_key,)
+            )]
+        if head in tips:
+            return 0
+
+        known_tips = [tip for tip in tips if self.git_service.backend.resolve(tip)]
+        output = self.git_service.run_command(
+            ["git", "log", "--no-merges", f"-n{HISTORY_INDEX_MAX_COMMITS}", "--format=%x1e%H%x00%ct%x00%s",
+             "--name-only", head, *(["--not", *known_tips] if known_tips else [])],
+            check=False,
+        )
+        rows = []
+        for record in output.split("\x1e"):
+            header, _, names = record.strip().partition("\n")
+            fields = header.split("\x00")
+            if len(fields) != 3:
+                continue
+            sha, committed, subject = fields
+            paths = [name for name in names.split("\n") if name]
+            rows.append((self.repo_key, sha, int(committed or 0), subject, "\n".join(paths)))
+
+        with self.lock, self.connection as connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO commits (repo, sha, committed, subject, paths) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO tips (repo, sha, indexed) VALUES (?, ?, strftime('%s', 'now'))",
+                (self.repo_key, head)
+            )
+            connection.execute(
+                "DELETE FROM tips WHERE repo = ? AND sha NOT IN "
+                "(SELECT sha FROM tips WHERE repo = ? ORDER BY indexed DESC LIMIT ?)",
+                (self.repo_key, self.repo_key, HISTORY_INDEX_MAX_TIPS)
+            )
+        return len(rows)
+
+    def similar_commits(self, diff, limit=DEFAULT_HISTORY_EXAMPLES):
+        if limit <= 0:
+            return []
+        try:
+            self.update()
+            with self.lock:
+                rows = self.connection.execute(
+                    "SELECT subject, paths, committed FROM commits WHERE repo = ? ORDER BY committed DESC LIMIT ?",
+                    (self.repo_key, HISTORY_INDEX_MAX_COMMITS)
+                ).fetchall()
+        except (sqlite3.Error, OSError):
+            return []
+
+        diff_paths = set()
+        for line in diff.split("\n"):
+            match = DIFF_HEADER_PATTERN.match(line) if line.startswith("diff --git ") else None
+            if match:
+                diff_paths.update(match.groups())
+        diff_dirs = parent_dirs(diff_paths)
+        changed_text = "\n".join(
+            line for line in diff[:MAX_DIFF_SCAN_CHARS].split("\n") if line[:1] in ("+", "-")
+        )
+        diff_words = words_in(changed_text) | words_in(" ".join(diff_paths))
+
+        scored = []
+        for recency, (subject, paths, _) in enumerate(rows):
+            commit_paths = set(paths.split("\n")) if paths else set()
+            score = (
+                3 * len(diff_paths & commit_paths)
+                + len(diff_dirs & parent_dirs(commit_paths))
+                + 0.5 * len(diff_words & words_in(subject))
+            )
+            if score > 0:
+                scored.append((score, -recency, subject))
+
+        scored.sort(reverse=True)
+        examples = []
+        for score, _, subject in scored:
+            if subject not in examples:
+                examples.append(subject)
+            if len(examples) >= limit:
+                break
+        return examples
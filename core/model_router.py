@@ -0,0 +1,44 @@
+import hashlib
+import json
+
+ROUTE_FALLBACK_TASK = "default"
+
+
+class ModelRouter:
+    def __init__(self, default_model, routes_config=None):
+        self.default_model = default_model
+        self.routes = {}
+        self.error = None
+        if routes_config:
+            try:
+                self.routes = self.parse(routes_config)
+            except (ValueError, TypeError, AttributeError) as e:
+                self.error = str(e)
+        self.signature = hashlib.sha256(json.dumps(self.routes, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def parse(self, routes_config):
+        routes = {}
+        for task, tiers in json.loads(routes_config).items():
+            if isinstance(tiers, str):
+                tiers = [{"model": tiers}]
+            parsed = []
+            for tier in tiers:
+                if not tier.get("model"):
+                    raise ValueError(f"tier without 'model' for task '{task}'")
+                max_tokens = tier.get("max_prompt_tokens")
+                parsed.append({"model": tier["model"], "max_prompt_tokens": int(max_tokens) if max_tokens else None})
+            parsed.sort(key=lambda tier: (tier["max_prompt_tokens"] is None, tier["max_prompt_tokens"] or 0))
+            routes[task] = parsed
+        return routes
+
+    def tiers_for(self, task):
+        return self.routes.get(task) or self.routes.get(ROUTE_FALLBACK_TASK)
+
+    def route(self, task, prompt_tokens):
+        tiers = self.tiers_for(task)
+        if not tiers:
+            return self.default_model, None
+        for tier in tiers:
+            if tier["max_prompt_tokens"] is None or prompt_tokens <= tier["max_prompt_tokens"]:
+                return tier["model"], tier["max_prompt_tokens"]
+        return None, tiers[-1]["max_prompt_tokens"]
@@ -0,0 +1,79 @@
+import re
+import threading
+import unicodedata
+from core.candidate_pool import strip_numbering
+from core.heuristic_generator import slugify
+from utils.constants import *
+
+LABEL_PATTERN = re.compile(
+    r"^(?:(?:suggested\s+)?(?:commit(?:\s+message)?|branch(?:\s+name)?)|mensagem(?:\s+de\s+commit)?|(?:nome\s+da\s+)?branch)\s*:\s*"
+)
+BRANCH_COMMAND_PATTERN = re.compile(r"^git\s+(?:checkout\s+-b|switch\s+-c|branch)\s+")
+COMMIT_PREFIX_PATTERN = re.compile(r"^([a-z]+)(\([^)]*\))?(!)?\s*:\s*")
+MISSING_COLON_PATTERN = re.compile(r"^([a-z]+)(\([^)]*\))?(!)?(?:\s*[-–]\s*|\s+)(?=[^\s:\-–])")
+BRANCH_PREFIX_PATTERN = re.compile(r"^([a-z]+)\s*(?:/|:\s*|-|\s+)(?=[^\s/:\-])")
+WRAPPING_CHARACTERS = "\"'*_ \t"
+TRAILING_CHARACTERS = " .\"'*_\t"
+
+
+def to_ascii(text):
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+class SuggestionValidator:
+    def __init__(self):
+        self.valid_refs = {}
+        self.lock = threading.Lock()
+
+    def clean(self, text):
+        text = strip_numbering(text.replace("`", "").strip(WRAPPING_CHARACTERS)).lower()
+        return LABEL_PATTERN.sub("", text, count=1).lstrip(WRAPPING_CHARACTERS)
+
+    def repair_commit(self, text, partial=False):
+        text = self.clean(text)
+        match = COMMIT_PREFIX_PATTERN.match(text) or MISSING_COLON_PATTERN.match(text)
+        commit_type = COMMIT_TYPE_ALIASES.get(match.group(1), match.group(1)) if match else None
+        if commit_type not in COMMIT_TYPES:
+            return "" if partial else None
+        description = re.sub(r"\s+", " ", text[match.end():]).rstrip(TRAILING_CHARACTERS)
+        if not description:
+            return "" if partial else None
+        return f"{commit_type}{match.group(2) or ''}{match.group(3) or ''}: {description}"
+
+    def repair_branch(self, text, partial=False, git_service=None):
+        text = BRANCH_COMMAND_PATTERN.sub("", self.clean(text), count=1)
+        match = BRANCH_PREFIX_PATTERN.match(text)
+        branch_type = COMMIT_TYPE_ALIASES.get(match.group(1), match.group(1)) if match else None
+        if branch_type not in COMMIT_TYPES:
+            return "" if partial else None
+        description = slugify(to_ascii(text[match.end():]), MAX_BRANCH_NAME_LENGTH - len(branch_type) - 1)
+        if not description:
+            return "" if partial else None
+        name = f"{branch_type}/{description}"
+        if partial or git_service is None:
+            return name
+        name = self.avoid_existing_branch(name, git_service)
+        return name if self.is_valid_ref(name, git_service) else None
+
+    def avoid_existing_branch(self, name, git_service):
+        current_branch = git_service.get_current_branch()
+        existing = set(git_service.get_local_branches()) - {current_branch}
+        suffix_number = 2
+        candidate = name
+        while candidate in existing or any(branch.startswith(f"{candidate}/") for branch in existing):
+            suffix = f"-{suffix_number}"
+            candidate = f"{name[:MAX_BRANCH_NAME_LENGTH - len(suffix)]}{suffix}"
+            suffix_number += 1
+        return candidate
+
+    def is_valid_ref(self, name, git_service):
+        with self.lock:
+            if name in self.valid_refs:
+                return self.valid_refs[name]
+        try:
+            valid = git_service.run_command(["git", "check-ref-format", "--branch", name], check=False) == name
+        except Exception:
+            valid = True
+        with self.lock:
+            self.valid_refs[name] = valid
+        return valid
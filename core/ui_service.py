@@ -1,4 +1,5 @@
 from utils.constants import *
+from utils.profiler import profiler
 
 class UIService:
     def __init__(self):
@@ -33,12 +34,36 @@ class UIService:
         print(f"""🤖 {COMMAND_NAME.title()} v{VERSION} - Assistente de Git com IA
 
 {HELP_SECTIONS["USAGE"]}
-  {COMMAND_NAME} [OPÇÕES]
+  {COMMAND_NAME} [OPÇÕES] [CAMINHOS...]
 
 {HELP_SECTIONS["OPTIONS"]}
   -b, --branch         Cria uma nova branch
   -c, --commit         Gera e executa commit
   -pr, --pull-request  {OPTION_DESCRIPTIONS["PR"]}
+      --no-stream      {OPTION_DESCRIPTIONS["NO_STREAM"]}
+      --staged         {OPTION_DESCRIPTIONS["STAGED"]}
+  -u, --update         {OPTION_DESCRIPTIONS["UPDATE"]}
+      CAMINHOS...      {OPTION_DESCRIPTIONS["PATHSPEC"]}
+      --suggest TAREFA {OPTION_DESCRIPTIONS["SUGGEST"]}
+      --base BRANCH    {OPTION_DESCRIPTIONS["BASE"]}
+      --daemon         {OPTION_DESCRIPTIONS["DAEMON"]}
+      --serve          {OPTION_DESCRIPTIONS["SERVE"]}
+      --stop-daemon    {OPTION_DESCRIPTIONS["STOP_DAEMON"]}
+      --watch          {OPTION_DESCRIPTIONS["WATCH"]}
+      --install-hook   {OPTION_DESCRIPTIONS["INSTALL_HOOK"]}
+      --uninstall-hook {OPTION_DESCRIPTIONS["UNINSTALL_HOOK"]}
+      --no-cache       {OPTION_DESCRIPTIONS["NO_CACHE"]}
+      --no-heuristics  {OPTION_DESCRIPTIONS["NO_HEURISTICS"]}
+      --batch ARQUIVO  {OPTION_DESCRIPTIONS["BATCH"]}
+      --workers N      {OPTION_DESCRIPTIONS["WORKERS"]}
+      --rate-limit RPM {OPTION_DESCRIPTIONS["RATE_LIMIT"]}
+      --output ARQUIVO {OPTION_DESCRIPTIONS["OUTPUT"]}
+      --reword A..B    {OPTION_DESCRIPTIONS["REWORD"]}
+      --dry-run        {OPTION_DESCRIPTIONS["DRY_RUN"]}
+      --cache-stats    {OPTION_DESCRIPTIONS["CACHE_STATS"]}
+      --verbose        {OPTION_DESCRIPTIONS["VERBOSE"]}
+      --profile        {OPTION_DESCRIPTIONS["PROFILE"]}
+      --trace ARQUIVO  {OPTION_DESCRIPTIONS["TRACE"]}
   -v, --version        {OPTION_DESCRIPTIONS["VERSION"]}
       -h, --help           {OPTION_DESCRIPTIONS["HELP"]}
 
@@ -48,6 +73,7 @@ class UIService:
   {COMMAND_NAME} -b -c              # Cria branch + commit
       {COMMAND_NAME} -c -pr            # Commit + abre PR
     {COMMAND_NAME} -b -c -pr         # Fluxo completo: branch + commit + PR
+  {COMMAND_NAME} --reword main..HEAD  # Reescreve as mensagens dos commits da branch
 
 {HELP_SECTIONS["SETUP"]}
   Configure sua chave da API no arquivo .env:
@@ -56,7 +82,8 @@ class UIService:
   {API_BASE_URL_VAR}="url_da_api"
 
 {HELP_SECTIONS["NOTE"]}
-  O comando automaticamente adiciona todas as mudanças (git add .) antes de gerar sugestões.
+  Por padrão o comando adiciona todas as mudanças (git add .) antes de gerar sugestões.
+  Em repositórios grandes, use --staged, -u ou CAMINHOS (ou {STAGE_MODE_VAR}=index|tracked) para evitar isso.
 """)
     
     def show_api_key_error(self):
@@ -69,26 +96,74 @@ class UIService:
     def show_operation_cancelled(self):
         print(f"\n\n{MESSAGES['OPERATION_CANCELLED']}")
     
-    def user_interaction_loop(self, prompt_question, generation_function, diff):
+    def render_stream(self, chunks):
+        parts = []
+        try:
+            for chunk in chunks:
+                print(chunk, end="", flush=True)
+                parts.append(chunk)
+        except KeyboardInterrupt:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+            print(f"\n{MESSAGES['STREAM_ABORTED']}")
+            return "".join(parts), True
+        print()
+        return "".join(parts), False
+
+    def user_interaction_loop(self, prompt_question, generation_function, diff, stream=False):
+        from core.ai_service import AIRequestError, PromptTooLargeError
+
         if "branch" in prompt_question.lower():
             suggested_temperature = DEFAULT_BRANCH_TEMPERATURE
         else:
             suggested_temperature = DEFAULT_TEMPERATURE
 
         previous_suggestions = []
+        use_cache = True
         while True:
-            suggestion = generation_function(
-                diff,
-                temperature=suggested_temperature,
-                history=previous_suggestions
-            )
-            print(f"\n💬 {prompt_question}:\n{suggestion}")
+            try:
+                if stream:
+                    print(f"\n💬 {prompt_question}:")
+                    suggestion, aborted = self.render_stream(generation_function(
+                        diff,
+                        temperature=suggested_temperature,
+                        history=previous_suggestions,
+                        stream=True,
+                        use_cache=use_cache
+                    ))
+                    use_cache = False
+                    if aborted:
+                        response = input("    🔄 Regenerate? (r) | 🚫 Cancel? (N): ").strip().lower()
+                        if response == "r":
+                            profiler.count("regenerations")
+                            continue
+                        return None
+                else:
+                    suggestion = generation_function(
+                        diff,
+                        temperature=suggested_temperature,
+                        history=previous_suggestions,
+                        use_cache=use_cache
+                    )
+                    use_cache = False
+                    print(f"\n💬 {prompt_question}:\n{suggestion}")
+            except PromptTooLargeError as e:
+                # Tentar de novo enviaria o mesmo prompt: não há o que repetir
+                print(f"❌ {e}")
+                return None
+            except AIRequestError as e:
+                print(f"❌ Error with AI API: {e}")
+                if self.confirm_retry():
+                    continue
+                return None
 
             response = input("    ➡️ Accept? (Y) | 🔄 Regenerate? (r) | 🚫 Cancel? (n): ").strip().lower()
 
             if response in ('y', ''):
                 return suggestion
             elif response == "r":
+                profiler.count("regenerations")
                 if suggestion:
                     previous_suggestions.append(suggestion)
                 suggested_temperature = min(1.0, suggested_temperature + 0.2)
@@ -97,6 +172,34 @@ class UIService:
             else:
                 return None
     
+    def show_cache_stats(self, stats):
+        if stats is None:
+            print("⚠️ Não foi possível ler o cache de sugestões.")
+            return
+        hits = stats.get("hits", 0)
+        misses = stats.get("misses", 0)
+        lookups = hits + misses
+        hit_rate = (hits / lookups * 100) if lookups else 0
+        print("🗄️ Cache de sugestões")
+        print(f"   Arquivo: {stats['path']}")
+        print(f"   Entradas: {stats['entries']} ({stats['size'] / 1024:.1f} KiB)")
+        print(f"   Acertos: {hits} | Falhas: {misses} | Taxa de acerto: {hit_rate:.0f}%")
+        checks = stats.get("heuristic_checks", 0)
+        if checks:
+            heuristic_hits = stats.get("heuristic_hits", 0)
+            print(f"⚡ Sugestões sem IA: {heuristic_hits} de {checks} ({heuristic_hits / checks * 100:.0f}%)")
+
+    def show_profile(self, rows, counters):
+        print("\n⏱️ Perfil de execução")
+        print(f"   {'categoria':<8} {'etapa':<28} {'chamadas':>8} {'total ms':>10} {'máx ms':>9}")
+        for row in rows:
+            print(f"   {row['category']:<8} {row['name'][:28]:<28} {row['calls']:>8} {row['total_ms']:>10.1f} {row['max_ms']:>9.1f}")
+        if counters:
+            print("   " + " | ".join(f"{name}: {value}" for name, value in sorted(counters.items())))
+
+    def confirm_retry(self):
+        return input("    🔄 Tentar novamente? (Y/n): ").strip().lower() in ('y', '')
+
     def show_commit_review(self, commit_message, current_branch):
         print(f"\n📝 Commit Review:")
         print(f"   Message: \"{commit_message}\"")
@@ -105,20 +208,59 @@ class UIService:
     def confirm_push(self, current_branch):
         return input(f"\n🚀 Push to remote branch '{current_branch}'? (Y/n): ").strip().lower()
     
-    def select_base_branch(self, current_branch, available_branches):
+    def select_base_branch(self, current_branch, ranked_branches):
         print(f"📍 Branch atual: {current_branch}")
-        print("\n📋 Selecione a branch base para comparação:")
+        print("\n📋 Selecione a branch base para comparação (mais provável primeiro):")
         
-        for i, branch in enumerate(available_branches, 1):
-            print(f"{i}. {branch}")
+        shown = ranked_branches[:BASE_BRANCH_MENU_SIZE]
+        for i, branch in enumerate(shown, 1):
+            marker = "⭐" if i == 1 else "  "
+            details = ""
+            if branch.get("ahead") is not None:
+                details = f"  ({branch['ahead']} à frente, {branch['behind']} atrás)"
+            print(f"{marker} {i}. {branch['name']}{details}")
+        if len(ranked_branches) > len(shown):
+            print(f"   ... e mais {len(ranked_branches) - len(shown)} branches (digite o nome)")
         
-        try:
-            choice = int(input("\n🔢 Digite o número da branch: "))
-            if 1 <= choice <= len(available_branches):
-                return available_branches[choice - 1]
+        choice = input(f"\n🔢 Digite o número ou o nome da branch [1. {shown[0]['name']}]: ").strip()
+        if not choice:
+            return shown[0]["name"]
+        if choice.isdigit():
+            if 1 <= int(choice) <= len(shown):
+                return shown[int(choice) - 1]["name"]
+            print("❌ Opção inválida.")
+            return None
+        if any(branch["name"] == choice for branch in ranked_branches):
+            return choice
+        print(f"❌ Branch '{choice}' não encontrada.")
+        return None
+    
+    def show_reword_plan(self, commits, messages):
+        print(f"\n📝 Novas mensagens ({len(messages)} de {len(commits)} commits):")
+        for i, commit in enumerate(commits, 1):
+            subject = commit["message"].split("\n", 1)[0]
+            if commit["sha"] in messages:
+                print(f"   {i}. {commit['sha'][:8]} {subject}")
+                print(f"      → {messages[commit['sha']]}")
             else:
-                print("❌ Opção inválida.")
+                print(f"   {i}. {commit['sha'][:8]} {subject} (mantida)")
+    
+    def review_reword(self, commits, messages):
+        messages = dict(messages)
+        while True:
+            self.show_reword_plan(commits, messages)
+            choice = input("\n    ➡️ Reescrever? (Y) | ✏️ Editar? (número) | 🚫 Cancelar? (n): ").strip().lower()
+            if choice in ('y', ''):
+                return messages
+            if not choice.isdigit():
                 return None
-        except ValueError:
-            print("❌ Por favor, digite um número válido.")
-            return None 
\ No newline at end of file
+            if not 1 <= int(choice) <= len(commits):
+                print("❌ Opção inválida.")
+                continue
+            commit = commits[int(choice) - 1]
+            original = commit["message"].split("\n", 1)[0]
+            message = input(f"    ✏️ Nova mensagem (vazio mantém '{original}'): ").strip()
+            if message and message != original:
+                messages[commit["sha"]] = message
+            else:
+                messages.pop(commit["sha"], None)
@@ -40,6 +40,13 @@ fi
 deactivate
 echo "Virtual environment setup complete."
 
+echo "Building precompiled fast-start bundle..."
+ENTRY_POINT="$PROJECT_DIR/main.py"
+BUNDLE_PATH="$PROJECT_DIR/build/cora.pyz"
+if ! "$VENV_DIR/bin/python" "$PROJECT_DIR/scripts/build_zipapp.py"; then
+  echo -e "${YELLOW}WARNING: Could not build the fast-start bundle. Falling back to main.py.${NC}"
+fi
+
 mkdir -p "$INSTALL_DIR"
 
 echo "Creating wrapper script at '$INSTALL_DIR/$COMMAND_NAME'..."
@@ -48,7 +55,13 @@ WRAPPER_SCRIPT_PATH="$INSTALL_DIR/$COMMAND_NAME"
 cat >"$WRAPPER_SCRIPT_PATH" <<EOF
 #!/bin/bash
 # Wrapper to run $COMMAND_NAME using its virtual environment
-exec "$VENV_DIR/bin/python" "$PROJECT_DIR/main.py" "\$@"
+# Uses the precompiled bundle unless a source file is newer (e.g. after git pull);
+# then runs main.py and rebuilds the bundle in the background.
+if [ -f "$BUNDLE_PATH" ] && [ -z "\$(find "$ENTRY_POINT" "$PROJECT_DIR/cli" "$PROJECT_DIR/core" "$PROJECT_DIR/utils" -name '*.py' -newer "$BUNDLE_PATH" -print -quit 2>/dev/null)" ]; then
+  exec "$VENV_DIR/bin/python" "$BUNDLE_PATH" "\$@"
+fi
+("$VENV_DIR/bin/python" "$PROJECT_DIR/scripts/build_zipapp.py" >/dev/null 2>&1 &)
+exec "$VENV_DIR/bin/python" "$ENTRY_POINT" "\$@"
 EOF
 
 chmod +x "$WRAPPER_SCRIPT_PATH"
@@ -74,7 +87,7 @@ if command -v pwsh &>/dev/null; then
     # Check if function already exists
     if ! grep -q "function $COMMAND_NAME" "$POWERSHELL_PROFILE" 2>/dev/null; then
       echo -e "\n# Auto-generated function for $COMMAND_NAME" >> "$POWERSHELL_PROFILE"
-      echo "function $COMMAND_NAME { & \"$VENV_DIR/bin/python\" \"$PROJECT_DIR/main.py\" \$args }" >> "$POWERSHELL_PROFILE"
+      echo "function $COMMAND_NAME { & \"$WRAPPER_SCRIPT_PATH\" \$args }" >> "$POWERSHELL_PROFILE"
       echo -e "${GREEN}✅ PowerShell function '$COMMAND_NAME' added to profile!${NC}"
       echo -e "   Profile: $POWERSHELL_PROFILE"
     else
@@ -10,6 +10,7 @@ def main():
     try:
         cora_commands.execute()
     except KeyboardInterrupt:
+        cora_commands.cancel()
         ui_service.show_operation_cancelled()
         exit(130)
 
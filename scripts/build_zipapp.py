@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Builds build/cora.pyz: a zipapp with the Cora sources precompiled to bytecode
+for the interpreter that runs this script. Dependencies stay in the virtualenv.
+The wrapper created by install.sh runs main.py instead (and rebuilds this
+bundle in the background) whenever a source file is newer than it.
+"""
+import os
+import py_compile
+import sys
+import tempfile
+import zipapp
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = ("cli", "core", "utils")
+OUTPUT_PATH = os.path.join(PROJECT_DIR, "build", "cora.pyz")
+
+
+def compile_source(source_path, target_path, archive_path):
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    py_compile.compile(
+        source_path,
+        cfile=target_path,
+        dfile=archive_path,
+        doraise=True,
+        optimize=1,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as staging_dir:
+        for package in PACKAGES:
+            package_dir = os.path.join(PROJECT_DIR, package)
+            for name in sorted(os.listdir(package_dir)):
+                if name.endswith(".py"):
+                    module = name[:-3] + ".pyc"
+                    compile_source(
+                        os.path.join(package_dir, name),
+                        os.path.join(staging_dir, package, module),
+                        os.path.join(OUTPUT_PATH, package, name),
+                    )
+        compile_source(
+            os.path.join(PROJECT_DIR, "main.py"),
+            os.path.join(staging_dir, "main.pyc"),
+            os.path.join(OUTPUT_PATH, "main.py"),
+        )
+
+        os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+        # Escreve ao lado e troca de uma vez: o wrapper pode estar executando o pacote antigo
+        partial_path = f"{OUTPUT_PATH}.{os.getpid()}.tmp"
+        try:
+            zipapp.create_archive(
+                staging_dir,
+                partial_path,
+                interpreter=sys.executable,
+                main="main:main",
+            )
+            os.replace(partial_path, OUTPUT_PATH)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    print(f"Built {OUTPUT_PATH} for Python {sys.version_info.major}.{sys.version_info.minor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Checks that the commands that do not talk to the AI provider start within the
+import-time budget and never load the heavy dependencies.
+
+Usage: python scripts/check_startup_time.py [--budget-ms 100] [--runs 5] [--entry main.py]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAST_COMMANDS = (["--help"], ["--version"], [])
+HEAVY_MODULES = ("openai", "httpx", "pydantic", "dotenv")
+
+
+def measure(entry, args, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, entry, *args], stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def heavy_imports(entry, args):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", entry, *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    imported = set()
+    for line in result.stderr.splitlines():
+        module = line.rsplit("|", 1)[-1].strip()
+        if module.split(".")[0] in HEAVY_MODULES:
+            imported.add(module.split(".")[0])
+    return sorted(imported)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time budget check")
+    parser.add_argument("--budget-ms", type=float, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--entry", default=os.path.join(PROJECT_DIR, "main.py"))
+    args = parser.parse_args()
+
+    failed = False
+    for command in FAST_COMMANDS:
+        label = " ".join(["cora", *command])
+        elapsed = measure(args.entry, command, args.runs)
+        heavy = heavy_imports(args.entry, command)
+        ok = elapsed <= args.budget_ms and not heavy
+        failed = failed or not ok
+        status = "ok" if ok else "FAIL"
+        details = f" (imports {', '.join(heavy)})" if heavy else ""
+        print(f"{status:4} {label:16} {elapsed:7.1f} ms / {args.budget_ms:.0f} ms{details}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
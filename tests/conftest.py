@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in (PROJECT_DIR, os.path.join(PROJECT_DIR, "scripts")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class GitRepo:
+    def __init__(self, path):
+        self.path = str(path)
+        self.commits = 0
+
+    def git(self, *args, env=None):
+        result = subprocess.run(
+            ["git", *args],
+            cwd=self.path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+            env={**os.environ, **env} if env else None,
+        )
+        return result.stdout.strip()
+
+    def write(self, path, content):
+        full_path = os.path.join(self.path, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w", encoding="utf-8") as output:
+            output.write(content)
+
+    def commit(self, message, files=None, env=None):
+        # Datas crescentes e fixas: ordenações por data ficam determinísticas
+        self.commits += 1
+        date = f"{1700000000 + self.commits * 60} +0000"
+        for path, content in (files or {f"file{self.commits}.txt": message}).items():
+            self.write(path, content)
+        self.git("add", "-A")
+        self.git("commit", "-q", "--allow-empty", "-m", message, env={"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date, **(env or {})})
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "Cora Tests")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "tests@example.com")
+    repo = GitRepo(tmp_path / "repo")
+    os.makedirs(repo.path)
+    repo.git("init", "-q", "-b", "main")
+    return repo
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from cli.commands import CoraCommands
+from core.git_service import GitService
+
+
+class AuthRequiredHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(401)
+        self.send_header("WWW-Authenticate", 'Basic realm="cora"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def auth_remote(git_repo):
+    server = HTTPServer(("127.0.0.1", 0), AuthRequiredHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    git_repo.commit("root")
+    git_repo.git("remote", "add", "origin", f"http://127.0.0.1:{server.server_port}/repo.git")
+    yield git_repo
+    server.shutdown()
+
+
+def commands_for(git_repo):
+    commands = CoraCommands()
+    commands._git_service = GitService(git_repo.path)
+    return commands
+
+
+def test_push_needing_credentials_fails_without_prompting(auth_remote):
+    error = commands_for(auth_remote).push_quietly("main", True)
+    assert "terminal prompts disabled" in error
+
+
+def sleeper():
+    return subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"], start_new_session=hasattr(os, "killpg"))
+
+
+def test_stop_push_kills_the_process_group(git_repo, capsys):
+    commands = commands_for(git_repo)
+    commands.push_process = sleeper()
+    commands.stop_push()
+    assert commands.push_process.wait(5) != 0
+    assert "Background push stopped" in capsys.readouterr().out
+
+
+def test_stop_push_without_killpg_terminates_the_process(git_repo, monkeypatch):
+    monkeypatch.delattr(os, "killpg", raising=False)
+    commands = commands_for(git_repo)
+    commands.push_process = sleeper()
+    commands.stop_push()
+    assert commands.push_process.wait(5) != 0
+
+
+def test_stop_push_ignores_finished_pushes(git_repo, capsys):
+    commands = commands_for(git_repo)
+    commands.stop_push()
+    commands.push_process = subprocess.Popen([sys.executable, "-c", "pass"])
+    commands.push_process.wait()
+    commands.stop_push()
+    assert capsys.readouterr().out == ""
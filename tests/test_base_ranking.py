@@ -0,0 +1,105 @@
+from core.git_service import GitService
+
+
+def left_right_count(git_repo, head, base):
+    behind, ahead = git_repo.git("rev-list", "--left-right", "--count", f"{base}...{head}").split()
+    return int(ahead), int(behind)
+
+
+def build_history(git_repo):
+    # develop e release saem de main; feature sai de develop; depois main e release avançam.
+    # Contagens distintas por branch: um bit trocado na máscara muda o resultado
+    git_repo.commit("root")
+    git_repo.commit("base")
+    git_repo.git("branch", "release")
+    git_repo.git("checkout", "-q", "-b", "develop")
+    git_repo.commit("develop 1")
+    git_repo.commit("develop 2")
+    git_repo.git("checkout", "-q", "-b", "feature")
+    for index in range(3):
+        git_repo.commit(f"feature {index}")
+    git_repo.git("checkout", "-q", "main")
+    git_repo.commit("main 1")
+    git_repo.commit("main 2")
+    git_repo.git("checkout", "-q", "release")
+    git_repo.commit("release 1")
+    git_repo.git("checkout", "-q", "feature")
+
+
+def test_batched_counts_match_rev_list(git_repo):
+    build_history(git_repo)
+    branches = ["main", "develop", "release"]
+    shas = [git_repo.git("rev-parse", branch) for branch in branches]
+    head = git_repo.git("rev-parse", "HEAD")
+
+    counts = GitService(git_repo.path).count_ahead_behind(head, shas)
+
+    assert counts == [left_right_count(git_repo, "feature", branch) for branch in branches]
+    assert counts == [(5, 2), (3, 0), (5, 1)]
+
+
+def test_single_candidate_uses_rev_list_directly(git_repo):
+    build_history(git_repo)
+    head = git_repo.git("rev-parse", "HEAD")
+    main = git_repo.git("rev-parse", "main")
+    assert GitService(git_repo.path).count_ahead_behind(head, [main]) == [(5, 2)]
+
+
+def test_duplicate_tips_share_a_mask(git_repo):
+    build_history(git_repo)
+    git_repo.git("branch", "develop-copy", "develop")
+    head = git_repo.git("rev-parse", "HEAD")
+    develop = git_repo.git("rev-parse", "develop")
+    main = git_repo.git("rev-parse", "main")
+    assert GitService(git_repo.path).count_ahead_behind(head, [develop, main, develop]) == [(3, 0), (5, 2), (3, 0)]
+
+
+def test_unrelated_history_counts_every_commit(git_repo):
+    build_history(git_repo)
+    git_repo.git("checkout", "-q", "--orphan", "orphan")
+    git_repo.commit("orphan 1")
+    git_repo.git("checkout", "-q", "feature")
+    head = git_repo.git("rev-parse", "HEAD")
+    shas = [git_repo.git("rev-parse", branch) for branch in ("orphan", "main")]
+    assert GitService(git_repo.path).count_ahead_behind(head, shas) == [(7, 1), (5, 2)]
+
+
+def test_rank_prefers_the_closest_base(git_repo):
+    build_history(git_repo)
+    ranked = GitService(git_repo.path).rank_base_branches("feature")
+    assert [branch["name"] for branch in ranked] == ["develop", "main", "release"]
+    assert [(branch["ahead"], branch["behind"]) for branch in ranked] == [(3, 0), (5, 2), (5, 1)]
+
+
+def test_rank_breaks_ties_by_preferred_name_then_behind_then_date(git_repo):
+    git_repo.commit("root")
+    for name in ("far", "stale", "recent"):
+        git_repo.git("branch", name)
+    git_repo.git("checkout", "-q", "-b", "feature")
+    git_repo.commit("feature 1")
+    for name, commits in (("stale", 1), ("far", 2), ("recent", 1)):
+        git_repo.git("checkout", "-q", name)
+        for index in range(commits):
+            git_repo.commit(f"{name} {index}")
+    git_repo.git("checkout", "-q", "feature")
+
+    ranked = GitService(git_repo.path).rank_base_branches("feature")
+
+    # A feature está 1 commit à frente de todas: main vence pelo nome, depois quem está menos atrás, depois a mais recente
+    assert [branch["name"] for branch in ranked] == ["main", "recent", "stale", "far"]
+    assert [branch["behind"] for branch in ranked] == [0, 1, 1, 2]
+
+
+def test_rank_puts_branches_already_containing_head_last(git_repo):
+    git_repo.commit("root")
+    git_repo.git("checkout", "-q", "-b", "feature")
+    git_repo.commit("feature 1")
+    git_repo.git("branch", "merged")
+    git_repo.commit("feature 2")
+    git_repo.git("branch", "ahead-of-feature")
+    git_repo.git("checkout", "-q", "ahead-of-feature")
+    git_repo.commit("later")
+    git_repo.git("checkout", "-q", "feature")
+    ranked = GitService(git_repo.path).rank_base_branches("feature")
+    assert [branch["name"] for branch in ranked][-1] == "ahead-of-feature"
+    assert ranked[0]["name"] == "merged"
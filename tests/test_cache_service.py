@@ -0,0 +1,115 @@
+import itertools
+
+import pytest
+
+import core.cache_service
+from core.ai_service import AIService
+from core.cache_service import CacheService
+from core.git_service import GitService
+from utils.constants import CACHE_DIR_VAR, MODEL_VAR
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Relógio que avança 1 s a cada leitura: a ordem de acesso (LRU) fica determinística
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(core.cache_service.time, "time", lambda: float(next(ticks)))
+
+
+def test_hit_and_miss_are_counted(tmp_path):
+    cache = CacheService(str(tmp_path))
+    assert cache.get("key") is None
+    cache.set("key", "feat: add cache")
+    assert cache.get("key") == "feat: add cache"
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["size"] == len("feat: add cache")
+
+
+def test_empty_values_are_not_stored(tmp_path):
+    cache = CacheService(str(tmp_path))
+    cache.set("key", "")
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_expired_entries_are_misses(tmp_path, monkeypatch):
+    cache = CacheService(str(tmp_path), max_age_days=1)
+    cache.set("key", "value")
+    later = core.cache_service.time.time() + 2 * 24 * 60 * 60
+    monkeypatch.setattr(core.cache_service.time, "time", lambda: later)
+    assert cache.get("key") is None
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path, clock):
+    cache = CacheService(str(tmp_path), max_bytes=30)
+    cache.set("a", "a" * 10)
+    cache.set("b", "b" * 10)
+    cache.set("c", "c" * 10)
+    assert cache.get("a") == "a" * 10
+
+    cache.set("d", "d" * 10)
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["a" * 10, "c" * 10, "d" * 10]
+    assert cache.get_stats()["size"] == 30
+
+
+def test_eviction_removes_as_many_entries_as_needed(tmp_path, clock):
+    cache = CacheService(str(tmp_path), max_bytes=30)
+    for key in "abc":
+        cache.set(key, key * 10)
+
+    cache.set("big", "x" * 25)
+
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["size"]) == (1, 25)
+    assert cache.get("big") == "x" * 25
+
+
+def test_cache_survives_a_new_instance(tmp_path):
+    CacheService(str(tmp_path)).set("key", "value")
+    assert CacheService(str(tmp_path)).get("key") == "value"
+
+
+def test_key_follows_the_staged_tree(git_repo, tmp_path, monkeypatch):
+    monkeypatch.setenv(MODEL_VAR, "test-model")
+    monkeypatch.setenv(CACHE_DIR_VAR, str(tmp_path / "cache"))
+    ai_service = AIService()
+    git_service = GitService(git_repo.path)
+    git_repo.commit("root", {"app.py": "one\n"})
+
+    def key_for_index(diff="diff"):
+        return ai_service.build_cache_key("commit", diff, 0.7, cache_scope=git_service.get_index_tree())
+
+    git_repo.write("app.py", "two\n")
+    git_repo.git("add", "app.py")
+    first_key = key_for_index()
+    ai_service.cache_service.set(first_key, "fix: change app")
+
+    # Mesmo índice: mesma chave, mesmo que o texto do diff mude (ex.: compactação diferente)
+    assert key_for_index("other rendering") == first_key
+    assert ai_service.get_cached_suggestion(key_for_index()) == "fix: change app"
+
+    git_repo.write("app.py", "three\n")
+    assert key_for_index() == first_key
+    git_repo.git("add", "app.py")
+    assert key_for_index() != first_key
+    assert ai_service.get_cached_suggestion(key_for_index()) is None
+
+    git_repo.write("app.py", "two\n")
+    git_repo.git("add", "app.py")
+    assert ai_service.get_cached_suggestion(key_for_index()) == "fix: change app"
+
+
+def test_key_changes_with_task_model_and_temperature(tmp_path, monkeypatch):
+    monkeypatch.setenv(MODEL_VAR, "test-model")
+    monkeypatch.setenv(CACHE_DIR_VAR, str(tmp_path))
+    ai_service = AIService()
+    key = ai_service.build_cache_key("commit", "diff", 0.7, cache_scope="tree")
+
+    assert ai_service.build_cache_key("branch", "diff", 0.7, cache_scope="tree") != key
+    assert ai_service.build_cache_key("commit", "diff", 0.9, cache_scope="tree") != key
+    ai_service.model = "other-model"
+    assert ai_service.build_cache_key("commit", "diff", 0.7, cache_scope="tree") != key
+    assert ai_service.build_cache_key("commit", "diff", 0.7, cache_scope="tree", use_cache=False) is None
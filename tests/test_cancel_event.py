@@ -0,0 +1,40 @@
+from utils.cancel_event import CancelEvent
+
+
+def test_callbacks_run_once_when_set():
+    calls = []
+    event = CancelEvent()
+    event.on_set(lambda: calls.append("first"))
+    event.on_set(lambda: calls.append("second"))
+    event.set()
+    event.set()
+    assert event.is_set()
+    assert calls == ["first", "second"]
+
+
+def test_callback_runs_immediately_when_already_set():
+    calls = []
+    event = CancelEvent()
+    event.set()
+    event.on_set(lambda: calls.append("late"))
+    assert calls == ["late"]
+
+
+def test_discarded_callbacks_do_not_run():
+    calls = []
+    event = CancelEvent()
+    callback = lambda: calls.append("discarded")
+    event.on_set(callback)
+    event.discard(callback)
+    event.discard(callback)
+    event.set()
+    assert calls == []
+
+
+def test_failing_callback_does_not_stop_the_others():
+    calls = []
+    event = CancelEvent()
+    event.on_set(lambda: 1 / 0)
+    event.on_set(lambda: calls.append("ran"))
+    event.set()
+    assert calls == ["ran"]
@@ -0,0 +1,113 @@
+import threading
+
+from core.candidate_pool import CandidatePool, is_similar
+from core.suggestion_validator import SuggestionValidator
+
+repair_commit = SuggestionValidator().repair_commit
+
+
+class Chunks:
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+def stream(pool, entry, chunks, retry=None):
+    return "".join(pool.stream_first(entry, chunks, retry))
+
+
+def test_is_similar_ignores_case_punctuation_and_small_edits():
+    assert is_similar("feat: add login", "Feat: add login.")
+    assert is_similar("feat: add login page", "feat: add login pages")
+    assert not is_similar("feat: add login", "fix: handle empty diff")
+
+
+def test_parse_strips_numbering_repairs_and_deduplicates():
+    text = "1. feat: add login\n2) Feat: add login.\n- feature: add logout\n\nnot a commit\n3. fix: x"
+    assert CandidatePool(limit=3).parse(text, repair_commit) == [
+        "feat: add login",
+        "feat: add logout",
+        "fix: x",
+    ]
+
+
+def test_parse_stops_at_the_limit():
+    assert CandidatePool(limit=2).parse("a\nb\nc") == ["a", "b"]
+
+
+def test_stream_first_yields_the_first_line_and_fills_the_rest():
+    pool = CandidatePool(limit=3)
+    entry = pool.begin("key", repair_commit)
+    chunks = Chunks(["1. feat: add ", "login\n2. fix: handle", " empty diff\n3. docs: readme"])
+
+    assert stream(pool, entry, chunks) == "feat: add login"
+    assert entry["ready"].wait(1)
+    assert pool.next("key", ["feat: add login"]) == "fix: handle empty diff"
+    assert pool.next("key", []) == "docs: readme"
+    assert pool.next("key", []) is None
+    assert "key" not in pool.entries
+    assert chunks.closed
+
+
+def test_stream_first_skips_suggestions_already_rejected():
+    pool = CandidatePool(limit=3)
+    entry = pool.begin("key", repair_commit, history=["feat: add login"])
+    chunks = Chunks(["feat: add login\n", "fix: handle empty diff\n", "docs: readme"])
+
+    assert stream(pool, entry, chunks) == "fix: handle empty diff"
+    assert entry["ready"].wait(1)
+    assert entry["candidates"] == ["fix: handle empty diff", "docs: readme"]
+
+
+def test_stream_first_retries_when_nothing_is_usable():
+    pool = CandidatePool(limit=3)
+    entry = pool.begin("key", repair_commit)
+    retry = Chunks(["fix: second attempt"])
+
+    assert stream(pool, entry, Chunks(["sure! here you go"]), retry=lambda: retry) == "fix: second attempt"
+    assert retry.closed
+
+
+def test_stream_first_falls_back_to_the_first_line_without_retry():
+    pool = CandidatePool(limit=3)
+    entry = pool.begin("key", repair_commit)
+    assert stream(pool, entry, Chunks(["  nothing useful\nat all"])) == "nothing useful"
+
+
+def test_interrupted_drain_drops_the_cut_line():
+    def chunks():
+        yield "feat: first\n"
+        yield "fix: second\nfix: cut"
+        raise ConnectionError()
+
+    pool = CandidatePool(limit=3)
+    entry = pool.begin("key", repair_commit)
+    assert stream(pool, entry, chunks()) == "feat: first"
+    assert entry["ready"].wait(1)
+    assert entry["candidates"] == ["feat: first", "fix: second"]
+
+
+def test_begin_evicts_the_least_recently_used_entries():
+    pool = CandidatePool(limit=3, max_entries=2)
+    for key in ("a", "b"):
+        pool.fill(pool.begin(key), "x\ny")
+    pool.next("a", [])
+    pool.begin("c")
+    assert list(pool.entries) == ["a", "c"]
+
+
+def test_next_waits_for_the_entry_to_be_filled():
+    pool = CandidatePool(limit=3)
+    entry = pool.begin("key")
+    threading.Timer(0.05, pool.fill, args=(entry, "a\nb")).start()
+    assert pool.next("key", [], timeout=1) == "a"
+    assert pool.next("missing", []) is None
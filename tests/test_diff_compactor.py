@@ -0,0 +1,68 @@
+from core.diff_compactor import DiffCompactor
+from core.diff_reader import DIFF_OMITTED_MARKER
+
+
+def file_diff(path, hunks, header=()):
+    lines = [f"diff --git a/{path} b/{path}", *header, f"--- a/{path}", f"+++ b/{path}"]
+    for index, body in enumerate(hunks):
+        lines.append(f"@@ -{index * 10 + 1},3 +{index * 10 + 1},3 @@")
+        lines.extend(body)
+    return "\n".join(lines)
+
+
+def test_small_diff_is_returned_unchanged():
+    diff = file_diff("app.py", [["-old", "+new"]])
+    assert DiffCompactor(token_budget=1000).compact(diff) == diff
+
+
+def test_empty_diff_is_returned_unchanged():
+    assert DiffCompactor().compact("") == ""
+
+
+def test_parse_reads_paths_status_and_hunks():
+    diff = "\n".join([
+        file_diff("new.py", [["+a", "+b"]], header=["new file mode 100644"]),
+        "diff --git a/old.py b/renamed.py",
+        "similarity index 100%",
+        "rename from old.py",
+        "rename to renamed.py",
+    ])
+    added, renamed = DiffCompactor().parse(diff)
+    assert (added.path, added.status, added.added, added.removed) == ("new.py", "added", 2, 0)
+    assert (renamed.old_path, renamed.path, renamed.status) == ("old.py", "renamed.py", "renamed")
+    assert renamed.stub() == "renamed: old.py -> renamed.py (100% similar)"
+
+
+def test_compact_keeps_significant_hunks_and_summarizes_the_rest():
+    noise = [f"+    value_{index} = {index}" for index in range(200)]
+    diff = "\n".join([
+        file_diff("package-lock.json", [noise]),
+        file_diff("service.py", [["+def handler(event):", "+    return event"], [" ", "+"]]),
+        file_diff("big.py", [noise]),
+    ])
+    compacted = DiffCompactor(token_budget=300).compact(diff)
+
+    assert compacted.startswith("Changed files:\n package-lock.json | +200 -0")
+    assert "generated file changed: package-lock.json (+200 -0)" in compacted
+    assert "+def handler(event):" in compacted
+    assert "value_199" not in compacted
+    assert len(compacted) <= 300 * 4
+
+
+def test_whitespace_only_and_omitted_files_become_stubs():
+    diff = "\n".join([
+        file_diff("style.py", [["-x = 1", "+x  =  1"]]),
+        "diff --git a/huge.sql b/huge.sql",
+        DIFF_OMITTED_MARKER,
+        file_diff("pad.py", [[f"+line {index}" for index in range(100)]]),
+    ])
+    compacted = DiffCompactor(token_budget=150).compact(diff)
+    assert "whitespace-only changes: style.py" in compacted
+    assert "changed, content not read (diff size limit): huge.sql" in compacted
+
+
+def test_compact_reuses_the_last_result():
+    compactor = DiffCompactor(token_budget=50)
+    diff = file_diff("app.py", [[f"+line {index}" for index in range(100)]])
+    first = compactor.compact(diff)
+    assert compactor.compact(diff) is first
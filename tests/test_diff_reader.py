@@ -0,0 +1,90 @@
+import io
+
+from core.diff_reader import DIFF_OMITTED_MARKER, DiffReader
+from core.git_service import GitService
+from utils.constants import DIFF_MAX_BYTES_VAR, DIFF_SCAN_FACTOR
+
+
+def file_diff(path, lines):
+    header = [f"diff --git a/{path} b/{path}", f"--- a/{path}", f"+++ b/{path}", "@@ -0,0 +1 @@"]
+    return "".join(f"{line}\n" for line in header + [f"+{line}" for line in lines])
+
+
+def read(diff, **budgets):
+    reader = DiffReader(**budgets)
+    return reader, reader.read(io.BytesIO(diff.encode("utf-8")))
+
+
+def test_small_diff_is_kept_whole():
+    diff = file_diff("a.py", ["one", "two"])
+    reader, output = read(diff, max_bytes=10000, max_file_bytes=1000)
+    assert output == diff.strip()
+    assert reader.bytes_read == reader.bytes_kept == len(diff)
+    assert not reader.stopped_early
+
+
+def test_per_file_budget_omits_the_rest_of_that_file_only():
+    big = [f"line {index:04}" for index in range(100)]
+    reader, output = read(file_diff("big.py", big) + file_diff("small.py", ["ok"]), max_bytes=100000, max_file_bytes=200)
+    big_part, small_part = output.split("diff --git a/small.py")
+    assert "+line 0000" in big_part and "+line 0099" not in big_part
+    assert big_part.rstrip().endswith(DIFF_OMITTED_MARKER)
+    assert "+ok" in small_part and DIFF_OMITTED_MARKER not in small_part
+
+
+def test_total_budget_keeps_headers_of_later_files():
+    diff = "".join(file_diff(f"f{index}.py", [f"x{index}" * 40]) for index in range(5))
+    reader, output = read(diff, max_bytes=300, max_file_bytes=0)
+    assert output.count("diff --git ") == 5
+    assert "+x0x0" in output and "+x4x4" not in output
+    assert output.count(DIFF_OMITTED_MARKER) >= 3
+    assert reader.bytes_kept < reader.bytes_read == len(diff)
+
+
+def test_reading_stops_after_the_scan_limit():
+    diff = "".join(file_diff(f"f{index}.py", ["y" * 100]) for index in range(50))
+    max_bytes = 200
+    reader, output = read(diff, max_bytes=max_bytes, max_file_bytes=0)
+    assert reader.stopped_early
+    assert max_bytes * DIFF_SCAN_FACTOR <= reader.bytes_read < len(diff)
+    assert output.endswith("remaining files were not read")
+
+
+def test_coraignore_and_default_patterns_never_reach_the_diff(git_repo):
+    git_repo.commit("root", {"README.md": "hi\n", ".coraignore": "# comentários\nsecrets/\n*.csv\n/fixtures\n!poetry.lock\n"})
+    git_repo.write("app.py", "print('app')\n")
+    git_repo.write("secrets/token.txt", "TOP-SECRET\n")
+    git_repo.write("nested/data.csv", "CSV-CONTENT\n")
+    git_repo.write("fixtures/big.json", "FIXTURE-CONTENT\n")
+    git_repo.write("nested/fixtures/kept.json", "NESTED-FIXTURE\n")
+    git_repo.write("package-lock.json", "LOCK-CONTENT\n")
+    git_repo.write("poetry.lock", "POETRY-CONTENT\n")
+
+    diff = GitService(git_repo.path).get_diff("all")
+
+    for hidden in ("TOP-SECRET", "CSV-CONTENT", "FIXTURE-CONTENT", "LOCK-CONTENT"):
+        assert hidden not in diff
+    for shown in ("print('app')", "NESTED-FIXTURE", "POETRY-CONTENT"):
+        assert shown in diff
+
+
+def test_only_excluded_changes_are_listed_without_content(git_repo):
+    git_repo.commit("root", {"README.md": "hi\n"})
+    git_repo.write("package-lock.json", "LOCK-CONTENT\n")
+
+    diff = GitService(git_repo.path).get_diff("all")
+
+    assert diff.startswith("Changed files (content excluded")
+    assert " package-lock.json | +1 -0" in diff
+    assert "LOCK-CONTENT" not in diff
+
+
+def test_byte_budget_from_the_environment(git_repo, monkeypatch):
+    git_repo.commit("root", {"README.md": "hi\n"})
+    git_repo.write("big.py", "".join(f"value_{index} = {index}\n" for index in range(2000)))
+    monkeypatch.setenv(DIFF_MAX_BYTES_VAR, "1024")
+
+    diff = GitService(git_repo.path).get_diff("all")
+
+    assert "value_0 = 0" in diff and "value_1999" not in diff
+    assert diff.endswith(DIFF_OMITTED_MARKER)
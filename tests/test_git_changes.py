@@ -0,0 +1,73 @@
+import os
+
+from core.git_service import GitService
+
+ORIGINAL = "".join(f"line {index}\n" for index in range(40))
+
+
+def by_path(changes):
+    return {change["path"]: change for change in changes}
+
+
+def test_staged_changes_cover_every_kind_of_entry(git_repo):
+    git_repo.commit("root", {
+        "kept.py": ORIGINAL,
+        "edited.py": ORIGINAL,
+        "gone.py": "bye\n",
+        "run.sh": "echo hi\n",
+        "logo.bin": "\0\1\2",
+        "dir with space/old name.txt": ORIGINAL,
+    })
+    os.makedirs(os.path.join(git_repo.path, "moved"))
+    git_repo.git("mv", "kept.py", "moved/kept.py")
+    git_repo.git("mv", "edited.py", "renamed.py")
+    git_repo.write("renamed.py", ORIGINAL + "line 40\n")
+    git_repo.git("mv", "dir with space/old name.txt", "dir with space/new\tname.txt")
+    git_repo.git("rm", "-q", "gone.py")
+    with open(os.path.join(git_repo.path, "logo.bin"), "wb") as binary:
+        binary.write(b"\0\3\4\5")
+    git_repo.write("added.py", "a\nb\n")
+    git_repo.git("add", "-A")
+    git_repo.git("update-index", "--chmod=+x", "run.sh")
+
+    changes = by_path(GitService(git_repo.path).get_staged_changes())
+
+    assert set(changes) == {
+        "moved/kept.py", "renamed.py", "dir with space/new\tname.txt", "gone.py", "run.sh", "logo.bin", "added.py",
+    }
+    assert changes["moved/kept.py"] == {
+        "status": "R", "score": "100", "path": "moved/kept.py", "old_path": "kept.py",
+        "added": 0, "removed": 0, "binary": False,
+    }
+    renamed = changes["renamed.py"]
+    assert (renamed["status"], renamed["old_path"], renamed["added"], renamed["removed"]) == ("R", "edited.py", 1, 0)
+    assert int(renamed["score"]) < 100
+    assert changes["dir with space/new\tname.txt"]["old_path"] == "dir with space/old name.txt"
+    assert (changes["gone.py"]["status"], changes["gone.py"]["removed"]) == ("D", 1)
+    assert (changes["run.sh"]["status"], changes["run.sh"]["added"], changes["run.sh"]["removed"]) == ("M", 0, 0)
+    assert changes["logo.bin"]["binary"] and changes["logo.bin"]["added"] == 0
+    assert (changes["added.py"]["status"], changes["added.py"]["added"]) == ("A", 2)
+
+
+def test_commit_changes_include_the_root_commit(git_repo):
+    sha = git_repo.commit("root", {"README.md": "hi\n"})
+    assert GitService(git_repo.path).get_commit_changes(sha) == [{
+        "status": "A", "score": "", "path": "README.md", "old_path": "README.md",
+        "added": 1, "removed": 0, "binary": False,
+    }]
+
+
+def test_parse_changes_reads_copies():
+    output = "\0".join([
+        ":100644 100644 1111111 1111111 C075", "src/a.py", "src/b.py",
+        "3\t1\t", "src/a.py", "src/b.py",
+        "",
+    ])
+    assert GitService().parse_changes(output) == [{
+        "status": "C", "score": "075", "path": "src/b.py", "old_path": "src/a.py",
+        "added": 3, "removed": 1, "binary": False,
+    }]
+
+
+def test_parse_changes_of_nothing_is_empty():
+    assert GitService().parse_changes("") == []
@@ -0,0 +1,174 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.ai_service import AIService
+from core.hedging import HedgedRequest, HedgeError, LatencyStats
+from utils.cancel_event import CancelEvent
+from utils.constants import DEFAULT_HEDGE_DELAY, MAX_HEDGE_DELAY, MAX_LATENCY_SAMPLES, MIN_HEDGE_DELAY
+
+LONG_DELAY = 30
+
+
+class FakeAttempt:
+    # Só responde quando o portão abre; o cancelamento acorda a espera, como o abort_stream faz com o socket
+    def __init__(self, chunks=("ok",), error=None, gate=None, on_open=None):
+        self.chunks = chunks
+        self.error = error
+        self.gate = gate or threading.Event()
+        if gate is None:
+            self.gate.set()
+        self.on_open = on_open
+        self.cancelled = None
+        self.opened = threading.Event()
+        self.closed = threading.Event()
+
+    def open(self, cancelled):
+        self.cancelled = cancelled
+        cancelled.on_set(self.gate.set)
+        self.opened.set()
+        if self.on_open:
+            self.on_open()
+        return self.stream()
+
+    def stream(self):
+        try:
+            self.gate.wait()
+            if self.cancelled.is_set():
+                raise HedgeError("aborted")
+            if self.error:
+                raise self.error
+            yield from self.chunks
+        finally:
+            self.closed.set()
+
+
+class FakeStats:
+    def __init__(self):
+        self.recorded = []
+
+    def record(self, latencies):
+        self.recorded.append(latencies)
+
+
+def request(attempts, delay=LONG_DELAY, stats=None, cancel_event=None):
+    specs = [
+        {"endpoint": f"endpoint-{index}", "label": f"attempt-{index}", "open": attempt.open}
+        for index, attempt in enumerate(attempts)
+    ]
+    return HedgedRequest(specs, delay, stats, cancel_event)
+
+
+def test_fast_primary_never_hedges():
+    primary, secondary = FakeAttempt(("feat: ", "add login")), FakeAttempt()
+    hedged = request([primary, secondary])
+    assert "".join(hedged.stream()) == "feat: add login"
+    assert len(hedged.started_at) == 1
+    assert not secondary.opened.is_set()
+
+
+def test_slow_primary_is_hedged_after_the_delay_and_cancelled():
+    primary, secondary = FakeAttempt(gate=threading.Event()), FakeAttempt(("fix: ", "from hedge"))
+    hedged = request([primary, secondary], delay=0.05)
+
+    started = time.perf_counter()
+    assert "".join(hedged.stream()) == "fix: from hedge"
+
+    assert time.perf_counter() - started >= 0.05
+    assert primary.cancelled.is_set()
+    assert primary.closed.wait(1)
+
+
+def test_failed_primary_hedges_without_waiting_for_the_delay():
+    primary, secondary = FakeAttempt(error=ConnectionError("boom")), FakeAttempt(("from hedge",))
+    hedged = request([primary, secondary])
+    assert "".join(hedged.stream()) == "from hedge"
+    assert isinstance(hedged.failed[0], ConnectionError)
+
+
+def test_empty_primary_response_counts_as_failure():
+    primary, secondary = FakeAttempt(("", "  ")), FakeAttempt(("from hedge",))
+    assert "".join(request([primary, secondary]).stream()) == "from hedge"
+
+
+def test_primary_error_is_raised_when_every_attempt_fails():
+    primary = FakeAttempt(error=ConnectionError("primary"))
+    secondary = FakeAttempt(error=TimeoutError("secondary"))
+    with pytest.raises(ConnectionError, match="primary"):
+        "".join(request([primary, secondary]).stream())
+
+
+def test_winner_chunks_are_not_mixed_with_the_loser():
+    primary_gate = threading.Event()
+    primary = FakeAttempt(("primary",), gate=primary_gate)
+    secondary = FakeAttempt(("a", "b"), on_open=primary_gate.set)
+    hedged = request([primary, secondary], delay=0.05)
+    output = "".join(hedged.stream())
+    assert output in ("primary", "ab")
+    winner = 0 if output == "primary" else 1
+    assert hedged.cancelled[1 - winner].is_set()
+
+
+def test_external_cancel_aborts_every_attempt():
+    primary, secondary = FakeAttempt(gate=threading.Event()), FakeAttempt(gate=threading.Event())
+    hedged = request([primary, secondary], delay=0.01)
+    cancelled = CancelEvent()
+    threading.Thread(target=lambda: secondary.opened.wait(1) and cancelled.set()).start()
+
+    with pytest.raises(HedgeError, match="cancelled"):
+        "".join(hedged.stream(cancelled))
+
+    assert all(event.is_set() for event in hedged.cancelled)
+    assert primary.closed.wait(1) and secondary.closed.wait(1)
+
+
+def test_loser_still_waiting_is_recorded_as_a_censored_sample():
+    stats = FakeStats()
+    primary, secondary = FakeAttempt(gate=threading.Event()), FakeAttempt()
+    "".join(request([primary, secondary], delay=0.05, stats=stats).stream())
+
+    (latencies,) = stats.recorded
+    assert [endpoint for endpoint, _ in latencies] == ["endpoint-1", "endpoint-0"]
+    winner_elapsed, loser_elapsed = latencies[0][1], latencies[1][1]
+    assert loser_elapsed >= 0.05 > winner_elapsed
+
+
+def test_failed_attempts_and_recent_losers_are_not_recorded():
+    stats = FakeStats()
+    second_gate, third_gate = threading.Event(), threading.Event()
+    attempts = [
+        FakeAttempt(error=ConnectionError("boom")),
+        FakeAttempt(gate=second_gate),
+        FakeAttempt(gate=third_gate),
+    ]
+    # O segundo responde assim que o terceiro sai: o terceiro esperou menos que o atraso e fica de fora
+    attempts[2].on_open = second_gate.set
+    assert "".join(request(attempts, delay=0.2, stats=stats).stream()) == "ok"
+    assert [endpoint for endpoint, _ in stats.recorded[0]] == ["endpoint-1"]
+
+
+def test_latency_stats_percentile_persistence_and_cap(tmp_path):
+    path = str(tmp_path / "cache" / "latency.json")
+    stats = LatencyStats(path)
+    stats.record([("primary", 0.1)] * 4)
+    assert stats.percentile("primary", 0.9) is None
+
+    stats.record([("primary", seconds / 10) for seconds in range(1, MAX_LATENCY_SAMPLES + 10)])
+    reloaded = LatencyStats(path)
+    assert len(reloaded.load()["primary"]) == MAX_LATENCY_SAMPLES
+    assert reloaded.percentile("primary", 0.9) == stats.percentile("primary", 0.9)
+    assert reloaded.percentile("other", 0.9) is None
+
+
+@pytest.mark.parametrize("configured, observed, expected", [
+    (0.3, 4.0, 0.3),
+    (None, None, DEFAULT_HEDGE_DELAY),
+    (None, 0.01, MIN_HEDGE_DELAY),
+    (None, 60.0, MAX_HEDGE_DELAY),
+    (None, 2.5, 2.5),
+])
+def test_hedge_delay_uses_the_observed_percentile_within_bounds(configured, observed, expected):
+    service = SimpleNamespace(hedge_delay=configured, latency_stats=SimpleNamespace(percentile=lambda endpoint, fraction: observed))
+    assert AIService.get_hedge_delay(service, "primary") == expected
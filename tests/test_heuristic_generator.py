@@ -0,0 +1,93 @@
+import pytest
+
+from core.heuristic_generator import HeuristicGenerator
+
+
+def change(path, status="M", added=1, removed=1, old_path=None, score=""):
+    return {"status": status, "score": score, "path": path, "old_path": old_path or path, "added": added, "removed": removed}
+
+
+def requirements_diff(*lines):
+    return "\n".join([
+        "diff --git a/requirements.txt b/requirements.txt",
+        "--- a/requirements.txt",
+        "+++ b/requirements.txt",
+        "@@ -1,2 +1,2 @@",
+        *lines,
+    ])
+
+
+def test_dependency_bump():
+    diff = requirements_diff("-openai==1.0.0", "+openai==1.2.0")
+    assert HeuristicGenerator().classify([change("requirements.txt")], diff) == (
+        "chore(deps): atualiza openai para 1.2.0",
+        "chore/update-openai",
+    )
+
+
+def test_dependency_addition_ignores_lockfiles():
+    diff = requirements_diff("+httpx>=0.28")
+    changes = [change("requirements.txt", removed=0), change("poetry.lock", added=40, removed=12)]
+    assert HeuristicGenerator().classify(changes, diff) == ("chore(deps): adiciona httpx 0.28", "chore/add-httpx")
+
+
+def test_dependency_file_with_code_changes_is_not_classified():
+    diff = requirements_diff("+--index-url https://example.com")
+    assert HeuristicGenerator().classify([change("requirements.txt", removed=0)], diff) is None
+
+
+@pytest.mark.parametrize("changes, expected", [
+    ([change("README.md")], ("docs: atualiza readme", "docs/update-readme")),
+    ([change("docs/guide.md", status="A")], ("docs: adiciona guide", "docs/add-guide")),
+    (
+        [change("api/docs/a.md"), change("api/docs/b.rst")],
+        ("docs: atualiza documentação de api", "docs/update-api"),
+    ),
+])
+def test_docs(changes, expected):
+    assert HeuristicGenerator().classify(changes) == expected
+
+
+def test_deletions():
+    changes = [change("legacy/a.py", status="D"), change("legacy/b.py", status="D")]
+    assert HeuristicGenerator().classify(changes) == ("chore: remove 2 arquivos de legacy", "chore/remove-legacy-files")
+
+
+@pytest.mark.parametrize("old_path, path, expected", [
+    ("core/old.py", "core/new.py", ("refactor: renomeia old.py para new.py", "refactor/rename-new")),
+    ("old/util.py", "lib/util.py", ("refactor: move util.py para lib", "refactor/move-util")),
+])
+def test_pure_renames(old_path, path, expected):
+    changes = [change(path, status="R", score="100", added=0, removed=0, old_path=old_path)]
+    assert HeuristicGenerator().classify(changes) == expected
+
+
+def test_edited_rename_is_not_classified():
+    changes = [change("core/new.py", status="R", score="87", old_path="core/old.py")]
+    assert HeuristicGenerator().classify(changes) is None
+
+
+def test_mixed_changes_are_not_classified():
+    assert HeuristicGenerator().classify([change("README.md"), change("main.py")]) is None
+    assert HeuristicGenerator().classify([]) is None
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("README.md", True),
+    ("README.txt", True),
+    ("LICENSE", True),
+    ("docs/notes.txt", True),
+    ("api/doc/diagram.svg", True),
+    ("CMakeLists.txt", False),
+    ("tests/fixtures/expected.txt", False),
+    ("data/words.txt", False),
+    ("assets/logo.png", False),
+    ("requirements.txt", False),
+])
+def test_is_doc_file(path, expected):
+    assert HeuristicGenerator().is_doc_file(path) is expected
+
+
+def test_text_files_outside_doc_directories_go_to_the_model():
+    assert HeuristicGenerator().classify([change("CMakeLists.txt")]) is None
+    assert HeuristicGenerator().classify([change("tests/fixtures/input.txt", status="A")]) is None
@@ -0,0 +1,76 @@
+from core.git_service import GitService
+from core.history_index import HistoryIndex, parent_dirs, words_in
+
+
+def file_diff(path, *lines):
+    return "\n".join([f"diff --git a/{path} b/{path}", f"--- a/{path}", f"+++ b/{path}", "@@ -1 +1 @@", *lines])
+
+
+def index_for(git_repo, tmp_path):
+    return HistoryIndex(GitService(git_repo.path), str(tmp_path / "cache"))
+
+
+def build_history(git_repo):
+    git_repo.commit("feat: add payment gateway", {"billing/payments.py": "one\n"})
+    git_repo.commit("docs: describe deployment", {"docs/deploy.md": "one\n"})
+    git_repo.commit("fix: round invoice totals", {"billing/invoices.py": "one\n"})
+    git_repo.commit("chore: bump linter", {"tox.ini": "one\n"})
+    git_repo.commit("fix: retry payment webhook", {"billing/payments.py": "two\n"})
+
+
+def test_words_split_camel_case_and_skip_short_parts():
+    assert words_in("parseHTTPResponse to_json id") == {"parse", "httpresponse", "json"}
+    assert parent_dirs(["a/b/c.py", "top.py", "a/d.py"]) == {"a/b", "a"}
+
+
+def test_only_related_commits_are_examples(git_repo, tmp_path):
+    build_history(git_repo)
+    diff = file_diff("billing/payments.py", "-amount = 1", "+amount = 2")
+
+    examples = index_for(git_repo, tmp_path).similar_commits(diff, limit=10)
+
+    # Mesmo arquivo primeiro (o mais recente desempata), depois o mesmo diretório
+    assert examples == ["fix: retry payment webhook", "feat: add payment gateway", "fix: round invoice totals"]
+
+
+def test_unrelated_diff_gets_no_examples(git_repo, tmp_path):
+    build_history(git_repo)
+    diff = file_diff("frontend/theme.css", "+color: red;")
+    assert index_for(git_repo, tmp_path).similar_commits(diff, limit=10) == []
+
+
+def test_subject_words_count_as_related(git_repo, tmp_path):
+    build_history(git_repo)
+    diff = file_diff("scripts/release.sh", "+run deployment")
+    assert index_for(git_repo, tmp_path).similar_commits(diff, limit=10) == ["docs: describe deployment"]
+
+
+def test_example_count_is_capped(git_repo, tmp_path):
+    for index in range(8):
+        git_repo.commit(f"feat: change api v{index}", {"api/routes.py": f"{index}\n"})
+    diff = file_diff("api/routes.py", "+pass")
+    history = index_for(git_repo, tmp_path)
+
+    assert history.similar_commits(diff, limit=3) == [f"feat: change api v{index}" for index in (7, 6, 5)]
+    assert len(history.similar_commits(diff, limit=20)) == 8
+    assert history.similar_commits(diff, limit=0) == []
+
+
+def test_repeated_subjects_are_listed_once(git_repo, tmp_path):
+    git_repo.commit("fix: typo", {"api/a.py": "1\n"})
+    git_repo.commit("fix: typo", {"api/a.py": "2\n"})
+    git_repo.commit("feat: add endpoint", {"api/a.py": "3\n"})
+    examples = index_for(git_repo, tmp_path).similar_commits(file_diff("api/a.py", "+x"), limit=2)
+    assert examples == ["feat: add endpoint", "fix: typo"]
+
+
+def test_new_commits_are_indexed_incrementally(git_repo, tmp_path):
+    build_history(git_repo)
+    history = index_for(git_repo, tmp_path)
+    assert history.update() == 5
+    assert history.update() == 0
+
+    git_repo.commit("feat: add refunds", {"billing/refunds.py": "one\n"})
+    assert index_for(git_repo, tmp_path).update() == 1
+    diff = file_diff("billing/refunds.py", "+x")
+    assert index_for(git_repo, tmp_path).similar_commits(diff, limit=1) == ["feat: add refunds"]
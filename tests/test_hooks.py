@@ -0,0 +1,72 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from cli.hooks import HookInstaller
+from core.git_service import GitService
+from utils.constants import HOOK_NAME
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def installer(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    return HookInstaller(GitService(git_repo.path))
+
+
+def hook_text(git_repo):
+    with open(os.path.join(git_repo.path, ".git", "hooks", HOOK_NAME), encoding="utf-8") as hook:
+        return hook.read()
+
+
+def test_hook_runs_the_installed_wrapper(installer, git_repo, tmp_path, monkeypatch):
+    wrapper = tmp_path / "bin" / "cora"
+    wrapper.parent.mkdir()
+    wrapper.write_text(f'#!/bin/bash\nexec python "{os.path.join(PROJECT_DIR, "main.py")}" "$@"\n')
+    monkeypatch.setattr(shutil, "which", lambda name: str(wrapper))
+    monkeypatch.setattr(sys, "argv", [os.path.join(PROJECT_DIR, "build", "cora.pyz")])
+
+    assert installer.install()
+
+    text = hook_text(git_repo)
+    assert f"suggestion=$({wrapper} --suggest commit" in text
+    assert "cora.pyz" not in text
+
+
+def test_hook_without_wrapper_runs_main_py(installer, git_repo, monkeypatch):
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+    monkeypatch.setattr(sys, "argv", ["/tmp/pytest-of-someone/cora.pyz"])
+
+    assert installer.install()
+
+    assert f"{sys.executable} {os.path.join(PROJECT_DIR, 'main.py')} --suggest commit" in hook_text(git_repo)
+
+
+def test_hook_prepends_the_suggestion(installer, git_repo, tmp_path, monkeypatch):
+    wrapper = tmp_path / "cora"
+    wrapper.write_text(f'#!/bin/sh\n# {PROJECT_DIR}/main.py\necho "feat: from hook"\n')
+    wrapper.chmod(0o755)
+    monkeypatch.setattr(shutil, "which", lambda name: str(wrapper))
+    installer.install()
+    message = tmp_path / "COMMIT_EDITMSG"
+    message.write_text("# comments\n")
+
+    subprocess.run([os.path.join(git_repo.path, ".git", "hooks", HOOK_NAME), str(message)], check=True)
+    assert message.read_text() == "feat: from hook\n# comments\n"
+
+    message.write_text("given\n")
+    subprocess.run([os.path.join(git_repo.path, ".git", "hooks", HOOK_NAME), str(message), "message"], check=True)
+    assert message.read_text() == "given\n"
+
+
+def test_foreign_hooks_are_kept(installer, git_repo):
+    hook = os.path.join(git_repo.path, ".git", "hooks", HOOK_NAME)
+    with open(hook, "w", encoding="utf-8") as file:
+        file.write("#!/bin/sh\necho mine\n")
+    assert not installer.install()
+    assert not installer.uninstall()
+    assert hook_text(git_repo) == "#!/bin/sh\necho mine\n"
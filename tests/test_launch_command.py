@@ -0,0 +1,44 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+import cli.daemon as daemon_module
+from cli.daemon import DaemonClient
+from utils.system_utils import SystemUtils
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PATH = os.path.join(PROJECT_DIR, "main.py")
+
+
+@pytest.fixture
+def wrapper(tmp_path, monkeypatch):
+    path = tmp_path / "cora"
+    monkeypatch.setattr(shutil, "which", lambda name: str(path) if path.exists() else None)
+    return path
+
+
+def test_uses_the_installed_wrapper_for_this_checkout(wrapper, monkeypatch):
+    wrapper.write_text(f'#!/bin/bash\nexec python "{MAIN_PATH}" "$@"\n')
+    monkeypatch.setattr(sys, "argv", [os.path.join(PROJECT_DIR, "build", "cora.pyz")])
+    assert SystemUtils().get_launch_command() == [str(wrapper)]
+
+
+def test_ignores_a_wrapper_for_another_checkout(wrapper, monkeypatch):
+    wrapper.write_text('#!/bin/bash\nexec python "/elsewhere/main.py" "$@"\n')
+    monkeypatch.setattr(sys, "argv", [os.path.join(PROJECT_DIR, "build", "cora.pyz")])
+    assert SystemUtils().get_launch_command() == [sys.executable, MAIN_PATH]
+
+
+def test_without_wrapper_runs_main_py_instead_of_the_bundle(wrapper, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["/tmp/somewhere/cora.pyz"])
+    assert SystemUtils().get_launch_command() == [sys.executable, MAIN_PATH]
+
+
+def test_daemon_is_spawned_through_the_launch_command(tmp_path, wrapper, monkeypatch):
+    spawned = []
+    monkeypatch.setattr(daemon_module.subprocess, "Popen", lambda command, **kwargs: spawned.append(command))
+    monkeypatch.setattr(sys, "argv", [os.path.join(PROJECT_DIR, "build", "cora.pyz")])
+    DaemonClient(str(tmp_path / "daemon" / "cora.sock")).spawn()
+    assert spawned == [[sys.executable, MAIN_PATH, "--serve"]]
@@ -0,0 +1,88 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from core.model_router import ModelRouter
+
+
+def router(routes):
+    return ModelRouter("default-model", json.dumps(routes))
+
+
+def test_without_routes_uses_the_default_model():
+    assert ModelRouter("default-model").route("commit", 50000) == ("default-model", None)
+
+
+def test_picks_the_smallest_tier_that_fits():
+    routes = router({"commit": [
+        {"model": "large", "max_prompt_tokens": 100000},
+        {"model": "small", "max_prompt_tokens": 4000},
+    ]})
+    assert routes.route("commit", 3000) == ("small", 4000)
+    assert routes.route("commit", 4001) == ("large", 100000)
+
+
+def test_returns_no_model_when_the_prompt_exceeds_every_tier():
+    assert router({"commit": [{"model": "small", "max_prompt_tokens": 4000}]}).route("commit", 5000) == (None, 4000)
+
+
+def test_unbounded_tier_and_default_task():
+    routes = router({"pr": [{"model": "small", "max_prompt_tokens": 4000}, {"model": "any"}], "default": "fallback"})
+    assert routes.route("pr", 999999) == ("any", None)
+    assert routes.route("branch", 10) == ("fallback", None)
+
+
+def test_invalid_routes_are_reported_and_ignored():
+    invalid = ModelRouter("default-model", json.dumps({"commit": [{"max_prompt_tokens": 10}]}))
+    assert "model" in invalid.error
+    assert invalid.route("commit", 5) == ("default-model", None)
+    assert ModelRouter("default-model", "{not json").error
+
+
+def test_signature_changes_with_the_routes():
+    assert router({"commit": "a"}).signature == router({"commit": "a"}).signature
+    assert router({"commit": "a"}).signature != router({"commit": "b"}).signature
+
+
+def test_prompt_larger_than_every_tier_is_not_offered_a_retry(monkeypatch, capsys):
+    from core.ai_service import AIService, PromptTooLargeError
+    from core.ui_service import UIService
+    from utils.token_utils import TokenUtils
+
+    def raise_error(error):
+        raise error
+
+    service = SimpleNamespace(
+        token_utils=TokenUtils(),
+        model_router=router({"commit": [{"model": "small", "max_prompt_tokens": 10}]}),
+        handle_request_error=raise_error,
+        verbose=False,
+    )
+    with pytest.raises(PromptTooLargeError, match="largest tier"):
+        AIService.select_model(service, "commit", "x" * 100)
+
+    def generate(diff, **kwargs):
+        AIService.select_model(service, "commit", diff)
+
+    monkeypatch.setattr("builtins.input", lambda prompt: pytest.fail(f"unexpected prompt: {prompt}"))
+    assert UIService().user_interaction_loop("Commit message", generate, "x" * 100) is None
+    assert "largest tier" in capsys.readouterr().out
+
+
+def test_other_request_errors_still_offer_a_retry(monkeypatch):
+    from core.ai_service import AIRequestError
+    from core.ui_service import UIService
+
+    calls = []
+
+    def generate(diff, **kwargs):
+        calls.append(diff)
+        if len(calls) == 1:
+            raise AIRequestError("timeout")
+        return "feat: ok"
+
+    answers = iter(["y", "y"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    assert UIService().user_interaction_loop("Commit message", generate, "diff") == "feat: ok"
+    assert len(calls) == 2
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from core.ai_service import AIService
+from utils.constants import CACHE_DIR_VAR, MODEL_VAR, PR_CHUNK_TOKENS_VAR, PR_MAX_WORKERS_VAR
+
+
+def file_diff(path, lines, header=()):
+    parts = [f"diff --git a/{path} b/{path}", *header, f"--- a/{path}", f"+++ b/{path}", "@@ -1,1 +1,1 @@"]
+    return "\n".join(parts + [f"+{line}" for line in lines])
+
+
+@pytest.fixture
+def ai_service(tmp_path, monkeypatch):
+    monkeypatch.setenv(MODEL_VAR, "test-model")
+    monkeypatch.setenv(CACHE_DIR_VAR, str(tmp_path))
+    monkeypatch.setenv(PR_CHUNK_TOKENS_VAR, "200")
+    monkeypatch.setenv(PR_MAX_WORKERS_VAR, "2")
+    service = AIService()
+    service.prompts = []
+    lock = threading.Lock()
+
+    def complete(prompt, model, temperature, task=None):
+        with lock:
+            service.prompts.append(prompt)
+        return f"summary {len(service.prompts)}"
+
+    service.complete = complete
+    return service
+
+
+def file_blocks(text):
+    return [block for block in text.split("\ndiff --git ") if block]
+
+
+def test_chunks_keep_whole_files_in_order(ai_service):
+    files = [file_diff(f"src/module_{index}.py", [f"value = {index} # " + "x" * 60] * 3) for index in range(8)]
+    chunks = ai_service.split_diff_chunks("\n".join(files))
+
+    assert len(chunks) > 1
+    assert "\n".join(chunks) == "\n".join(files)
+    for chunk in chunks:
+        assert chunk.startswith("diff --git ")
+        assert ai_service.token_utils.estimate(chunk) <= ai_service.pr_chunk_tokens
+        for block in chunk.split("\ndiff --git "):
+            path = block.split(" b/", 1)[1].split("\n", 1)[0]
+            assert f"--- a/{path}\n+++ b/{path}\n@@ -1,1 +1,1 @@" in block
+
+
+def test_header_lines_stay_with_their_file(ai_service):
+    renamed = file_diff("new.py", ["x" * 40] * 2, header=(
+        "similarity index 90%", "rename from old.py", "rename to new.py",
+    ))
+    files = [file_diff("a.py", ["a" * 70] * 9), renamed, file_diff("b.py", ["b" * 70] * 9)]
+    chunks = ai_service.split_diff_chunks("\n".join(files))
+
+    holding = [chunk for chunk in chunks if "rename from old.py" in chunk]
+    assert len(holding) == 1
+    assert renamed in holding[0]
+
+
+def test_oversized_file_gets_its_own_compacted_chunk(ai_service):
+    small = file_diff("small.py", ["ok"])
+    hunks = "\n".join(f"@@ -{index},1 +{index},1 @@\n+" + "z" * 200 for index in range(1, 20))
+    big = f"diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n{hunks}"
+    chunks = ai_service.split_diff_chunks("\n".join([small, big, small]))
+
+    holding = [chunk for chunk in chunks if "big.py" in chunk]
+    assert len(holding) == 1
+    assert "Changed files:" in holding[0] and "diff --git a/big.py b/big.py" in holding[0]
+    assert "".join(chunks).count(small) == 2
+    for chunk in chunks:
+        assert ai_service.token_utils.estimate(chunk) <= ai_service.pr_chunk_tokens
+
+def test_empty_diff_has_no_chunks(ai_service):
+    assert ai_service.split_diff_chunks("") == []
+
+
+def test_chunk_summaries_are_cached(ai_service):
+    diff = "\n".join(file_diff(f"f{index}.py", ["y" * 70] * 6) for index in range(4))
+    first = ai_service.summarize_diff_chunks(diff)
+    requests = len(ai_service.prompts)
+    assert requests == len(ai_service.split_diff_chunks(diff)) > 1
+
+    assert ai_service.summarize_diff_chunks(diff) == first
+    assert len(ai_service.prompts) == requests
+
+
+def test_commit_summaries_are_reused(ai_service):
+    loaded = []
+
+    def load_commit_diff(sha):
+        loaded.append(sha)
+        return file_diff(f"{sha}.py", [sha])
+
+    commits = [("a" * 40, "first"), ("b" * 40, "second")]
+    first = ai_service.summarize_commits(commits, load_commit_diff)
+    assert sorted(loaded) == ["a" * 40, "b" * 40]
+
+    loaded.clear()
+    ai_service.prompts.clear()
+    commits.append(("c" * 40, "third"))
+    summaries = ai_service.summarize_commits(commits, load_commit_diff)
+
+    assert loaded == ["c" * 40]
+    assert len(ai_service.prompts) == 1 and "(\"third\")" in ai_service.prompts[0]
+    assert summaries.startswith(first)
+    assert [line for line in summaries.split("\n") if line.startswith("Commit ")] == [
+        "Commit aaaaaaaa (first):", "Commit bbbbbbbb (second):", "Commit cccccccc (third):",
+    ]
+
+
+def test_commit_summaries_skip_the_cache_when_disabled(ai_service):
+    commits = [("a" * 40, "first")]
+    ai_service.summarize_commits(commits, lambda sha: file_diff("a.py", ["a"]))
+    ai_service.summarize_commits(commits, lambda sha: file_diff("a.py", ["a"]), use_cache=False)
+    assert len(ai_service.prompts) == 2
@@ -0,0 +1,23 @@
+import time
+
+from utils.rate_limiter import TokenBucket
+
+
+def test_capacity_allows_an_initial_burst():
+    bucket = TokenBucket(rate=1, capacity=3)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - started < 0.1
+
+
+def test_acquire_waits_for_the_refill():
+    bucket = TokenBucket(rate=20)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert 0.09 <= time.monotonic() - started < 0.5
+
+
+def test_capacity_is_at_least_one():
+    assert TokenBucket(rate=1, capacity=0).capacity == 1
@@ -0,0 +1,115 @@
+import pytest
+
+from cli.reword import RewordError, RewordRunner
+from core.git_service import GitCommandError, GitService
+
+COMMIT_FIELDS = "%T%x00%P%x00%an%x00%ae%x00%ad%x00%cn%x00%ce%x00%cd%x00%B"
+
+
+class FakeAIService:
+    heuristics_enabled = False
+
+    def __init__(self, messages=None):
+        self.messages = messages or {}
+        self.raise_errors = False
+
+    def generate_commit_message(self, diff, cache_scope=None, changes=None):
+        return self.messages.get(cache_scope)
+
+
+def runner(git_repo, messages=None):
+    return RewordRunner(FakeAIService(messages), GitService(git_repo.path), ui_service=None, workers=2)
+
+
+def show(git_repo, revision):
+    return git_repo.git("show", "-s", "--date=raw", f"--format={COMMIT_FIELDS}", revision).split("\0")
+
+
+def build_history(git_repo):
+    git_repo.commit("root")
+    git_repo.commit("update stuff\n\nKeeps this body.", env={
+        "GIT_AUTHOR_NAME": "Ana", "GIT_AUTHOR_EMAIL": "ana@example.com", "GIT_AUTHOR_DATE": "1690000000 +0200",
+    })
+    git_repo.commit("wip")
+    git_repo.commit("fix: already fine")
+
+
+def test_rewrite_changes_only_the_messages(git_repo):
+    build_history(git_repo)
+    reword = runner(git_repo)
+    branch, head, commits = reword.load_commits("HEAD~3")
+    before = [show(git_repo, commit["sha"]) for commit in commits]
+    messages = {commits[0]["sha"]: "feat: add second file", commits[1]["sha"]: "chore: add third file"}
+
+    new_head = reword.rewrite(branch, head, commits, messages)
+
+    assert git_repo.git("rev-parse", "main") == new_head
+    assert git_repo.git("rev-parse", "ORIG_HEAD") == head
+    after = [show(git_repo, f"{new_head}~{index}") for index in (2, 1, 0)]
+    for old, new in zip(before, after):
+        # Árvore, autor, committer e datas (com fuso) ficam iguais
+        assert old[0] == new[0]
+        assert old[2:8] == new[2:8]
+    assert after[0][1] == git_repo.git("rev-parse", "HEAD~3")
+    assert after[0][8].strip() == "feat: add second file\n\nKeeps this body."
+    assert after[1][8].strip() == "chore: add third file"
+    assert after[2][8].strip() == "fix: already fine"
+    assert after[0][2:5] == ["Ana", "ana@example.com", "1690000000 +0200"]
+
+
+def test_rewrite_keeps_commits_before_the_first_change(git_repo):
+    build_history(git_repo)
+    reword = runner(git_repo)
+    branch, head, commits = reword.load_commits("HEAD~3")
+
+    new_head = reword.rewrite(branch, head, commits, {commits[2]["sha"]: "fix: reworded"})
+
+    assert git_repo.git("rev-parse", f"{new_head}~1") == commits[1]["sha"]
+    assert git_repo.git("log", "-1", "--format=%s", new_head) == "fix: reworded"
+
+
+def test_rewrite_refuses_when_head_moved(git_repo):
+    build_history(git_repo)
+    reword = runner(git_repo)
+    branch, head, commits = reword.load_commits("HEAD~3")
+    moved = git_repo.commit("committed while the messages were generated")
+
+    with pytest.raises(GitCommandError):
+        reword.rewrite(branch, head, commits, {commits[0]["sha"]: "feat: reworded"})
+
+    assert git_repo.git("rev-parse", "main") == moved
+
+
+def test_generate_messages_skips_unchanged_subjects_and_merges(git_repo):
+    build_history(git_repo)
+    git_repo.git("checkout", "-q", "-b", "side", "HEAD~1")
+    git_repo.commit("side")
+    git_repo.git("checkout", "-q", "main")
+    git_repo.git("merge", "-q", "--no-ff", "-m", "merge side", "side")
+    commits = GitService(git_repo.path).get_range_commits("HEAD~4..HEAD")
+    subjects = {commit["sha"]: commit["message"].split("\n", 1)[0] for commit in commits}
+    messages = {sha: "feat: new" if subject == "wip" else subject for sha, subject in subjects.items()}
+    messages[commits[-1]["sha"]] = "feat: merge"
+
+    generated = runner(git_repo, messages).generate_messages(commits)
+
+    assert list(generated.values()) == ["feat: new"]
+
+
+@pytest.mark.parametrize("revision_range, error", [
+    ("HEAD~2...HEAD", "symmetric"),
+    ("HEAD~2..HEAD~1", "must end at the current branch"),
+    ("missing", "could not resolve"),
+    ("HEAD..HEAD", "no commits"),
+])
+def test_load_commits_rejects_invalid_ranges(git_repo, revision_range, error):
+    build_history(git_repo)
+    with pytest.raises(RewordError, match=error):
+        runner(git_repo).load_commits(revision_range)
+
+
+def test_load_commits_rejects_detached_head(git_repo):
+    build_history(git_repo)
+    git_repo.git("checkout", "-q", "--detach")
+    with pytest.raises(RewordError, match="detached"):
+        runner(git_repo).load_commits("HEAD~1")
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+import core.git_service as git_service_module
+from core.git_service import GitService
+
+
+def index_has_untracked_cache(git_repo):
+    with open(os.path.join(git_repo.path, ".git", "index"), "rb") as index:
+        return b"UNTR" in index.read()
+
+
+@pytest.fixture
+def changed_repo(git_repo):
+    git_repo.commit("root", {"tracked.py": "a\n"})
+    git_repo.write("tracked.py", "b\n")
+    git_repo.write("new.py", "new\n")
+    git_repo.write("docs/guide.md", "guide\n")
+    return git_repo
+
+
+def staged(git_repo):
+    return git_repo.git("diff", "--cached", "--name-only").split()
+
+
+@pytest.mark.parametrize("mode, pathspecs, expected", [
+    ("all", None, ["docs/guide.md", "new.py", "tracked.py"]),
+    ("tracked", None, ["tracked.py"]),
+    ("index", None, []),
+    ("all", ["docs"], ["docs/guide.md"]),
+])
+def test_stage_modes(changed_repo, mode, pathspecs, expected):
+    git_service = GitService(changed_repo.path)
+    diff = git_service.get_diff(mode, pathspecs)
+    assert staged(changed_repo) == expected
+    assert bool(diff) == bool(expected)
+
+
+def test_nothing_staged_skips_the_diff(changed_repo):
+    git_service = GitService(changed_repo.path)
+    assert git_service.get_diff("index") == ""
+    assert git_service.spawn_count == 1
+
+
+def test_untracked_cache_is_enabled_when_not_configured(changed_repo):
+    git_service = GitService(changed_repo.path)
+    env, details = git_service.get_status_accelerators()
+    assert env == {"GIT_CONFIG_COUNT": "1", "GIT_CONFIG_KEY_0": "core.untrackedCache", "GIT_CONFIG_VALUE_0": "true"}
+    assert details == {"fsmonitor": False, "untracked_cache": True}
+
+    git_service.get_diff("all")
+    assert index_has_untracked_cache(changed_repo)
+
+
+def test_explicit_configuration_wins(changed_repo):
+    changed_repo.git("config", "core.untrackedCache", "false")
+    git_service = GitService(changed_repo.path)
+    env, details = git_service.get_status_accelerators()
+    assert env is None
+    assert details == {"fsmonitor": False, "untracked_cache": False}
+
+    git_service.get_diff("all")
+    assert not index_has_untracked_cache(changed_repo)
+
+
+def test_builtin_fsmonitor_only_for_large_indexes_on_supported_platforms(changed_repo, monkeypatch):
+    git_service = GitService(changed_repo.path)
+    monkeypatch.setattr(git_service_module.sys, "platform", "linux")
+    assert not git_service.supports_builtin_fsmonitor()
+
+    monkeypatch.setattr(git_service_module.sys, "platform", "darwin")
+    assert not git_service.supports_builtin_fsmonitor()
+
+    monkeypatch.setattr(git_service_module, "LARGE_INDEX_BYTES", 0)
+    monkeypatch.setattr(git_service, "run_command", lambda command, check=True: "git version 2.36.1")
+    assert not git_service.supports_builtin_fsmonitor()
+    monkeypatch.setattr(git_service, "run_command", lambda command, check=True: "git version 2.45.0.windows.1")
+    assert git_service.supports_builtin_fsmonitor()
+
+
+def test_configured_fsmonitor_hook_is_left_alone(changed_repo, monkeypatch):
+    changed_repo.git("config", "core.fsmonitor", "false")
+    monkeypatch.setattr(GitService, "supports_builtin_fsmonitor", lambda self: True)
+    env, details = GitService(changed_repo.path).get_status_accelerators()
+    assert "core.fsmonitor" not in env.values()
+    assert details["fsmonitor"] is False
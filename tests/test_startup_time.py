@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+from check_startup_time import FAST_COMMANDS, PROJECT_DIR, heavy_imports, measure
+
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS") or 100)
+ENTRY = os.path.join(PROJECT_DIR, "main.py")
+
+
+@pytest.mark.parametrize("command", FAST_COMMANDS, ids=lambda command: " ".join(["cora", *command]))
+def test_fast_command_skips_heavy_imports(command):
+    assert heavy_imports(ENTRY, command) == []
+
+
+@pytest.mark.parametrize("command", FAST_COMMANDS, ids=lambda command: " ".join(["cora", *command]))
+def test_fast_command_starts_within_budget(command):
+    assert measure(ENTRY, command, runs=5) <= BUDGET_MS
@@ -0,0 +1,69 @@
+import pytest
+
+from core.suggestion_validator import SuggestionValidator
+
+
+class FakeGitService:
+    def __init__(self, branches, current="main"):
+        self.branches = branches
+        self.current = current
+
+    def get_current_branch(self):
+        return self.current
+
+    def get_local_branches(self):
+        return self.branches
+
+    def run_command(self, command, check=True):
+        return command[-1]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("feat: add login", "feat: add login"),
+    ("Commit message: `Fix: Handle empty diff.`", "fix: handle empty diff"),
+    ("1. feature(api) add endpoint", "feat(api): add endpoint"),
+    ('"refactor - split service"', "refactor: split service"),
+    ("feat!: drop python 3.8", "feat!: drop python 3.8"),
+    ("**docs:   update   readme**", "docs: update readme"),
+])
+def test_repair_commit(text, expected):
+    assert SuggestionValidator().repair_commit(text) == expected
+
+
+@pytest.mark.parametrize("text", ["add login", "wip: stuff", "feat:", ""])
+def test_repair_commit_rejects_unrecognized_types(text):
+    validator = SuggestionValidator()
+    assert validator.repair_commit(text) is None
+    assert validator.repair_commit(text, partial=True) == ""
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("feat/add-login", "feat/add-login"),
+    ("git checkout -b Feature/Adiciona Autenticação", "feat/adiciona-autenticacao"),
+    ("Branch name: fix: handle empty diff", "fix/handle-empty-diff"),
+    ("- docs update_readme", "docs/update-readme"),
+])
+def test_repair_branch(text, expected):
+    assert SuggestionValidator().repair_branch(text) == expected
+
+
+def test_repair_branch_limits_the_length():
+    name = SuggestionValidator().repair_branch("feat/" + "-".join(["word"] * 30))
+    assert len(name) <= 60
+    assert not name.endswith("-")
+
+
+def test_repair_branch_rejects_unrecognized_types():
+    assert SuggestionValidator().repair_branch("update readme") is None
+
+
+def test_repair_branch_adds_a_suffix_to_existing_branches():
+    git_service = FakeGitService(["main", "feat/add-login", "feat/add-login-2", "feat/add-logout/wip"])
+    validator = SuggestionValidator()
+    assert validator.repair_branch("feat/add-login", git_service=git_service) == "feat/add-login-3"
+    assert validator.repair_branch("feat/add-logout", git_service=git_service) == "feat/add-logout-2"
+
+
+def test_repair_branch_keeps_the_current_branch_name():
+    git_service = FakeGitService(["feat/add-login"], current="feat/add-login")
+    assert SuggestionValidator().repair_branch("feat/add-login", git_service=git_service) == "feat/add-login"
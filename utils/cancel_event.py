@@ -0,0 +1,29 @@
+import threading
+
+class CancelEvent(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.callbacks = []
+        self.callbacks_lock = threading.Lock()
+
+    def set(self):
+        with self.callbacks_lock:
+            super().set()
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def on_set(self, callback):
+        with self.callbacks_lock:
+            if not self.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    def discard(self, callback):
+        with self.callbacks_lock:
+            if callback in self.callbacks:
+                self.callbacks.remove(callback)
@@ -7,17 +7,219 @@ REPOSITORY_URL = f"https://github.com/cleversonffaria/{COMMAND_NAME}"
 API_KEY_VAR = "API_KEY"
 API_BASE_URL_VAR = "API_BASE_URL"
 MODEL_VAR = "MODEL"
+MODEL_ROUTES_VAR = "MODEL_ROUTES"
+STREAM_VAR = "STREAM"
+AI_TIMEOUT_VAR = "AI_TIMEOUT"
+AI_CONNECT_TIMEOUT_VAR = "AI_CONNECT_TIMEOUT"
+AI_MAX_RETRIES_VAR = "AI_MAX_RETRIES"
+AI_RETRY_BACKOFF_VAR = "AI_RETRY_BACKOFF"
+AI_HTTP2_VAR = "AI_HTTP2"
+HEDGE_MODEL_VAR = "HEDGE_MODEL"
+HEDGE_API_BASE_URL_VAR = "HEDGE_API_BASE_URL"
+HEDGE_API_KEY_VAR = "HEDGE_API_KEY"
+HEDGE_DELAY_MS_VAR = "HEDGE_DELAY_MS"
+OUTPUT_LIMITS_VAR = "OUTPUT_LIMITS"
+PR_MODE_VAR = "PR_MODE"
+PR_CHUNK_TOKENS_VAR = "PR_CHUNK_TOKENS"
+PR_MAX_WORKERS_VAR = "PR_MAX_WORKERS"
+CACHE_VAR = "CACHE"
+CACHE_DIR_VAR = "CACHE_DIR"
+CACHE_MAX_BYTES_VAR = "CACHE_MAX_BYTES"
+CACHE_MAX_AGE_DAYS_VAR = "CACHE_MAX_AGE_DAYS"
+HISTORY_EXAMPLES_VAR = "HISTORY_EXAMPLES"
+HEURISTICS_VAR = "HEURISTICS"
+SUGGESTION_CANDIDATES_VAR = "SUGGESTION_CANDIDATES"
+DAEMON_VAR = "DAEMON"
+DAEMON_SOCKET_VAR = "DAEMON_SOCKET"
+DAEMON_IDLE_TIMEOUT_VAR = "DAEMON_IDLE_TIMEOUT"
+WATCH_DEBOUNCE_VAR = "WATCH_DEBOUNCE"
+GITHUB_API_URL_VAR = "GITHUB_API_URL"
+GITHUB_TOKEN_VARS = ("GH_TOKEN", "GITHUB_TOKEN")
+GITHUB_ENTERPRISE_TOKEN_VARS = ("GH_ENTERPRISE_TOKEN", "GITHUB_ENTERPRISE_TOKEN")
+GH_CONFIG_DIR_VAR = "GH_CONFIG_DIR"
+STAGE_MODE_VAR = "STAGE_MODE"
+
+FALSE_VALUES = ("0", "false", "no", "off")
 
 DEFAULT_TEMPERATURE = 0.3
 DEFAULT_BRANCH_TEMPERATURE = 0.5
 
+# Descrições de PR para diffs que não cabem no orçamento:
+# auto (resumos por commit, ou por arquivos sem commits), commits, files ou single
+DEFAULT_PR_MODE = "auto"
+DEFAULT_PR_CHUNK_TOKENS = 6000
+DEFAULT_PR_MAX_WORKERS = 4
+
+DEFAULT_BATCH_WORKERS = 4
+
+# Incrementar sempre que os prompts mudarem, para invalidar o cache de sugestões
+PROMPT_VERSION = 3
+
+# Sugestões alternativas pedidas em uma única requisição e usadas ao regenerar (r)
+DEFAULT_SUGGESTION_CANDIDATES = 3
+MAX_SUGGESTION_CANDIDATES = 10
+MAX_CANDIDATE_POOL_ENTRIES = 32
+
+CACHE_FILE_NAME = "cache.sqlite3"
+DEFAULT_CACHE_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_CACHE_MAX_AGE_DAYS = 30
+
+# Daemon opcional para sugestões rápidas (hooks e editores)
+DAEMON_SOCKET_NAME = "daemon.sock"
+DAEMON_LOG_NAME = "daemon.log"
+DEFAULT_DAEMON_IDLE_TIMEOUT = 900
+DAEMON_SPAWN_TIMEOUT = 5.0
+
+# Pré-geração de mensagens de commit quando o índice muda (--watch e hook prepare-commit-msg)
+DEFAULT_WATCH_DEBOUNCE = 1.5
+WATCH_POLL_INTERVAL = 0.5
+HOOK_NAME = "prepare-commit-msg"
+HOOK_MARKER = f"# {COMMAND_NAME}: {HOOK_NAME}"
+
+# Exemplos de commits anteriores nos prompts (few-shot)
+HISTORY_FILE_NAME = "history.sqlite3"
+DEFAULT_HISTORY_EXAMPLES = 5
+HISTORY_INDEX_MAX_COMMITS = 2000
+HISTORY_INDEX_MAX_TIPS = 20
+
+# Conexão com o provedor de IA
+DEFAULT_AI_TIMEOUT = 60.0
+DEFAULT_AI_CONNECT_TIMEOUT = 10.0
+DEFAULT_AI_MAX_RETRIES = 3
+DEFAULT_AI_RETRY_BACKOFF = 0.5
+DEFAULT_AI_MAX_CONNECTIONS = 10
+DEFAULT_AI_KEEPALIVE_EXPIRY = 60.0
+MAX_AI_RETRY_BACKOFF = 8.0
+MAX_AI_RETRY_AFTER = 60.0
+
+# Requisição de reserva (hedge) para outro modelo ou provedor quando o principal demora.
+# Sem HEDGE_DELAY_MS, o atraso é o p90 do tempo até o primeiro token do endpoint principal
+DEFAULT_HEDGE_DELAY = 1.5
+MIN_HEDGE_DELAY = 0.2
+MAX_HEDGE_DELAY = 10.0
+HEDGE_PERCENTILE = 0.9
+MIN_LATENCY_SAMPLES = 5
+MAX_LATENCY_SAMPLES = 50
+LATENCY_STATS_FILE_NAME = "latency.json"
+
+# Limites de saída por tarefa (max_tokens por candidato em commit/branch) e sequências de parada.
+# Respostas fora do formato são corrigidas localmente; só as irreparáveis geram nova requisição
+MAX_OUTPUT_TOKENS = {"commit": 48, "branch": 24, "pr": 2000, "pr-summary": 800}
+OUTPUT_STOP_SEQUENCES = {"commit": ["\n\n"], "branch": ["\n\n"]}
+MAX_REPAIR_REQUESTS = 1
+COMMIT_TYPES = ("feat", "fix", "chore", "refactor", "test", "docs", "style", "perf", "ci", "build", "revert")
+COMMIT_TYPE_ALIASES = {"feature": "feat", "bugfix": "fix", "hotfix": "fix", "bug": "fix", "doc": "docs", "tests": "test"}
+MAX_BRANCH_NAME_LENGTH = 60
+
+# API REST do GitHub (criação de PRs sem o gh)
+DEFAULT_GITHUB_HOST = "github.com"
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+GITHUB_API_VERSION = "2022-11-28"
+DEFAULT_GITHUB_TIMEOUT = 15.0
+GITHUB_CAPABILITY_TTL = 600
+GITHUB_CAPABILITY_FILE_NAME = "github.json"
+
+# Escolha da branch base dos PRs: ranking por distância até o merge-base e recência
+PREFERRED_BASE_BRANCHES = ("main", "master", "develop")
+MAX_BASE_CANDIDATES = 50
+BASE_BRANCH_MENU_SIZE = 10
+
+# Compactação do diff antes de montar os prompts
+DIFF_TOKEN_BUDGET_VAR = "DIFF_TOKEN_BUDGET"
+DEFAULT_DIFF_TOKEN_BUDGET = 12000
+CHARS_PER_TOKEN = 4
+MINIFIED_LINE_LENGTH = 500
+
+# O que é adicionado ao índice antes de gerar sugestões:
+# all (git add . guiado pelo git status), tracked (git add -u) ou index (usa o índice como está)
+STAGE_MODES = ("all", "tracked", "index")
+DEFAULT_STAGE_MODE = "all"
+
+# Acelera o git add quando o usuário não configurou nada: untracked cache sempre e, em árvores
+# grandes, o fsmonitor nativo do git (só macOS/Windows, git >= 2.37)
+BUILTIN_FSMONITOR_PLATFORMS = ("darwin", "win32")
+BUILTIN_FSMONITOR_MIN_GIT_VERSION = (2, 37)
+LARGE_INDEX_BYTES = 4 * 1024 * 1024
+
+# Leitura do diff em streaming e filtros do .coraignore
+DIFF_MAX_BYTES_VAR = "DIFF_MAX_BYTES"
+DEFAULT_DIFF_MAX_BYTES = 2 * 1024 * 1024
+DEFAULT_DIFF_MAX_FILE_BYTES = 256 * 1024
+DIFF_SCAN_FACTOR = 8
+CORAIGNORE_FILE_NAME = ".coraignore"
+
+DEFAULT_IGNORE_PATTERNS = (
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "poetry.lock",
+    "Pipfile.lock",
+    "Cargo.lock",
+    "Gemfile.lock",
+    "composer.lock",
+    "go.sum",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "dist/",
+    "node_modules/",
+)
+
+GENERATED_FILE_NAMES = (
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "poetry.lock",
+    "Pipfile.lock",
+    "Cargo.lock",
+    "Gemfile.lock",
+    "composer.lock",
+    "go.sum",
+)
+
+GENERATED_FILE_SUFFIXES = (
+    ".lock",
+    ".min.js",
+    ".min.css",
+    ".map",
+    ".snap",
+    ".pb.go",
+    "_pb2.py",
+)
+
+GENERATED_PATH_PARTS = (
+    "__snapshots__/",
+    "dist/",
+    "build/",
+    "vendor/",
+    "node_modules/",
+)
+
+# Sugestões sem IA para mudanças mecânicas (docs, dependências, renomeações, remoções)
+DOC_FILE_SUFFIXES = (".md", ".mdx", ".rst", ".adoc")
+DOC_FILE_NAMES = ("README", "LICENSE", "CHANGELOG", "AUTHORS", "CONTRIBUTORS", "NOTICE", "CODEOWNERS")
+# Texto e imagens só contam como documentação dentro de docs/ ou doc/ (CMakeLists.txt, fixtures etc. não)
+DOC_ASSET_SUFFIXES = (".txt", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp")
+
+DEPENDENCY_MANIFESTS = (
+    "requirements.txt",
+    "package.json",
+    "pyproject.toml",
+    "Pipfile",
+    "go.mod",
+    "Cargo.toml",
+    "Gemfile",
+    "composer.json",
+)
+
 MESSAGES = {
     "WELCOME_TITLE": "Bem-vindo ao {command_name} v{version}!",
     "WELCOME_SUBTITLE": "Seu assistente de IA para desenvolvimento Git produtivo",
     "API_KEY_NOT_SET": "❌ API_KEY não configurada.",
     "API_KEY_HELP": "   Por favor, defina-a no arquivo .env ou no seu ambiente.",
     "NO_CHANGES": "✅ Não há alterações para commit.",
-    "OPERATION_CANCELLED": "🚫 Operação cancelada pelo usuário. Saindo."
+    "OPERATION_CANCELLED": "🚫 Operação cancelada pelo usuário. Saindo.",
+    "STREAM_ABORTED": "⏹️ Geração interrompida."
 }
 
 HELP_SECTIONS = {
@@ -31,6 +233,30 @@ HELP_SECTIONS = {
 OPTION_DESCRIPTIONS = {
     "BRANCH": "Gera um nome de branch antes de fazer commit",
     "PR": "Cria pull request automaticamente ou abre no navegador",
+    "NO_CACHE": "Ignora o cache local de sugestões",
+    "CACHE_STATS": "Mostra estatísticas do cache local de sugestões",
+    "STAGED": "Usa apenas o que já está no índice, sem git add",
+    "UPDATE": "Adiciona só arquivos já rastreados (git add -u)",
+    "PATHSPEC": "Adiciona só estes caminhos antes de gerar sugestões",
+    "NO_HEURISTICS": "Sempre consulta a IA, mesmo para mudanças mecânicas (docs, dependências, renomeações)",
+    "BATCH": "Executa, sem interação, os jobs de um arquivo JSONL (repo, action, base)",
+    "WORKERS": "Número de jobs (--batch) ou commits (--reword) processados em paralelo",
+    "RATE_LIMIT": "Limite de requisições por minuto à IA nos modos --batch e --reword",
+    "OUTPUT": "Arquivo JSONL com os resultados do modo --batch",
+    "REWORD": "Gera novas mensagens para os commits do intervalo (ex: main..HEAD) e reescreve a branch",
+    "DRY_RUN": "Mostra as mensagens que --reword usaria, sem reescrever nada",
+    "NO_STREAM": "Aguarda a resposta completa da IA em vez de exibi-la em tempo real",
+    "VERBOSE": "Mostra detalhes da execução, como o modelo escolhido para cada requisição",
+    "SUGGEST": "Gera só a sugestão (commit, branch ou pr) e a imprime, sem interação",
+    "BASE": "Branch base usada por --suggest pr",
+    "DAEMON": "Usa o daemon em segundo plano para --suggest, iniciando-o se necessário",
+    "SERVE": "Executa o daemon em primeiro plano",
+    "STOP_DAEMON": "Encerra o daemon em execução",
+    "WATCH": "Observa o índice e pré-gera a mensagem de commit a cada git add",
+    "INSTALL_HOOK": "Instala o hook prepare-commit-msg no repositório atual",
+    "UNINSTALL_HOOK": "Remove o hook prepare-commit-msg instalado pelo cora",
+    "PROFILE": "Mostra tempos por etapa, processos e tokens ao final da execução",
+    "TRACE": "Exporta a execução em formato Chrome trace (chrome://tracing, Perfetto)",
     "VERSION": "Mostra informações da versão",
     "HELP": "Mostra esta mensagem de ajuda"
 }
@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+
+    def enable(self):
+        self.enabled = True
+        self.origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, category, **args):
+        if not self.enabled:
+            yield {}
+            return
+        started = time.perf_counter()
+        try:
+            yield args
+        finally:
+            finished = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((started - self.origin) * 1_000_000),
+                "dur": round((finished - started) * 1_000_000),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self.lock:
+                self.events.append(event)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self):
+        rows = {}
+        for event in self.events:
+            row = rows.setdefault((event["cat"], event["name"]), {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            duration_ms = event["dur"] / 1000
+            row["calls"] += 1
+            row["total_ms"] += duration_ms
+            row["max_ms"] = max(row["max_ms"], duration_ms)
+        return sorted(
+            ({"category": category, "name": name, **row} for (category, name), row in rows.items()),
+            key=lambda row: -row["total_ms"]
+        )
+
+    def export_chrome_trace(self, path):
+        with self.lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+        end_ts = max((event["ts"] + event["dur"] for event in events), default=0)
+        events.append({
+            "name": "counters",
+            "ph": "C",
+            "ts": end_ts,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": counters,
+        })
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": counters}, trace_file, indent=1)
+
+profiler = Profiler()
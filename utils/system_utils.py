@@ -1,10 +1,55 @@
+import os
 import subprocess
 import sys
+from utils.constants import COMMAND_NAME
 
 class SystemUtils:
     def __init__(self):
         pass
     
+    def find_env_file(self, filename='.env'):
+        directory = os.path.dirname(os.path.abspath(__file__))
+        while True:
+            candidate = os.path.join(directory, filename)
+            if os.path.isfile(candidate):
+                return candidate
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+
+    def get_launch_command(self):
+        # Wrapper do install.sh (que descarta um build/cora.pyz desatualizado) ou o main.py com este Python.
+        # Nunca sys.argv[0]: pode ser o próprio pacote pré-compilado ou um caminho temporário
+        import shutil
+
+        main_path = self.find_env_file('main.py')
+        wrapper = shutil.which(COMMAND_NAME)
+        if wrapper and main_path:
+            try:
+                with open(wrapper, encoding='utf-8', errors='replace') as file:
+                    if main_path in file.read():
+                        return [os.path.abspath(wrapper)]
+            except OSError:
+                pass
+        return [sys.executable, main_path or os.path.abspath(sys.argv[0])]
+
+    def load_env_file(self):
+        env_file = self.find_env_file()
+        if env_file:
+            from dotenv import load_dotenv
+
+            load_dotenv(env_file)
+
+    def get_cache_dir(self):
+        if sys.platform == 'win32':
+            base_dir = os.getenv('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+        elif sys.platform == 'darwin':
+            base_dir = os.path.expanduser('~/Library/Caches')
+        else:
+            base_dir = os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        return os.path.join(base_dir, 'cora')
+
     def open_in_browser(self, url):
         command = []
         if sys.platform.startswith('linux'):
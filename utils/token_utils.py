@@ -0,0 +1,10 @@
+from utils.constants import CHARS_PER_TOKEN
+
+class TokenUtils:
+    def __init__(self):
+        pass
+
+    def estimate(self, text):
+        if not text:
+            return 0
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN